@@ -0,0 +1,123 @@
+"""Downsample chart series to a point budget without losing their spikes.
+
+``poo.py`` embeds one chart row per day (``{"d": date, "cs": ..., "r": ...}``)
+and the page draws every row. That is fine for 45 days but grows linearly with
+history: a year is ~50 KB of JSON and hundreds of SVG bars per panel, hourly
+data 24 times that. The chart is only ever a few hundred pixels wide, so most
+of those points cannot be seen anyway.
+
+Each series is reduced to ``target`` points by one of:
+
+- ``lttb`` -- Largest-Triangle-Three-Buckets: per bucket, the point that
+  makes the largest triangle with the previously kept point and the next
+  bucket's average, so the line keeps its shape (temperature);
+- ``minmax`` -- the lowest and highest point of each bucket, so no peak or
+  trough is lost (spill hours, rainfall: a single wet day must survive).
+
+The first and last points are always kept; ``None`` values are gaps and are
+never chosen. ``select_rows`` keeps a row if any series chose it, so the
+rows keep the page's format and every series keeps its own selection.
+``resolution_tiers`` repeats that for growing budgets (``target``,
+``target * factor``, ...) up to the full rows. A page can embed the coarsest
+tier and fetch a finer one when the visible span needs it.
+
+Pure Python: ``poo.py`` runs in the workflow with only ``requests``.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+TIER_FACTOR = 4  # each resolution tier holds this many times the points of the previous one
+
+
+def _x_value(value) -> float:
+    """Numeric x for a row: numbers as-is, ISO dates/times as POSIX seconds (UTC if naive)."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    when = datetime.fromisoformat(str(value))
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return when.timestamp()
+
+
+def lttb(xs: list[float], ys: list[float], target: int) -> list[int]:
+    """Indices of the ``target`` points LTTB keeps (all of them if there are no more than that)."""
+    n = len(xs)
+    if target >= n or n <= 2:
+        return list(range(n))
+    if target < 3:
+        return [0, n - 1]
+    every = (n - 2) / (target - 2)
+    kept = [0]
+    a = 0
+    for i in range(target - 2):
+        start, end = int(i * every) + 1, int((i + 1) * every) + 1
+        nxt_start, nxt_end = end, min(int((i + 2) * every) + 1, n)
+        if nxt_start >= nxt_end:  # last bucket: the next "bucket" is the final point
+            nxt_start, nxt_end = n - 1, n
+        avg_x = sum(xs[nxt_start:nxt_end]) / (nxt_end - nxt_start)
+        avg_y = sum(ys[nxt_start:nxt_end]) / (nxt_end - nxt_start)
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((xs[a] - avg_x) * (ys[j] - ys[a]) - (xs[a] - xs[j]) * (avg_y - ys[a]))
+            if area > best_area:
+                best, best_area = j, area
+        kept.append(best)
+        a = best
+    kept.append(n - 1)
+    return kept
+
+
+def minmax(xs: list[float], ys: list[float], target: int) -> list[int]:
+    """Indices of each bucket's lowest and highest point, ``target // 2`` buckets between the end points."""
+    n = len(ys)
+    buckets = (target - 2) // 2
+    if target >= n or n <= 2:
+        return list(range(n))
+    if buckets < 1:
+        return [0, n - 1]
+    every = (n - 2) / buckets
+    kept = {0, n - 1}
+    for i in range(buckets):
+        start, end = int(i * every) + 1, int((i + 1) * every) + 1
+        if start >= end:
+            continue
+        window = range(start, end)
+        kept.add(min(window, key=lambda j: ys[j]))
+        kept.add(max(window, key=lambda j: ys[j]))
+    return sorted(kept)
+
+
+METHODS = {"lttb": lttb, "minmax": minmax}
+
+
+def series_indices(rows: list[dict], x_key: str, key: str, method: str, target: int) -> list[int]:
+    """Row indices one series keeps (its ``None`` rows are skipped, not drawn through)."""
+    if method not in METHODS:
+        raise ValueError(f"Unknown downsampling method {method!r} (choose from {', '.join(METHODS)})")
+    present = [i for i, row in enumerate(rows) if row.get(key) is not None]
+    xs = [_x_value(rows[i][x_key]) for i in present]
+    ys = [float(rows[i][key]) for i in present]
+    return [present[k] for k in METHODS[method](xs, ys, target)]
+
+
+def select_rows(rows: list[dict], x_key: str, series: dict[str, str], target: int) -> list[dict]:
+    """``rows`` (in order) that at least one series keeps at ``target`` points; ``series`` maps key -> method."""
+    if len(rows) <= target:
+        return list(rows)
+    kept = set()
+    for key, method in series.items():
+        kept.update(series_indices(rows, x_key, key, method, target))
+    return [rows[i] for i in sorted(kept)]
+
+
+def resolution_tiers(rows: list[dict], x_key: str, series: dict[str, str], target: int,
+                     factor: int = TIER_FACTOR) -> list[tuple[int, list[dict]]]:
+    """``[(budget, rows), ...]`` from ``target`` points per series up to every row (the last tier)."""
+    tiers = []
+    budget = target
+    while budget < len(rows):
+        tiers.append((budget, select_rows(rows, x_key, series, budget)))
+        budget *= factor
+    tiers.append((len(rows), list(rows)))
+    return tiers
@@ -0,0 +1,129 @@
+"""Score the fitted Conham E. coli models without refitting them.
+
+The fitting scripts in ``scripts/`` export their final model to
+``docs/data/models/*.json`` (see ``scripts/model_artifact.py``). ``load_model``
+reads one of those once per process; the returned ``Model`` folds the
+standardisation into its coefficients up front, so scoring a feature vector is
+a handful of multiply-adds:
+
+    model = load_model("docs/data/models/conham_band.json")
+    model.score({"spill_hours_10_to_20_miles@7d": 12.5})   # -> CFU/100ml
+
+Feature values are passed raw (e.g. spill hours, not log1p of them); each
+feature's transform is applied here. ``band_window`` builds the band model's
+raw features from a list of spill events the way
+``scripts/analyze_conham_cso_ecoli.py`` summarises a lookback window.
+
+Pure Python on purpose: ``poo.py`` runs in the workflow with only ``requests``.
+"""
+from __future__ import annotations
+
+import json
+import math
+from functools import lru_cache
+
+ARTIFACT_FORMAT = "conham-ecoli-model"
+SUPPORTED_VERSIONS = (1,)
+
+# Distance bands (miles) used by the band features, as in analyze_conham_cso_ecoli.BANDS.
+BANDS = [(0, 1, "within_1_mile"), (1, 5, "1_to_5_miles"), (5, 10, "5_to_10_miles"), (10, 20, "10_to_20_miles"), (20, 50, "20_to_50_miles")]
+
+
+def transform(value, kind):
+    if kind == "proximity":
+        return 1.0 / (1.0 + float(value)) if value not in ("", None) else 0.0
+    if kind == "log1p":
+        return math.log1p(float(value))
+    if kind is None:
+        return float(value)
+    raise ValueError(f"Unknown feature transform {kind!r}")
+
+
+class Model:
+    """A loaded model artifact: log10(CFU) = offset + sum(scale_j * transform_j(raw_j))."""
+
+    def __init__(self, artifact):
+        if artifact.get("format") != ARTIFACT_FORMAT:
+            raise ValueError(f"Not a {ARTIFACT_FORMAT} artifact")
+        if artifact.get("version") not in SUPPORTED_VERSIONS:
+            raise ValueError(f"Unsupported model artifact version {artifact.get('version')!r}")
+        self.artifact = artifact
+        self.name = artifact["name"]
+        self.features = artifact["features"]
+        self.loocv = artifact.get("loocv", {})
+        # Standardisation folded in: coefficient / std per feature, and the
+        # means moved into the intercept. Constant training columns (std 0)
+        # were zeroed by the fit, so they contribute nothing here either.
+        self._terms = []
+        offset = artifact["intercept"]
+        for f in self.features:
+            scale = f["coefficient"] / f["std"] if f["std"] > 0 else 0.0
+            offset -= scale * f["mean"]
+            self._terms.append((f["name"], f["transform"], scale))
+        self._offset = offset
+
+    @property
+    def inputs(self):
+        """Feature names this model needs, in order."""
+        return [name for name, _, _ in self._terms]
+
+    def score_log(self, values):
+        """log10 CFU/100ml for ``{feature name: raw value}``."""
+        total = self._offset
+        for name, kind, scale in self._terms:
+            if name not in values:
+                raise KeyError(f"{self.name}: missing feature {name!r}")
+            total += scale * transform(values[name], kind)
+        return total
+
+    def score(self, values):
+        """Predicted E. coli in CFU/100ml for ``{feature name: raw value}``."""
+        return 10 ** self.score_log(values)
+
+
+@lru_cache(maxsize=None)
+def load_model(path):
+    with open(path, encoding="utf-8") as handle:
+        return Model(json.load(handle))
+
+
+def band_window(events, end_ms, lookback_days):
+    """Band features over the ``lookback_days`` before ``end_ms``.
+
+    ``events`` are (start_ms, duration_hours, distance_miles) tuples; an event
+    counts if it started inside the window. Returns the feature-CSV columns:
+    ``spill_hours_<band>``, ``spill_hours_total``, ``event_count`` and
+    ``nearest_spill_miles`` ("" when nothing spilled).
+    """
+    start_ms = end_ms - lookback_days * 86400 * 1000
+    summary = {f"spill_hours_{label}": 0.0 for _, _, label in BANDS}
+    summary.update({"event_count": 0, "spill_hours_total": 0.0, "nearest_spill_miles": ""})
+    nearest = None
+    for event_start, hours, dist in events:
+        if not start_ms <= event_start < end_ms:
+            continue
+        nearest = dist if nearest is None else min(nearest, dist)
+        summary["event_count"] += 1
+        summary["spill_hours_total"] += hours
+        for lower, upper, label in BANDS:
+            if lower < dist <= upper:
+                summary[f"spill_hours_{label}"] += hours
+                break
+    if nearest is not None:
+        summary["nearest_spill_miles"] = round(nearest, 3)
+    return summary
+
+
+def band_inputs(model, events, end_ms):
+    """``{feature name: raw value}`` for a model whose features are all band-window features."""
+    values = {}
+    windows = {}
+    for f in model.features:
+        source = f["source"]
+        if source.get("kind") != "band":
+            raise ValueError(f"{model.name}: feature {f['name']!r} is not a band-window feature")
+        lookback = source["lookback_days"]
+        if lookback not in windows:
+            windows[lookback] = band_window(events, end_ms, lookback)
+        values[f["name"]] = windows[lookback][source["column"]]
+    return values
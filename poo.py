@@ -6,12 +6,31 @@ import os
 import json
 from string import Template
 
+from downsample import resolution_tiers
+from nowcast import band_inputs, load_model
+from static_site import StaticSite
+
 index_data = []
 
+# Pages, the map script and the stylesheet go through StaticSite: assets get
+# content-hashed names, everything gets .gz/.br variants, and files whose
+# content is unchanged are not rewritten.
+site = StaticSite("docs")
+with open(os.path.join("templates", "styles.css"), "r", encoding="utf-8") as css_file:
+    styles_css = site.asset("styles.css", css_file.read())
+
 # Number of days of history shown in the per-site "recent" chart (styled after
 # the 2025 review page). A 7-day pre-roll is fetched on top of this so the
 # trailing 2-/7-day cumulative CSO sums are complete from the first plotted day.
 CHART_DAYS = 45
+# Points per chart series embedded in a page. Longer histories are downsampled
+# to this (spikes kept, see downsample.py); the finer tiers are written as
+# content-hashed JSON assets, listed in the page's chart_tiers map, and the
+# chart loads the finest one its width can show. 45 daily rows are all embedded.
+CHART_POINTS = 120
+# Chart series -> downsampling method: bars keep each bucket's extremes,
+# the temperature line keeps its shape.
+CHART_SERIES = {"cs": "minmax", "c2": "minmax", "c": "minmax", "r": "minmax", "t": "lttb"}
 
 def haversine(lat1, lon1, lat2, lon2):
     R = 3958.8  # Earth radius in miles
@@ -93,6 +112,87 @@ def get_daily_weather(lat, lon, past_days=CHART_DAYS):
     return out
 
 
+# Event Duration Monitoring view the E. coli models were trained on
+# (scripts/analyze_conham_cso_ecoli.py). Unlike the Storm_Overflow_Activity feed
+# generate_report reads, it holds every event, not just each outfall's latest one.
+EDM_LAYER_URL = "https://services.arcgis.com/3SZ6e0uCvPROr4mS/arcgis/rest/services/Wessex_Water_Event_Duration_Monitoring_2025_view/FeatureServer/0"
+EDM_URL = f"{EDM_LAYER_URL}/query"
+# The training features' watercourse filter (analyze_conham_cso_ecoli.CONHAM_RIVERS);
+# keep the two in sync. Every outfall on these counts, downstream ones included.
+MODEL_RIVERS = [
+    "RIVER AVON", "RIVER CHEW", "charlton bottom via sws", "bathford brook (s)",
+    "horsecombe brook", "river avon via sws", "river avon (via sws)",
+]
+# If the EDM layer was last edited longer ago than this, it has not caught up
+# with the lookback window and an estimate would count the missing spills as
+# zero. This is the layer's own last-edit time (its metadata), not its newest
+# event: in a dry spell there are no new events, and that is exactly when the
+# estimate should be low rather than missing.
+MODEL_FEED_MAX_LAG_DAYS = 2
+
+
+def get_model_events(ref_lat, ref_lon, lookback_days, now):
+    """Events for the model estimate, counted as the training features count them.
+
+    Returns ``(events, None)`` with (start_ms, duration_hours, distance_miles)
+    for every EDM event on a MODEL_RIVERS outfall (upstream or not) that
+    started in the ``lookback_days`` before ``now``, de-duplicated like
+    ``summarise_window``; or ``(None, reason)`` when the layer cannot be
+    queried or was last updated too long ago to cover ``now``.
+    """
+    try:
+        resp = requests.get(EDM_LAYER_URL, params={"f": "json"}, timeout=30)
+        resp.raise_for_status()
+        info = resp.json()
+        last_edit = (info.get("editingInfo") or {}).get("lastEditDate")
+        if last_edit is None:
+            print("EDM layer publishes no last-edit time; no model estimate")
+            return None, "the spill data's last update time is not published"
+        updated = datetime.utcfromtimestamp(last_edit / 1000)
+        if updated < now - timedelta(days=MODEL_FEED_MAX_LAG_DAYS):
+            print(f"EDM layer last updated {updated:%Y-%m-%d %H:%M} UTC; no model estimate")
+            return None, f"the spill data was last updated {updated:%d/%m/%Y} and does not cover the last few days"
+
+        start = (now - timedelta(days=lookback_days)).strftime("%Y-%m-%d %H:%M:%S")
+        rivers = " OR ".join(f"ReceivingWatercourse = '{river}'" for river in MODEL_RIVERS)
+        features, offset = [], 0
+        while True:
+            resp = requests.get(EDM_URL, params={
+                "where": f"({rivers}) AND EventStart >= DATE '{start}'",
+                "outFields": "SiteId,EventId,EventStart,EventEnd,OutfallLatitude,OutfallLongitude",
+                "orderByFields": "EventStart ASC",
+                "resultRecordCount": 1000,
+                "resultOffset": offset,
+                "f": "json",
+            }, timeout=30)
+            resp.raise_for_status()
+            data = resp.json()
+            if "error" in data:
+                raise RuntimeError(data["error"])
+            page = data.get("features", [])
+            features.extend(page)
+            if len(page) < 1000 or not data.get("exceededTransferLimit"):
+                break
+            offset += 1000
+    except Exception as e:
+        print(f"Failed to fetch EDM events for the model estimate: {e}")
+        return None, "the spill data could not be fetched"
+
+    events, seen = [], set()
+    for feat in features:
+        attrs = feat["attributes"]
+        lat, lon = attrs.get("OutfallLatitude"), attrs.get("OutfallLongitude")
+        start_ms, end_ms = attrs.get("EventStart"), attrs.get("EventEnd")
+        if lat is None or lon is None or start_ms is None or end_ms is None:
+            continue
+        key = (attrs.get("EventId") or attrs.get("SiteId"), start_ms, end_ms)
+        if key in seen:
+            continue
+        seen.add(key)
+        events.append((start_ms, (end_ms - start_ms) / 3600000, haversine(ref_lat, ref_lon, lat, lon)))
+    return events, None
+
+
 # Upstream filter functions for each site
 def is_upstream_conham(lat, lon):
     # Upstream if longitude is greater (i.e., east of the swim site)
@@ -117,7 +217,7 @@ def is_upstream_farleigh(lat, lon):
     # Upstream if latitude is less than the site's latitude
     return lat < 51.3299
 
-def generate_report(river_name, river_label, rivers_to_query, ref_lat, ref_lon, filename, upstream_func, watercourse_clause=None):
+def generate_report(river_name, river_label, rivers_to_query, ref_lat, ref_lon, filename, upstream_func, watercourse_clause=None, model_path=None):
     now = datetime.utcnow()
     two_days_ago_dt = now - timedelta(days=2)
     two_days_ago_ms = two_days_ago_dt.timestamp() * 1000
@@ -217,6 +317,35 @@ def generate_report(river_name, river_label, rivers_to_query, ref_lat, ref_lon,
             f"<div class='risk-note'>If there is no further rain, the risk will be low at {safe_time} UTC</div>"
         )
 
+    # Statistical E. coli estimate from a fitted model artifact (see nowcast.py).
+    # Its features are rebuilt from the EDM events the model was trained on (all
+    # events on its watercourses, downstream outfalls included), not from the
+    # latest-event-only, upstream-filtered activity feed above, which would
+    # undercount spill hours and bias the estimate low.
+    prediction_block = ""
+    if model_path and os.path.exists(model_path):
+        try:
+            model = load_model(model_path)
+            lookback = max(f["source"]["lookback_days"] for f in model.features)
+            model_events, missing_reason = get_model_events(ref_lat, ref_lon, lookback, now)
+            if model_events is not None:
+                cfu = model.score(band_inputs(model, model_events, now.timestamp() * 1000))
+        except (ValueError, KeyError) as e:
+            print(f"Failed to score {model_path}: {e}")
+        else:
+            if model_events is not None:
+                median_ape = model.loocv.get("median_ape")
+                typical = f" (typically out by about {median_ape:.0f}%)" if median_ape is not None else ""
+                prediction_block = (
+                    f"<div class='model-estimate'>Model estimate: about {cfu:,.0f} E. coli CFU/100ml"
+                    f"<small>From recorded storm-overflow spills only{typical}; not a water test.</small></div>"
+                )
+            else:
+                prediction_block = (
+                    f"<div class='model-estimate'>No model estimate today"
+                    f"<small>The E. coli model was not run: {missing_reason}.</small></div>"
+                )
+
     # Build the recent-history chart series (CSO same-day / trailing-2d /
     # trailing-7d spill hours, daily rainfall and mean temperature) in the style
     # of the 2025 review page. One row per calendar day over the last CHART_DAYS.
@@ -239,7 +368,12 @@ def generate_report(river_name, river_label, rivers_to_query, ref_lat, ref_lon,
             "t": round(temp, 1) if temp is not None else None,
         })
         day += timedelta(days=1)
-    chart_data = json.dumps(chart_rows)
+    tiers = resolution_tiers(chart_rows, "d", CHART_SERIES, CHART_POINTS)
+    chart_tiers = json.dumps({
+        str(budget): site.asset(f"{filename}_chart_{budget}.json", json.dumps(rows, separators=(",", ":")))
+        for budget, rows in tiers[1:]
+    })
+    chart_data = json.dumps(tiers[0][1])
 
     template_path = os.path.join("templates", "report_template.html")
     with open(template_path, "r", encoding="utf-8") as tpl_file:
@@ -254,12 +388,13 @@ def generate_report(river_name, river_label, rivers_to_query, ref_lat, ref_lon,
         table_rows=table_rows,
         weather_message=weather_message,
         risk_note_block=risk_note_block,
+        prediction_block=prediction_block,
         chart_data=chart_data,
+        chart_tiers=chart_tiers,
+        styles_css=styles_css,
     )
 
-    os.makedirs("docs", exist_ok=True)
-    with open(f"docs/{filename}.html", "w", encoding="utf-8") as f:
-        f.write(html)
+    site.page(f"{filename}.html", html)
     print(f"HTML report written to docs/{filename}.html")
     return risk, warnings, safe_time
 
@@ -289,6 +424,8 @@ reports = [
         "ref_lon": -2.534812,
         "filename": "conham",
         "upstream_func": is_upstream_conham,
+        # Fitted band model (scripts/model_conham_ecoli.py) for the E. coli estimate.
+        "model": "docs/data/models/conham_band.json",
     },
     {
         "river_name": "salford",
@@ -351,6 +488,7 @@ for r in reports:
         filename=r["filename"],
         upstream_func=r["upstream_func"],
         watercourse_clause=r.get("watercourse_clause"),
+        model_path=r.get("model"),
     )
     index_data.append({
         "site": r["river_label"],
@@ -393,21 +531,6 @@ for entry in index_data:
         all_warnings.append(f"{entry['site']}: {w}")
 weather_message_index = "<br>".join(all_warnings)
 
-template_path = os.path.join("templates", "index_template.html")
-with open(template_path, "r", encoding="utf-8") as tpl_file:
-    tpl = Template(tpl_file.read())
-
-index_html = tpl.substitute(
-    report_time=report_time,
-    table_rows=table_rows,
-    weather_message_index=weather_message_index,
-)
-
-with open("docs/index.html", "w", encoding="utf-8") as f:
-    f.write(index_html)
-
-print("Index page written to docs/index.html")
-
 # --- Generate index.js with map data ---
 center_lat = sum(e["lat"] for e in index_data) / len(index_data) if index_data else 0
 center_lon = sum(e["lon"] for e in index_data) / len(index_data) if index_data else 0
@@ -433,7 +556,24 @@ index_js = js_tpl.substitute(
     sites_json=sites_json,
 )
 
-with open("docs/index.js", "w", encoding="utf-8") as f:
-    f.write(index_js)
+index_js_url = site.asset("index.js", index_js)
+print(f"Index script written to docs/{index_js_url}")
+
+template_path = os.path.join("templates", "index_template.html")
+with open(template_path, "r", encoding="utf-8") as tpl_file:
+    tpl = Template(tpl_file.read())
+
+index_html = tpl.substitute(
+    report_time=report_time,
+    table_rows=table_rows,
+    weather_message_index=weather_message_index,
+    styles_css=styles_css,
+    index_js=index_js_url,
+)
+
+site.page("index.html", index_html)
+print("Index page written to docs/index.html")
 
-print("Index script written to docs/index.js")
+manifest_path = site.finish()
+print(f"Asset manifest written to {manifest_path} "
+      f"({len(site.written)} files written, {len(site.skipped)} unchanged)")
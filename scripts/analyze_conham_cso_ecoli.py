@@ -6,9 +6,12 @@ the Conham watercourse query logic from ``poo.py``. For every E. coli sample dat
 in the CSV, it queries CSO
 activity in 1- to 7-day lookback windows ending at the sample date, summarises
 spill duration by distance band, and fits simple one-variable OLS models against
-log10(E. coli CFU/100ml).
+log10(E. coli CFU/100ml). With 49 lookback x feature correlations on ~25
+samples, each also gets a permutation p-value and a Benjamini-Hochberg q-value
+(``permutation.py``).
 
-The script intentionally uses only the Python standard library.
+The script intentionally uses only the Python standard library (the permutation
+tests use NumPy when it is installed).
 """
 from __future__ import annotations
 
@@ -16,7 +19,6 @@ import argparse
 import csv
 import json
 import math
-import statistics
 import sys
 import time
 import urllib.parse
@@ -25,6 +27,9 @@ from datetime import date, datetime, time as dt_time, timedelta, timezone
 from pathlib import Path
 from typing import Iterable
 
+from correlation import correlate
+from permutation import PERMUTATIONS, bh_qvalues, permutation_pvalues
+
 ARCGIS_QUERY_URL = "https://services.arcgis.com/3SZ6e0uCvPROr4mS/arcgis/rest/services/Wessex_Water_Event_Duration_Monitoring_2025_view/FeatureServer/0/query"
 CONHAM_RIVERS = [
     "RIVER AVON",
@@ -47,6 +52,7 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--report", default="docs/data/conham_cso_ecoli_analysis.md", help="Output markdown report")
     parser.add_argument("--sleep", type=float, default=0.1, help="Delay between ArcGIS page requests")
     parser.add_argument("--page-size", type=int, default=2000, help="ArcGIS records to request per page")
+    parser.add_argument("--permutations", type=int, default=PERMUTATIONS, help="Shuffles per permutation test (0 = skip)")
     return parser.parse_args()
 
 
@@ -155,41 +161,23 @@ def summarise_window(features: Iterable[dict[str, object]], start: datetime, end
     return summary
 
 
-def pearson(xs: list[float], ys: list[float]) -> float:
-    if len(xs) < 3 or len(set(xs)) < 2 or len(set(ys)) < 2:
-        return float("nan")
-    mx, my = statistics.mean(xs), statistics.mean(ys)
-    sx = math.sqrt(sum((x - mx) ** 2 for x in xs))
-    sy = math.sqrt(sum((y - my) ** 2 for y in ys))
-    return sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / (sx * sy)
-
-
-def ranks(values: list[float]) -> list[float]:
-    ordered = sorted((value, index) for index, value in enumerate(values))
-    out = [0.0] * len(values)
-    i = 0
-    while i < len(ordered):
-        j = i
-        while j + 1 < len(ordered) and ordered[j + 1][0] == ordered[i][0]:
-            j += 1
-        rank = (i + j + 2) / 2
-        for _, index in ordered[i : j + 1]:
-            out[index] = rank
-        i = j + 1
-    return out
-
-
-def model_table(rows: list[dict[str, object]]) -> list[dict[str, float | int | str]]:
+def model_table(rows: list[dict[str, object]], permutations: int = PERMUTATIONS) -> list[dict[str, float | int | str]]:
     candidates = ["event_count", "spill_hours_total", "spill_hours_within_1_mile", "spill_hours_1_to_5_miles", "spill_hours_5_to_10_miles", "spill_hours_10_to_20_miles", "spill_hours_20_to_50_miles"]
     results = []
     for lag in range(1, 8):
         lag_rows = [r for r in rows if r["lookback_days"] == lag]
         y = [math.log10(float(r["e_coli_cfu_per_100ml"])) for r in lag_rows]
-        for candidate in candidates:
-            x = [math.log1p(float(r[candidate])) for r in lag_rows]
-            r_value = pearson(x, y)
-            rho = pearson(ranks(x), ranks(y))
-            results.append({"lookback_days": lag, "feature": candidate, "n": len(lag_rows), "pearson_r": r_value, "r_squared": r_value * r_value if not math.isnan(r_value) else float("nan"), "spearman_rho": rho})
+        xs = [[math.log1p(float(r[candidate])) for r in lag_rows] for candidate in candidates]
+        # One pass correlates every candidate; one batch of shuffles tests them
+        # (Spearman is the same test on ranks).
+        corr = correlate(xs, y)
+        p_values = permutation_pvalues(xs, y, permutations)
+        rho_p_values = permutation_pvalues(xs, y, permutations, rank=True)
+        for k, candidate in enumerate(candidates):
+            results.append({"lookback_days": lag, "feature": candidate, "n": corr["n"][k], "pearson_r": corr["pearson_r"][k], "r_squared": corr["r_squared"][k], "spearman_rho": corr["spearman_rho"][k], "pearson_p": p_values[k], "spearman_p": rho_p_values[k]})
+    # Benjamini-Hochberg across the whole table: every lookback x feature is a test.
+    for result, q_value in zip(results, bh_qvalues([float(r["pearson_p"]) for r in results])):
+        result["pearson_q"] = q_value
     # Sort by descending R². R² lies in [0, 1], so -R² lies in [-1, 0]; use a
     # positive sentinel for undefined (NaN) correlations so degenerate features
     # with no variation sort to the bottom instead of tying with a perfect fit.
@@ -207,17 +195,21 @@ def write_report(path: Path, rows: list[dict[str, object]], models: list[dict[st
         "",
         "## Best one-variable log-linear associations",
         "",
-        "| Rank | Lookback days | Feature | n | Pearson r | R^2 | Spearman rho |",
-        "|---:|---:|---|---:|---:|---:|---:|",
+        "`p` is a two-sided permutation p-value (E. coli shuffled across sample dates);",
+        f"`q` is its Benjamini-Hochberg FDR-adjusted value across all {len(models)} lookback x feature tests.",
+        "",
+        "| Rank | Lookback days | Feature | n | Pearson r | R^2 | p | q | Spearman rho | rho p |",
+        "|---:|---:|---|---:|---:|---:|---:|---:|---:|---:|",
     ]
     for i, row in enumerate(top, 1):
-        lines.append(f"| {i} | {row['lookback_days']} | `{row['feature']}` | {row['n']} | {float(row['pearson_r']):.3f} | {float(row['r_squared']):.3f} | {float(row['spearman_rho']):.3f} |")
+        lines.append(f"| {i} | {row['lookback_days']} | `{row['feature']}` | {row['n']} | {float(row['pearson_r']):.3f} | {float(row['r_squared']):.3f} | {float(row['pearson_p']):.4f} | {float(row['pearson_q']):.4f} | {float(row['spearman_rho']):.3f} | {float(row['spearman_p']):.4f} |")
     lines.extend([
         "",
         "## Interpretation cautions",
         "",
         "- The E. coli values are chart-digitised approximations and capped values at 1000 CFU/100ml are right-censored.",
         "- The CSO query uses Wessex Water's static 2025 Event Duration Monitoring dataset, bounded to the selected 1- to 7-day lookback window before each sample.",
+        "- Even the best q-value is a screening result on ~25 samples: features at the same or nearby lookbacks overlap heavily, so the tests are far from independent.",
         "- These are simple exploratory correlations, not causal models. Rainfall, river flow, sunlight, temperature, sample time, and travel time are not controlled here.",
         "",
     ])
@@ -243,7 +235,7 @@ def main() -> int:
         writer = csv.DictWriter(handle, fieldnames=fieldnames)
         writer.writeheader()
         writer.writerows(rows)
-    models = model_table(rows)
+    models = model_table(rows, args.permutations)
     write_report(Path(args.report), rows, models)
     print(f"Wrote {out_csv}")
     print(f"Wrote {args.report}")
@@ -0,0 +1,147 @@
+"""Streaming bathing-water classification (UK Bathing Water Directive, inland waters).
+
+A class is decided from log-normal percentiles of the sample set: the
+95-percentile (z=1.65) for Excellent/Good and the 90-percentile (z=1.282) for
+Sufficient. Those are ``antilog(mean + z * sd)`` of the log10 values. The
+Directive assesses the last four bathing seasons together.
+
+``build_2025_timeseries`` used to recompute the percentiles from the whole
+history at every sample date, re-taking logs and re-running
+``statistics.stdev`` each time. Here each indicator keeps running log moments
+(``LogMoments``, Welford's recurrence):
+
+- adding a sample is O(1);
+- expiring the oldest sample when it leaves the window is O(1), by the reverse
+  update;
+- each sample's "class so far" is a constant-time read.
+
+``RollingClassifier`` is one site's stream over a window of ``seasons``
+bathing seasons (calendar years). ``ClassificationEngine`` holds one per site
+and records every sample's class so far by site and year.
+"""
+from __future__ import annotations
+
+import bisect
+import math
+from collections import deque
+from datetime import date
+
+CLASS_RANK = {0: "excellent", 1: "good", 2: "sufficient", 3: "poor"}
+MIN_SAMPLES_TO_CLASSIFY = 5  # percentiles are meaningless with too few points
+SEASONS = 4                  # the Directive's assessment period
+
+Z95, Z90 = 1.65, 1.282
+# (95-percentile excellent limit, 95-percentile good limit, 90-percentile sufficient limit), CFU/100ml.
+ECOLI_LIMITS = (500.0, 1000.0, 900.0)
+ENTEROCOCCI_LIMITS = (200.0, 400.0, 330.0)
+
+
+class LogMoments:
+    """Count, mean and sum of squared deviations of log10 values, with O(1) add and remove."""
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, log_value: float) -> None:
+        self.n += 1
+        delta = log_value - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (log_value - self.mean)
+
+    def remove(self, log_value: float) -> None:
+        if self.n <= 1:
+            self.n, self.mean, self.m2 = 0, 0.0, 0.0
+            return
+        old_mean = self.mean
+        self.n -= 1
+        self.mean = (old_mean * (self.n + 1) - log_value) / self.n
+        self.m2 = max(self.m2 - (log_value - old_mean) * (log_value - self.mean), 0.0)
+
+    def stdev(self) -> float:
+        """Sample standard deviation (n - 1), as ``statistics.stdev``."""
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else float("nan")
+
+    def percentile(self, z: float) -> float:
+        """Log-normal percentile used by the Directive: antilog(mean + z*sd)."""
+        return 10 ** (self.mean + z * self.stdev())
+
+
+def indicator_class(moments: LogMoments, limits: tuple[float, float, float]) -> int:
+    """0=Excellent..3=Poor for one indicator."""
+    p95, p90 = moments.percentile(Z95), moments.percentile(Z90)
+    excellent, good, sufficient = limits
+    return 0 if p95 <= excellent else 1 if p95 <= good else 2 if p90 <= sufficient else 3
+
+
+class RollingClassifier:
+    """One site's class over the last ``seasons`` bathing seasons, updated a sample at a time.
+
+    Samples must arrive in date order. ``add`` returns the class so far (the
+    worse of the E. coli and enterococci classes, as a ``CLASS_RANK`` key) or
+    None while fewer than ``min_samples`` samples are in the window.
+    """
+
+    def __init__(self, seasons: int = SEASONS, min_samples: int = MIN_SAMPLES_TO_CLASSIFY):
+        if seasons < 1:
+            raise SystemExit("The assessment window needs at least one season")
+        self.seasons = seasons
+        self.min_samples = min_samples
+        self.ecoli = LogMoments()
+        self.enterococci = LogMoments()
+        self.window: deque[tuple[date, float, float]] = deque()
+
+    def add(self, sample_date: date, ecoli: float, enterococci: float) -> int | None:
+        if self.window and sample_date < self.window[-1][0]:
+            raise SystemExit(f"Samples out of order: {sample_date} after {self.window[-1][0]}")
+        first_season = sample_date.year - self.seasons + 1
+        while self.window and self.window[0][0].year < first_season:
+            _, ec_log, en_log = self.window.popleft()
+            self.ecoli.remove(ec_log)
+            self.enterococci.remove(en_log)
+        ec_log, en_log = math.log10(ecoli), math.log10(enterococci)
+        self.window.append((sample_date, ec_log, en_log))
+        self.ecoli.add(ec_log)
+        self.enterococci.add(en_log)
+        return self.rank()
+
+    def rank(self) -> int | None:
+        if len(self.window) < self.min_samples:
+            return None
+        return max(indicator_class(self.ecoli, ECOLI_LIMITS), indicator_class(self.enterococci, ENTEROCOCCI_LIMITS))
+
+
+class ClassificationEngine:
+    """``RollingClassifier`` per site, keeping every sample's class so far.
+
+    ``history[(site, year)]`` lists ``(sample_date, rank)`` for that site's
+    samples in that year (rank None until there are enough samples);
+    ``class_so_far(site, on)`` is the class after the last sample on or before
+    ``on``.
+    """
+
+    def __init__(self, seasons: int = SEASONS, min_samples: int = MIN_SAMPLES_TO_CLASSIFY):
+        self.seasons = seasons
+        self.min_samples = min_samples
+        self.sites: dict[str, RollingClassifier] = {}
+        self.history: dict[tuple[str, int], list[tuple[date, int | None]]] = {}
+        self._dates: dict[str, list[date]] = {}
+        self._ranks: dict[str, list[int | None]] = {}
+
+    def add(self, site: str, sample_date: date, ecoli: float, enterococci: float) -> int | None:
+        classifier = self.sites.get(site)
+        if classifier is None:
+            classifier = self.sites[site] = RollingClassifier(self.seasons, self.min_samples)
+            self._dates[site], self._ranks[site] = [], []
+        rank = classifier.add(sample_date, ecoli, enterococci)
+        self.history.setdefault((site, sample_date.year), []).append((sample_date, rank))
+        self._dates[site].append(sample_date)
+        self._ranks[site].append(rank)
+        return rank
+
+    def class_so_far(self, site: str, on: date) -> str:
+        """``CLASS_RANK`` name as of ``on``; "" before the site can be classified."""
+        i = bisect.bisect_right(self._dates.get(site, []), on)
+        rank = self._ranks[site][i - 1] if i else None
+        return CLASS_RANK[rank] if rank is not None else ""
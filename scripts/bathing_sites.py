@@ -0,0 +1,88 @@
+"""The bathing sites ``poo.py`` reports on, for the modelling scripts.
+
+The models started out Conham-only (``CONHAM_LAT`` / ``CONHAM_LON`` and the
+Conham sampling CSV in every script). ``SITES`` lists every site the live
+report covers with the coordinates and upstream rule ``poo.py`` uses, plus the
+E. coli sampling CSV its model is fitted to (same columns as
+``conham_sampling_2025_2026_e_coli.csv``: ``sample_date``, ``cfu_per_100ml``).
+Only Conham has sampling data so far. For another site, commit a CSV at its
+``samples_csv`` path and it is picked up.
+
+Outfall windows come from the spill cube, which is built from the
+Conham-filtered event dump. Outfalls upstream of Salford, Warleigh and Publow
+are in it. The River Frome outfalls above Farleigh are not (that site needs its
+own event dump), so Farleigh is marked ``in_spill_cube=False`` and the models
+refuse it.
+
+``watercourses`` is the site's ``rivers_to_query`` list from ``poo.py``. The
+cube rows are kept only if their ``receiving_watercourse`` is in that list
+(compared case-insensitively: the EDM view upper-cases names the activity feed
+writes in lower case), before the upstream test. Conham's is None: the cube is
+already built from Conham's watercourse filter.
+
+``upstream`` is a vectorised (lat, lon) -> bool rule, ``poo.py``'s test for
+that site. The thresholds and watercourse lists are copies of ``poo.py``'s
+``is_upstream_*`` functions and ``rivers_to_query`` (``poo.py`` cannot import
+from ``scripts/``): keep the two in sync. Conham's is None: its committed features count every outfall in the
+watercourse filter, downstream ones included, and its models keep doing so.
+Standard library only.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+
+@dataclass(frozen=True)
+class BathingSite:
+    key: str
+    label: str
+    lat: float
+    lon: float
+    samples_csv: str
+    upstream: Callable | None = None
+    watercourses: tuple[str, ...] | None = None
+    in_spill_cube: bool = True
+
+    def has_samples(self) -> bool:
+        return Path(self.samples_csv).exists()
+
+
+# Upstream thresholds and watercourse lists copied from poo.py's is_upstream_* and
+# rivers_to_query: change them together.
+SITES: dict[str, BathingSite] = {
+    site.key: site
+    for site in (
+        BathingSite("conham", "Avon at Conham", 51.444858, -2.534812,
+                    "docs/data/conham_sampling_2025_2026_e_coli.csv"),
+        BathingSite("salford", "Avon at Salford", 51.398639, -2.446917,
+                    "docs/data/salford_sampling_e_coli.csv", lambda lat, lon: lon > -2.457616,
+                    ("RIVER AVON", "bathford brook (s)", "horsecombe brook", "river avon via sws",
+                     "river avon (via sws)")),
+        BathingSite("warleigh", "Avon at Warleigh Weir", 51.376556, -2.301611,
+                    "docs/data/warleigh_sampling_e_coli.csv", lambda lat, lon: lat < 51.3736,
+                    ("RIVER AVON", "bathford brook (s)", "Bristol Avon", "River Frome", "river avon via sws",
+                     "river avon (via sws)")),
+        BathingSite("chew", "River Chew at Publow", 51.375278, -2.543306,
+                    "docs/data/chew_sampling_e_coli.csv", lambda lat, lon: lon < -2.5432,
+                    ("RIVER CHEW", "winford brook", "river chew(s)")),
+        BathingSite("farleigh", "River Frome at Farleigh Hungerford", 51.3299, -2.288,
+                    "docs/data/farleigh_sampling_e_coli.csv", lambda lat, lon: lat < 51.3299,
+                    ("River Frome", "Bristol Avon", "river avon via sws"), in_spill_cube=False),
+    )
+}
+
+
+def resolve_sites(text: str | None) -> list[BathingSite]:
+    """``"conham,salford"`` -> those sites; None -> every site with a sampling CSV."""
+    if text is None:
+        sites = [site for site in SITES.values() if site.has_samples()]
+        if not sites:
+            raise SystemExit("No bathing site has a sampling CSV yet")
+        return sites
+    keys = [key.strip() for key in text.split(",") if key.strip()]
+    unknown = [key for key in keys if key not in SITES]
+    if unknown:
+        raise SystemExit(f"Unknown site(s): {', '.join(unknown)} (choose from {', '.join(SITES)})")
+    return [SITES[key] for key in keys]
@@ -9,17 +9,27 @@ Combines, on a daily calendar for 2025:
 - the catchment-wide daily peak CAPE (thunderstorm instability, J/kg) from
   ``docs/data/rainfall_intensity_daily_max.csv`` if present.
 
+The bathing-water class so far at each sample date comes from
+``bathing_class.ClassificationEngine`` (running log moments over the
+Directive's four-season window).
+
 E. coli and CSO columns are populated only on sample dates (blank otherwise) so
-they plot as weekly markers over the daily weather lines. Standard library only.
+they plot as weekly markers over the daily weather lines. Each source is read
+into a ``day_frame.DayFrame`` and the merge is one join on the day index, so
+``--year`` / ``--start`` / ``--end`` pick any range the sources cover. Needs
+NumPy.
 """
 from __future__ import annotations
 
-import csv
-import math
-import statistics
-from datetime import date, timedelta
+import argparse
+from datetime import date
 from pathlib import Path
 
+import numpy as np
+
+from bathing_class import CLASS_RANK, ClassificationEngine
+from day_frame import DayFrame, read_csv
+
 WEATHER = "docs/data/conham_weather_daily.csv"
 FEATURES = "docs/data/conham_cso_ecoli_features.csv"
 SAMPLING = "docs/data/conham_sampling_2025_2026.csv"
@@ -28,146 +38,121 @@ NEARBY_DAILY_CSO = "docs/data/conham_cso_nearby_daily.csv"
 INTENSITY = "docs/data/rainfall_intensity_daily_max.csv"
 OUTPUT = "docs/data/conham_2025_timeseries.csv"
 
-# UK Bathing Water Directive (2006/7/EC) classification, INLAND waters. Classes
-# are decided from log-normal percentiles of the sample set: the 95-percentile
-# (z=1.65) for Excellent/Good and the 90-percentile (z=1.282) for Sufficient.
-CLASS_RANK = {0: "excellent", 1: "good", 2: "sufficient", 3: "poor"}
-MIN_SAMPLES_TO_CLASSIFY = 5  # percentiles are meaningless with too few points
-
-
-def _percentile(values: list[float], z: float) -> float:
-    """Log-normal percentile used by the Directive: antilog(mean + z*sd)."""
-    logs = [math.log10(v) for v in values]
-    return 10 ** (statistics.fmean(logs) + z * statistics.stdev(logs))
+# Output column -> how it is written (default: str() of the float).
+HOURS = "{:.1f}".format
+FORMATS = {
+    "intestinal_enterococci_cfu_per_100ml": "{:g}",
+    "cso_spill_hours_sameday": HOURS,
+    "cso_spill_hours_2d": HOURS,
+    "cso_spill_hours_7d": HOURS,
+    "cso_nearby_spill_hours_sameday": HOURS,
+    "cso_nearby_spill_hours_2d": HOURS,
+}
+
+
+def optional(path: str, columns: dict[str, str], **kwargs) -> DayFrame:
+    """``columns`` of ``path`` renamed, or all-missing columns if the file has not been fetched."""
+    if not Path(path).exists():
+        return DayFrame(date.today(), 0).select(columns)
+    return read_csv(path, columns=list(columns), **kwargs).select(columns)
+
+
+def bathing_classes(frame: DayFrame) -> dict[date, str]:
+    """UK bathing-water class AS OF each sample date.
+
+    From the percentiles of the samples up to and including it within the
+    Directive's four-season window (the causal "rating so far"), streamed
+    through running log moments; the worse of the E. coli and enterococci
+    classes. Only dates with both indicators count.
+    """
+    engine = ClassificationEngine()
+    both = frame.present["ecoli_cfu_per_100ml"] & frame.present["intestinal_enterococci_cfu_per_100ml"]
+    days = frame.days()
+    classes = {}
+    for k in np.flatnonzero(both):
+        rank = engine.add("conham", days[k], frame.values["ecoli_cfu_per_100ml"][k],
+                          frame.values["intestinal_enterococci_cfu_per_100ml"][k])
+        if rank is not None:
+            classes[days[k]] = CLASS_RANK[rank]
+    return classes
 
 
-def bathing_class(ec: list[float], ent: list[float]) -> int:
-    """Worse (higher rank) of the E. coli and enterococci classes; 0=Excellent..3=Poor."""
-    ec95, ec90 = _percentile(ec, 1.65), _percentile(ec, 1.282)
-    en95, en90 = _percentile(ent, 1.65), _percentile(ent, 1.282)
-    ec_c = 0 if ec95 <= 500 else 1 if ec95 <= 1000 else 2 if ec90 <= 900 else 3
-    en_c = 0 if en95 <= 200 else 1 if en95 <= 400 else 2 if en90 <= 330 else 3
-    return max(ec_c, en_c)
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--year", type=int, default=2025, help="Calendar year to cover (within the weather record)")
+    parser.add_argument("--start", type=date.fromisoformat, help="First day (ISO date) instead of --year's")
+    parser.add_argument("--end", type=date.fromisoformat, help="Last day (ISO date) instead of --year's")
+    parser.add_argument("--output", default=OUTPUT)
+    return parser.parse_args()
 
 
 def main() -> int:
-    weather = {}
-    with open(WEATHER, newline="", encoding="utf-8") as h:
-        for r in csv.DictReader(h):
-            weather[r["date"]] = r
-    # E. coli per sample date (always from the feature table).
-    samples = {}
-    with open(FEATURES, newline="", encoding="utf-8") as h:
-        for r in csv.DictReader(h):
-            if int(r["lookback_days"]) == 7:
-                samples[r["sample_date"]] = {"ecoli": r["e_coli_cfu_per_100ml"]}
-
-    # Intestinal enterococci per sample date, from the combined sampling CSV.
-    entero = {}
-    sampling_path = Path(SAMPLING)
-    if sampling_path.exists():
-        with sampling_path.open(newline="", encoding="utf-8") as h:
-            for r in csv.DictReader(h):
-                entero[r["sample_date"]] = r.get("intestinal_enterococci_cfu_per_100ml", "")
-
-    # UK bathing-water class AS OF each sample date, from the percentiles of all
-    # samples up to and including it (expanding window -- the causal "rating so
-    # far"). Takes the worse of the E. coli and enterococci classes.
-    classes = {}
-    ec_hist, en_hist = [], []
-    for sd in sorted(samples):
-        try:
-            ec_hist.append(float(samples[sd]["ecoli"]))
-            en_hist.append(float(entero.get(sd, "")))
-        except ValueError:
-            continue
-        if len(ec_hist) >= MIN_SAMPLES_TO_CLASSIFY:
-            classes[sd] = CLASS_RANK[bathing_class(ec_hist, en_hist)]
+    args = parse_args()
+    # Days: the weather record within the requested range.
+    weather = read_csv(WEATHER, start=args.start or date(args.year, 1, 1), end=args.end or date(args.year, 12, 31))
+    span = weather.span()
+    if span is None:
+        raise SystemExit(f"No weather rows in the requested range in {WEATHER}")
+    days = DayFrame.empty(args.start or span[0], args.end or span[1])
+
+    # E. coli per sample date (always from the feature table) and intestinal
+    # enterococci from the combined sampling CSV.
+    samples = read_csv(FEATURES, "sample_date", ["e_coli_cfu_per_100ml"], where={"lookback_days": 7})
+    entero = optional(SAMPLING, {"intestinal_enterococci_cfu_per_100ml": "intestinal_enterococci_cfu_per_100ml"},
+                      date_column="sample_date")
 
     # CSO spill hours. Prefer the continuous DAILY series (conham_cso_daily.csv,
     # from daily_cso.py) so the CSO panels are populated every day; fall back to
-    # the sample-only feature windows if the daily fetch hasn't been run.
-    daily_cso = {}
+    # the sample-only feature windows (same-day = lookback 1, 2-day, 7-day) if
+    # the daily fetch hasn't been run.
     daily_path = Path(DAILY_CSO)
     if daily_path.exists():
-        with daily_path.open(newline="", encoding="utf-8") as h:
-            for r in csv.DictReader(h):
-                daily_cso[r["date"]] = (
-                    r["spill_hours_day"], r["spill_hours_2d"], r["spill_hours_7d"])
+        cso = [read_csv(DAILY_CSO).select({
+            "spill_hours_day": "cso_spill_hours_sameday",
+            "spill_hours_2d": "cso_spill_hours_2d",
+            "spill_hours_7d": "cso_spill_hours_7d",
+        })]
     else:
-        # Sample-only fallback: same-day (lookback 1), 2-day and 7-day windows.
-        with open(FEATURES, newline="", encoding="utf-8") as h:
-            per_sample = {}
-            for r in csv.DictReader(h):
-                lb = int(r["lookback_days"])
-                if lb in (1, 2, 7):
-                    per_sample.setdefault(r["sample_date"], {})[lb] = r["spill_hours_total"]
-        for sd, bylb in per_sample.items():
-            daily_cso[sd] = (bylb.get(1, ""), bylb.get(2, ""), bylb.get(7, ""))
-
-    # Nearby (<5 mi, upstream) CSO spill hours -- a tighter, distance-filtered
-    # counterpart to the all-upstream-rivers series above, from
-    # investigate_nearby_csos.py's `daily` step. Optional; blank if not run.
-    nearby_cso = {}
-    nearby_path = Path(NEARBY_DAILY_CSO)
-    if nearby_path.exists():
-        with nearby_path.open(newline="", encoding="utf-8") as h:
-            for r in csv.DictReader(h):
-                nearby_cso[r["date"]] = (r["spill_hours_day"], r["spill_hours_2d"])
-
-    # Catchment-wide daily peak CAPE and peak rainfall intensity (optional; blank
-    # if the intensity fetch hasn't been run/committed).
-    cape, peak_rain = {}, {}
-    intensity_path = Path(INTENSITY)
-    if intensity_path.exists():
-        with intensity_path.open(newline="", encoding="utf-8") as h:
-            for r in csv.DictReader(h):
-                cape[r["date"]] = r.get("catchment_max_cape_j_per_kg", "")
-                peak_rain[r["date"]] = r.get("catchment_max_mm_per_h", "")
-
-    days = sorted(d for d in weather if d.startswith("2025"))
-    start, end = date.fromisoformat(days[0]), date.fromisoformat(days[-1])
-    rows = []
-    d = start
-    while d <= end:
-        key = d.isoformat()
-        w = weather.get(key, {})
-        s = samples.get(key, {})
-        cso = daily_cso.get(key, ("", "", ""))
-        nearby = nearby_cso.get(key, ("", ""))
-        hrs = lambda v: (f"{float(v):.1f}" if v not in (None, "") else "")
-        rows.append({
-            "date": key,
-            "ecoli_cfu_per_100ml": s.get("ecoli", ""),
-            "intestinal_enterococci_cfu_per_100ml": entero.get(key, ""),
-            "bathing_class": classes.get(key, ""),
-            "cso_spill_hours_sameday": hrs(cso[0]),
-            "cso_spill_hours_2d": hrs(cso[1]),
-            "cso_spill_hours_7d": hrs(cso[2]),
-            "cso_nearby_spill_hours_sameday": hrs(nearby[0]),
-            "cso_nearby_spill_hours_2d": hrs(nearby[1]),
-            "rain_mm": w.get("precipitation_mm", ""),
-            "peak_rain_mm_per_h": peak_rain.get(key, ""),
-            "temp_mean_c": w.get("temp_mean_c", ""),
-            # Populated once wind is added to the weather fetch (blank until then).
-            "wind_max_kmh": w.get("windspeed_10m_max_kmh", w.get("wind_max_kmh", "")),
-            "cape_max_j_per_kg": cape.get(key, ""),
-        })
-        d += timedelta(days=1)
-
-    out = Path(OUTPUT)
-    with out.open("w", newline="", encoding="utf-8") as h:
-        writer = csv.DictWriter(h, fieldnames=list(rows[0].keys()))
-        writer.writeheader()
-        writer.writerows(rows)
-    n_samples = sum(1 for r in rows if r["ecoli_cfu_per_100ml"])
-    has_wind = any(r["wind_max_kmh"] for r in rows)
-    has_cape = any(r["cape_max_j_per_kg"] for r in rows)
-    cso_days = sum(1 for r in rows if r["cso_spill_hours_7d"] != "")
-    print(f"Wrote {out} ({len(rows)} days, {n_samples} sample dates)")
-    print(f"  CSO days populated: {cso_days} ({'daily series' if daily_path.exists() else 'sample-only fallback'})")
-    print(f"  wind data present: {has_wind}")
-    print(f"  CAPE data present: {has_cape}")
+        cso = [
+            read_csv(FEATURES, "sample_date", ["spill_hours_total"], where={"lookback_days": lookback})
+            .select({"spill_hours_total": name})
+            for lookback, name in ((1, "cso_spill_hours_sameday"), (2, "cso_spill_hours_2d"), (7, "cso_spill_hours_7d"))
+        ]
+
+    merged = days.join(
+        samples.select({"e_coli_cfu_per_100ml": "ecoli_cfu_per_100ml"}),
+        entero,
+        *cso,
+        # Nearby (<5 mi, upstream) CSO spill hours -- a tighter, distance-filtered
+        # counterpart to the all-upstream-rivers series above, from
+        # investigate_nearby_csos.py's `daily` step. Optional; blank if not run.
+        optional(NEARBY_DAILY_CSO, {"spill_hours_day": "cso_nearby_spill_hours_sameday",
+                                    "spill_hours_2d": "cso_nearby_spill_hours_2d"}),
+        # Wind is populated once it is added to the weather fetch (blank until then).
+        weather.select({"precipitation_mm": "rain_mm", "temp_mean_c": "temp_mean_c",
+                        "windspeed_10m_max_kmh" if "windspeed_10m_max_kmh" in weather.values else "wind_max_kmh":
+                        "wind_max_kmh"}),
+        # Catchment-wide daily peak CAPE and peak rainfall intensity (optional;
+        # blank if the intensity fetch hasn't been run/committed).
+        optional(INTENSITY, {"catchment_max_mm_per_h": "peak_rain_mm_per_h",
+                             "catchment_max_cape_j_per_kg": "cape_max_j_per_kg"}),
+    )
+    # Classes from every sample, not just those inside the output range.
+    history = samples.select({"e_coli_cfu_per_100ml": "ecoli_cfu_per_100ml"}).join(entero)
+    merged.set_at("bathing_class", bathing_classes(history), text=True)
+    merged = merged.select([
+        "ecoli_cfu_per_100ml", "intestinal_enterococci_cfu_per_100ml", "bathing_class",
+        "cso_spill_hours_sameday", "cso_spill_hours_2d", "cso_spill_hours_7d",
+        "cso_nearby_spill_hours_sameday", "cso_nearby_spill_hours_2d",
+        "rain_mm", "peak_rain_mm_per_h", "temp_mean_c", "wind_max_kmh", "cape_max_j_per_kg",
+    ])
+    out = Path(args.output)
+    n_days = merged.to_csv(out, FORMATS)
+    print(f"Wrote {out} ({n_days} days, {int(merged.present['ecoli_cfu_per_100ml'].sum())} sample dates)")
+    print(f"  CSO days populated: {int(merged.present['cso_spill_hours_7d'].sum())} "
+          f"({'daily series' if daily_path.exists() else 'sample-only fallback'})")
+    print(f"  wind data present: {bool(merged.present['wind_max_kmh'].any())}")
+    print(f"  CAPE data present: {bool(merged.present['cape_max_j_per_kg'].any())}")
     return 0
 
 
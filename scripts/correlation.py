@@ -0,0 +1,105 @@
+"""Correlation engine shared by the analysis scripts.
+
+``analyze_conham_cso_ecoli.model_table``, ``model_conham_ecoli_by_site``'s
+outfall ranking and ``weather_conham_ecoli``'s weather table all correlate many
+feature columns with one target (log10 E. coli). ``correlate`` does all the
+columns of a table at once: with NumPy, the columns are centred and scaled to
+unit norm once, and Pearson r is one matrix-vector product. Spearman's rho is
+the same product on average ranks, which are computed for every column in one
+sort. R^2 and n come along with them.
+
+Degenerate cases match the per-column ``pearson`` the scripts used to carry:
+fewer than 3 samples, a constant column or a constant target give NaN, and a
+NaN anywhere in a column makes its correlations NaN. ``pearson`` and ``ranks``
+remain as the pure-Python reference (and the fallback without NumPy).
+"""
+from __future__ import annotations
+
+import math
+
+try:
+    import numpy as np
+except ImportError:  # pure-Python fallback
+    np = None
+
+
+def pearson(xs: list[float], ys: list[float]) -> float:
+    if len(xs) < 3 or len(set(xs)) < 2 or len(set(ys)) < 2:
+        return float("nan")
+    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+    sx = math.sqrt(sum((x - mx) ** 2 for x in xs))
+    sy = math.sqrt(sum((y - my) ** 2 for y in ys))
+    return sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / (sx * sy)
+
+
+def ranks(values: list[float]) -> list[float]:
+    """1-based ranks, ties sharing their average rank."""
+    ordered = sorted((value, index) for index, value in enumerate(values))
+    out = [0.0] * len(values)
+    i = 0
+    while i < len(ordered):
+        j = i
+        while j + 1 < len(ordered) and ordered[j + 1][0] == ordered[i][0]:
+            j += 1
+        rank = (i + j + 2) / 2
+        for _, index in ordered[i : j + 1]:
+            out[index] = rank
+        i = j + 1
+    return out
+
+
+def _rank_rows(x):
+    """``ranks`` for every row of a (features x n) array in one sort."""
+    rows, n = x.shape
+    order = np.argsort(x, axis=1, kind="stable")
+    ordered = np.take_along_axis(x, order, axis=1)
+    new_group = np.ones((rows, n), dtype=bool)
+    new_group[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    positions = np.broadcast_to(np.arange(n), (rows, n))
+    first = np.maximum.accumulate(np.where(new_group, positions, 0), axis=1)
+    ends = np.ones((rows, n), dtype=bool)
+    ends[:, :-1] = new_group[:, 1:]
+    last = np.minimum.accumulate(np.where(ends, positions, n - 1)[:, ::-1], axis=1)[:, ::-1]
+    out = np.empty((rows, n))
+    np.put_along_axis(out, order, (first + last + 2) / 2.0, axis=1)
+    return out
+
+
+def _pearson_rows(x, y):
+    """Pearson r of every row of ``x`` with ``y``; NaN where ``pearson`` gives NaN."""
+    n = len(y)
+    if n < 3 or y.min() == y.max():
+        return np.full(len(x), np.nan)
+    xc = x - x.mean(axis=1, keepdims=True)
+    yc = y - y.mean()
+    norms = np.sqrt(np.square(xc).sum(axis=1))
+    live = x.min(axis=1) < x.max(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        r = (xc @ yc) / (norms * np.sqrt(yc @ yc))
+    return np.where(live, r, np.nan)
+
+
+def correlate(columns, target) -> dict[str, list[float]]:
+    """Pearson r, Spearman rho, R^2 and n of every column (one list per feature) against ``target``.
+
+    Returns ``{"pearson_r": [...], "spearman_rho": [...], "r_squared": [...], "n": [...]}``
+    in column order.
+    """
+    n = len(target)
+    if np is None or not len(columns):
+        r = [pearson(list(c), list(target)) for c in columns]
+        y_ranks = ranks(list(target))
+        rho = [pearson(ranks(list(c)), y_ranks) for c in columns]
+    else:
+        x = np.asarray(columns, dtype=float).reshape(len(columns), n)
+        y = np.asarray(target, dtype=float)
+        bad = np.isnan(x).any(axis=1) | bool(np.isnan(y).any())
+        r_arr = np.where(bad, np.nan, _pearson_rows(x, y))
+        rho_arr = np.where(bad, np.nan, _pearson_rows(_rank_rows(x), _rank_rows(y[None])[0]))
+        r, rho = r_arr.tolist(), rho_arr.tolist()
+    return {
+        "pearson_r": r,
+        "spearman_rho": rho,
+        "r_squared": [v * v if not math.isnan(v) else float("nan") for v in r],
+        "n": [n] * len(r),
+    }
@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""Typed binary sidecars for the large docs/data CSVs, loaded memory-mapped.
+
+The raw event dumps (``conham_cso_events_2025.csv``, 11k rows;
+``conham_nearby_cso_events.csv``, 23k rows), ``conham_cso_site_features.csv``
+and ``rainfall_intensity_by_site.csv`` used to go through ``csv.DictReader`` on
+every run. Each run re-split every line and re-parsed every float and
+timestamp with ``float`` / ``datetime.fromisoformat``, one row at a time.
+
+``load_table(path)`` parses a CSV once and writes one ``.npy`` per column under
+``.sidecar/<csv name>/<sha256 prefix>/`` next to it. Later loads hash the CSV,
+find the sidecar for that hash and ``np.load(..., mmap_mode="r")`` each column.
+Nothing is parsed, and a column is only paged in when it is read. The CSVs
+stay the committed source of truth. Editing one changes its hash, so the next
+load rebuilds the sidecar and removes the stale one. Sidecars are gitignored.
+
+Each column is stored under the first kind that reproduces every one of its
+values exactly (``Table.text`` gives back the CSV text):
+
+- ``bool``     -- every value ``True`` / ``False``;
+- ``int``      -- int64, every value an integer in canonical form;
+- ``float``    -- float64, every value empty (NaN) or a finite float whose
+  ``repr`` is the text;
+- ``date``     -- ``datetime64[D]``, every value ``YYYY-MM-DD``;
+- ``datetime`` -- ``datetime64[s]`` UTC, every value ``YYYY-MM-DDTHH:MM:SS+00:00``;
+- ``text``     -- anything else, as int32 codes into a sorted label array
+  (the outfall names and watercourses repeat thousands of times).
+
+The accessors convert on read, so callers don't depend on the inferred kind:
+``floats`` parses a text column's labels (not its rows), ``timestamps`` and
+``day_ordinals`` work on datetime, date or ISO text columns, and
+``categories`` gives (codes, labels) for grouping any column.
+
+    python scripts/csv_sidecar.py build           # (re)build the default sidecars
+    python scripts/csv_sidecar.py show            # kinds and status of each column
+    python scripts/csv_sidecar.py clean           # delete them
+
+Needs NumPy.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import math
+import os
+import shutil
+from datetime import date, datetime
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:  # callers keep their csv.DictReader path
+    np = None
+
+from model_artifact import file_sha256
+
+SIDECAR_FORMAT = 1
+SIDECAR_DIR = ".sidecar"
+HASH_PREFIX = 16
+DEFAULT_CSVS = [
+    "docs/data/conham_cso_events_2025.csv",
+    "docs/data/conham_nearby_cso_events.csv",
+    "docs/data/conham_cso_site_features.csv",
+    "docs/data/rainfall_intensity_by_site.csv",
+]
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+DAY_SECONDS = 86400
+
+
+def sidecar_root(path: Path) -> Path:
+    """Directory holding every built version of ``path``'s sidecar."""
+    return path.parent / SIDECAR_DIR / path.name
+
+
+# --------------------------------------------------------------------------- #
+# Column kinds
+# --------------------------------------------------------------------------- #
+def _is_int(text: str) -> bool:
+    try:
+        return str(int(text)) == text
+    except ValueError:
+        return False
+
+
+def _is_float(text: str) -> bool:
+    if text == "":
+        return True
+    try:
+        value = float(text)
+    except ValueError:
+        return False
+    return math.isfinite(value) and repr(value) == text
+
+
+def _is_date(text: str) -> bool:
+    try:
+        return len(text) == 10 and date.fromisoformat(text).isoformat() == text
+    except ValueError:
+        return False
+
+
+def _is_utc_datetime(text: str) -> bool:
+    try:
+        when = datetime.fromisoformat(text)
+    except ValueError:
+        return False
+    return (when.utcoffset() is not None and not when.utcoffset() and not when.microsecond
+            and when.isoformat() == text)
+
+
+def infer_kind(values: list[str]) -> str:
+    """The first kind that stores every value of a column losslessly."""
+    if values and all(v in ("True", "False") for v in values):
+        return "bool"
+    if values and all(_is_int(v) for v in values):
+        return "int"
+    if values and all(_is_float(v) for v in values):
+        return "float"
+    if values and all(_is_date(v) for v in values):
+        return "date"
+    if values and all(_is_utc_datetime(v) for v in values):
+        return "datetime"
+    return "text"
+
+
+def _encode(kind: str, values: list[str]) -> dict[str, "np.ndarray"]:
+    """Arrays to save for one column, keyed by file suffix."""
+    if kind == "bool":
+        return {"": np.array([v == "True" for v in values], dtype=bool)}
+    if kind == "int":
+        return {"": np.array([int(v) for v in values], dtype=np.int64)}
+    if kind == "float":
+        return {"": np.array([float(v) if v else np.nan for v in values], dtype=np.float64)}
+    if kind == "date":
+        return {"": np.array(values, dtype="datetime64[D]")}
+    if kind == "datetime":
+        return {"": np.array([v[:19] for v in values], dtype="datetime64[s]")}
+    labels, codes = np.unique(np.array(values, dtype=str), return_inverse=True)
+    return {"": codes.astype(np.int32), ".labels": labels}
+
+
+def _as_text(kind: str, values: "np.ndarray") -> list[str]:
+    """Stored values of a non-text column back to their CSV text."""
+    if kind == "bool":
+        return ["True" if v else "False" for v in values.tolist()]
+    if kind == "float":
+        return ["" if math.isnan(v) else repr(v) for v in values.tolist()]
+    if kind == "date":
+        return np.datetime_as_string(values, unit="D").tolist()
+    if kind == "datetime":
+        return [t + "+00:00" for t in np.datetime_as_string(values, unit="s").tolist()]
+    return [str(v) for v in values.tolist()]
+
+
+# --------------------------------------------------------------------------- #
+# Build / load
+# --------------------------------------------------------------------------- #
+def build_sidecar(path: Path, digest: str) -> Path:
+    """Parse ``path`` once and write its sidecar for ``digest``; returns the sidecar directory."""
+    with path.open(newline="", encoding="utf-8") as handle:
+        reader = csv.reader(handle)
+        header = next(reader, None)
+        if not header:
+            raise SystemExit(f"{path} has no header row")
+        columns: list[list[str]] = [[] for _ in header]
+        for row in reader:
+            if not row:
+                continue
+            row = row + [""] * (len(header) - len(row))
+            for column, value in zip(columns, row):
+                column.append(value)
+
+    root = sidecar_root(path)
+    final = root / digest[:HASH_PREFIX]
+    staging = root / f"{digest[:HASH_PREFIX]}.tmp-{os.getpid()}"
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+    manifest = {
+        "format": SIDECAR_FORMAT,
+        "source": path.name,
+        "source_sha256": digest,
+        "rows": len(columns[0]) if columns else 0,
+        "columns": [],
+    }
+    for k, (name, values) in enumerate(zip(header, columns)):
+        kind = infer_kind(values)
+        for suffix, array in _encode(kind, values).items():
+            np.save(staging / f"c{k}{suffix}.npy", array, allow_pickle=False)
+        manifest["columns"].append({"name": name, "kind": kind})
+    (staging / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    try:
+        staging.rename(final)
+    except OSError:  # another process built the same version first
+        shutil.rmtree(staging, ignore_errors=True)
+    for stale in root.iterdir():
+        if stale.name != final.name and ".tmp-" not in stale.name:
+            shutil.rmtree(stale, ignore_errors=True)
+    return final
+
+
+def _manifest(directory: Path, digest: str) -> dict | None:
+    try:
+        manifest = json.loads((directory / "manifest.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if manifest.get("format") != SIDECAR_FORMAT or manifest.get("source_sha256") != digest:
+        return None
+    return manifest
+
+
+def load_table(path: Path | str) -> "Table":
+    """Columns of ``path`` from its sidecar, building it first if missing or stale."""
+    if np is None:
+        raise SystemExit("csv_sidecar needs NumPy")
+    path = Path(path)
+    if not path.exists():
+        raise SystemExit(f"{path} not found")
+    digest = file_sha256(path)
+    directory = sidecar_root(path) / digest[:HASH_PREFIX]
+    manifest = _manifest(directory, digest)
+    if manifest is None:
+        shutil.rmtree(directory, ignore_errors=True)
+        directory = build_sidecar(path, digest)
+        manifest = _manifest(directory, digest)
+        if manifest is None:
+            raise SystemExit(f"Could not build a sidecar for {path} in {directory}")
+    return Table(path, directory, manifest)
+
+
+class Table:
+    """Read-only columns of one CSV; arrays are memory-mapped from its sidecar.
+
+    ``table[name]`` is the stored array (labels already applied for text
+    columns); the typed accessors below convert whatever kind was stored.
+    """
+
+    def __init__(self, path: Path, directory: Path, manifest: dict):
+        self.path = path
+        self.directory = directory
+        self.n_rows = int(manifest["rows"])
+        self.kinds = {c["name"]: c["kind"] for c in manifest["columns"]}
+        self._index = {c["name"]: k for k, c in enumerate(manifest["columns"])}
+        self._arrays: dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    @property
+    def columns(self) -> list[str]:
+        return list(self._index)
+
+    def _load(self, name: str, suffix: str = "") -> np.ndarray:
+        key = name + suffix
+        if key not in self._arrays:
+            if name not in self._index:
+                raise SystemExit(f"{self.path} has no column {name!r}")
+            self._arrays[key] = np.load(self.directory / f"c{self._index[name]}{suffix}.npy", mmap_mode="r")
+        return self._arrays[key]
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        if self.kinds.get(name) == "text":
+            return self._load(name, ".labels")[self._load(name)]
+        return self._load(name)
+
+    def categories(self, name: str) -> tuple[np.ndarray, list[str]]:
+        """(int code per row, distinct CSV values in sorted order) for grouping by a column."""
+        kind = self.kinds.get(name)
+        if kind == "text":
+            return self._load(name), self._load(name, ".labels").tolist()
+        distinct, codes = np.unique(self._load(name), return_inverse=True)
+        return codes, _as_text(kind, distinct)
+
+    def text(self, name: str) -> list[str]:
+        """The column exactly as written in the CSV."""
+        kind = self.kinds.get(name)
+        if kind == "text":
+            labels = self._load(name, ".labels").tolist()
+            return [labels[code] for code in self._load(name).tolist()]
+        return _as_text(kind, self._load(name))
+
+    def _from_labels(self, name: str, parse, dtype=float) -> np.ndarray:
+        """Apply ``parse`` to each distinct value of a column and spread it over the rows."""
+        codes, labels = self.categories(name)
+        return np.array([parse(label) for label in labels], dtype=dtype)[codes]
+
+    def floats(self, name: str, blank: tuple[str, ...] = ("",)) -> np.ndarray:
+        """float64 values; text in ``blank`` is NaN."""
+        kind = self.kinds.get(name)
+        if kind in ("float", "int", "bool"):
+            return np.asarray(self._load(name), dtype=np.float64)
+        if kind == "text":
+            return self._from_labels(name, lambda t: math.nan if t in blank else float(t))
+        raise SystemExit(f"{self.path}: column {name!r} holds {kind}s, not numbers")
+
+    def ints(self, name: str) -> np.ndarray:
+        """int64 values (every row must hold an integer)."""
+        kind = self.kinds.get(name)
+        if kind in ("int", "bool"):
+            return np.asarray(self._load(name), dtype=np.int64)
+        if kind == "text":
+            return self._from_labels(name, int, np.int64)
+        raise SystemExit(f"{self.path}: column {name!r} holds {kind}s, not integers")
+
+    def flags(self, name: str) -> np.ndarray:
+        """bool per row: the value reads ``true`` in any case."""
+        return self._from_labels(name, lambda t: t.lower() == "true", bool)
+
+    def timestamps(self, name: str) -> np.ndarray:
+        """POSIX seconds (float64) of a datetime or ISO-text column, as ``datetime.fromisoformat(...).timestamp()``."""
+        kind = self.kinds.get(name)
+        if kind == "datetime":
+            return self._load(name).astype(np.int64).astype(np.float64)
+        if kind == "text":
+            return self._from_labels(name, lambda t: datetime.fromisoformat(t).timestamp())
+        raise SystemExit(f"{self.path}: column {name!r} holds {kind}s, not timestamps")
+
+    def day_ordinals(self, name: str) -> np.ndarray:
+        """``date.toordinal()`` of each row's calendar date (in the timestamp's own UTC offset)."""
+        kind = self.kinds.get(name)
+        if kind == "date":
+            return self._load(name).astype(np.int64) + EPOCH_ORDINAL
+        if kind == "datetime":
+            return self._load(name).astype(np.int64) // DAY_SECONDS + EPOCH_ORDINAL
+        if kind == "text":
+            return self._from_labels(name, lambda t: datetime.fromisoformat(t).date().toordinal(), np.int64)
+        raise SystemExit(f"{self.path}: column {name!r} holds {kind}s, not dates")
+
+
+# --------------------------------------------------------------------------- #
+# CLI
+# --------------------------------------------------------------------------- #
+def run_build(args) -> int:
+    for name in args.csv or DEFAULT_CSVS:
+        table = load_table(name)
+        print(f"{name}: {table.n_rows} rows, {len(table.columns)} columns -> {table.directory}")
+    return 0
+
+
+def run_show(args) -> int:
+    for name in args.csv or DEFAULT_CSVS:
+        path = Path(name)
+        if not path.exists():
+            print(f"{name}: missing")
+            continue
+        digest = file_sha256(path)
+        manifest = _manifest(sidecar_root(path) / digest[:HASH_PREFIX], digest)
+        if manifest is None:
+            print(f"{name}: no current sidecar (built on next load)")
+            continue
+        print(f"{name}: {manifest['rows']} rows, sidecar {digest[:HASH_PREFIX]}")
+        for column in manifest["columns"]:
+            print(f"  {column['name']:<32} {column['kind']}")
+    return 0
+
+
+def run_clean(args) -> int:
+    for name in args.csv or DEFAULT_CSVS:
+        root = sidecar_root(Path(name))
+        if root.exists():
+            shutil.rmtree(root)
+            print(f"Removed {root}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command")
+    for command, func, text in (
+        ("build", run_build, "Build (or refresh) sidecars"),
+        ("show", run_show, "Print each column's stored kind"),
+        ("clean", run_clean, "Delete sidecars"),
+    ):
+        p = sub.add_parser(command, help=text)
+        p.add_argument("csv", nargs="*", help="CSV files (default: the large docs/data tables)")
+        p.set_defaults(func=func)
+    return parser
+
+
+def main() -> int:
+    parser = build_parser()
+    args = parser.parse_args()
+    if not getattr(args, "command", None):
+        parser.print_help()
+        return 1
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
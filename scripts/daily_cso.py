@@ -30,8 +30,10 @@ outbound access to ``services.arcgis.com``:
 `fetch` writes both the raw per-event dump (`conham_cso_events_2025.csv`) and the
 daily aggregate (`conham_cso_daily.csv`); commit both. `build` lets you
 re-aggregate the daily CSV from the committed raw events without re-querying.
+With NumPy, `build` reads the events from their binary sidecar
+(``csv_sidecar.py``) instead of re-parsing the CSV.
 
-Standard library only.
+Standard library only (NumPy optional).
 """
 from __future__ import annotations
 
@@ -46,6 +48,13 @@ from collections import defaultdict
 from datetime import date, datetime, time as dt_time, timedelta, timezone
 from pathlib import Path
 
+try:
+    import numpy as np
+except ImportError:  # csv.DictReader fallback
+    np = None
+
+from csv_sidecar import load_table
+
 ARCGIS_QUERY_URL = "https://services.arcgis.com/3SZ6e0uCvPROr4mS/arcgis/rest/services/Wessex_Water_Event_Duration_Monitoring_2025_view/FeatureServer/0/query"
 # Same Conham upstream watercourses as analyze_conham_cso_ecoli.py / poo.py.
 CONHAM_RIVERS = [
@@ -134,7 +143,7 @@ def _write_events(events: list[dict], path: Path) -> None:
     with path.open("w", newline="", encoding="utf-8") as h:
         writer = csv.DictWriter(h, fieldnames=[
             "site_id", "site_name", "receiving_watercourse",
-            "event_start", "event_end", "duration_hours"])
+            "event_start", "event_end", "duration_hours"], lineterminator="\n")
         writer.writeheader()
         writer.writerows(events)
 
@@ -147,7 +156,27 @@ def aggregate_daily(events: list[dict]) -> list[dict]:
         d = datetime.fromisoformat(e["event_start"]).date()
         by_day_hours[d] += float(e["duration_hours"])
         by_day_events[d] += 1
+    return _daily_rows(by_day_hours, by_day_events)
+
+
+def aggregate_daily_table(table) -> list[dict]:
+    """``aggregate_daily`` over a ``csv_sidecar.Table`` of the events: one bincount per total.
 
+    ``np.bincount`` adds each day's durations in file order, so the sums are
+    bit-identical to the row loop.
+    """
+    days = table.day_ordinals("event_start")
+    if not len(days):
+        return _daily_rows({}, {})
+    first = int(days.min())
+    offsets = days - first
+    hours = np.bincount(offsets, weights=table.floats("duration_hours")).tolist()
+    counts = np.bincount(offsets).tolist()
+    return _daily_rows({date.fromordinal(first + k): h for k, h in enumerate(hours) if counts[k]},
+                       {date.fromordinal(first + k): n for k, n in enumerate(counts) if n})
+
+
+def _daily_rows(by_day_hours: dict[date, float], by_day_events: dict[date, int]) -> list[dict]:
     rows = []
     d = FETCH_START
     while d < FETCH_END:
@@ -167,7 +196,8 @@ def aggregate_daily(events: list[dict]) -> list[dict]:
 def _write_daily(rows: list[dict], path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     with path.open("w", newline="", encoding="utf-8") as h:
-        writer = csv.DictWriter(h, fieldnames=list(rows[0].keys()))
+        # LF like the committed file, so a rebuild of unchanged data leaves no diff.
+        writer = csv.DictWriter(h, fieldnames=list(rows[0].keys()), lineterminator="\n")
         writer.writeheader()
         writer.writerows(rows)
 
@@ -196,9 +226,13 @@ def run_build(args) -> int:
     events_path = Path(args.events)
     if not events_path.exists():
         raise SystemExit(f"{events_path} not found. Run `fetch` first (needs ArcGIS access).")
-    with events_path.open(newline="", encoding="utf-8") as h:
-        events = list(csv.DictReader(h))
-    rows = aggregate_daily(events)
+    if np is not None:
+        events = load_table(events_path)
+        rows = aggregate_daily_table(events)
+    else:
+        with events_path.open(newline="", encoding="utf-8") as h:
+            events = list(csv.DictReader(h))
+        rows = aggregate_daily(events)
     _write_daily(rows, Path(args.daily))
     print(f"Wrote {args.daily} ({len(rows)} days) from {len(events)} committed events")
     return 0
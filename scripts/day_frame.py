@@ -0,0 +1,253 @@
+"""Columnar frame on a dense day index, with loaders for the day-keyed docs/data CSVs.
+
+``build_2025_timeseries`` used to read six CSVs into dicts of string-keyed rows
+and join them by walking the calendar with string lookups, one day at a time.
+``DayFrame`` holds the same data as columns:
+
+- one row per calendar day from ``start``, addressed by day ordinal offset;
+- per column, a typed NumPy array (float64, or object for text) and a boolean
+  ``present`` mask, so a missing value is explicit rather than an empty string;
+- ``join`` lines other frames up on this frame's days by array offsets
+  (``reindex``), not per-day lookups;
+- ``select`` picks and renames columns; ``to_csv`` writes them back out.
+
+``load(name)`` reads any day-keyed CSV in ``DATA_FILES``. Only the rows in the
+requested date range are kept, and only matching ``where`` rows (for example one
+lookback of the feature table, or one site of the long intensity table). Memory
+grows with days x columns kept, not with the size of the source. A merge over
+several years or sites is a join of such frames:
+
+    days = DayFrame.empty(date(2025, 1, 1), date(2025, 12, 31))
+    merged = days.join(load("conham_weather_daily.csv").select({"precipitation_mm": "rain_mm"}),
+                       load("conham_cso_daily.csv"),
+                       load("rainfall_intensity_by_site.csv", site="Bath", columns=["rain_max_mm_per_h"]))
+
+``weather_engine.DailySeries`` is the single-site, numeric-only relative used for
+windowed sums. Needs NumPy.
+"""
+from __future__ import annotations
+
+import csv
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+
+DATA_DIR = "docs/data"
+
+# Day-keyed CSVs under docs/data: file name -> its date column.
+DATA_FILES: dict[str, str] = {
+    "conham_weather_daily.csv": "date",
+    "conham_upstream_weather_daily.csv": "date",
+    "conham_cso_daily.csv": "date",
+    "conham_cso_nearby_daily.csv": "date",
+    "rainfall_intensity_daily_max.csv": "date",
+    "rainfall_intensity_by_site.csv": "date",               # one row per site: where site=...
+    "conham_sampling_2025_2026.csv": "sample_date",
+    "conham_sampling_2025_2026_e_coli.csv": "sample_date",
+    "conham_sampling_2025_2026_intestinal_enterococci.csv": "sample_date",
+    "conham_cso_ecoli_features.csv": "sample_date",         # one row per lookback: where lookback_days=...
+    "conham_ecoli_model_predictions.csv": "sample_date",
+    "conham_ecoli_site_model_predictions.csv": "sample_date",
+    "conham_weather_ecoli_predictions.csv": "sample_date",
+    "conham_ecoli_model_comparison.csv": "sample_date",
+    "conham_2025_timeseries.csv": "date",
+}
+# Tables with several rows per day: the column(s) load(..., where) must fix to
+# leave one row per date.
+KEY_COLUMNS: dict[str, tuple[str, ...]] = {
+    "rainfall_intensity_by_site.csv": ("site",),
+    "conham_cso_ecoli_features.csv": ("lookback_days",),
+}
+
+
+class DayFrame:
+    """Columns over the ``n_days`` consecutive days from ``start``.
+
+    ``values[name]`` is a float64 (or, for text, object) array of length
+    ``n_days`` and ``present[name]`` the matching bool mask; values where the
+    mask is False are meaningless (NaN / "").
+    """
+
+    def __init__(self, start: date, n_days: int):
+        self.start = start
+        self.n_days = n_days
+        self.values: dict[str, np.ndarray] = {}
+        self.present: dict[str, np.ndarray] = {}
+
+    @classmethod
+    def empty(cls, start: date, end: date) -> "DayFrame":
+        """No columns, days ``start``..``end`` inclusive."""
+        return cls(start, max((end - start).days + 1, 0))
+
+    @property
+    def end(self) -> date:
+        return self.start + timedelta(days=self.n_days - 1)
+
+    @property
+    def columns(self) -> list[str]:
+        return list(self.values)
+
+    def days(self) -> list[date]:
+        return [self.start + timedelta(days=k) for k in range(self.n_days)]
+
+    def positions(self, days) -> np.ndarray:
+        """Row of each date (-1 where it falls outside the frame)."""
+        offsets = np.array([d.toordinal() for d in days], dtype=np.int64) - self.start.toordinal()
+        return np.where((offsets >= 0) & (offsets < self.n_days), offsets, -1)
+
+    def set(self, name: str, values, present=None) -> None:
+        """Add or replace a column; ``present`` defaults to "not NaN" (numeric) / "not empty" (text)."""
+        values = np.asarray(values)
+        if values.shape != (self.n_days,):
+            raise SystemExit(f"Column {name} has {values.shape[0] if values.ndim else 0} rows for {self.n_days} days")
+        if values.dtype.kind in "fiub":
+            values = values.astype(np.float64)
+            mask = ~np.isnan(values)
+        else:
+            values = values.astype(object)
+            mask = np.array([v not in ("", None) for v in values], dtype=bool)
+        self.values[name] = values
+        self.present[name] = mask if present is None else np.asarray(present, dtype=bool) & mask
+
+    def set_at(self, name: str, by_day: dict[date, object], text: bool = False) -> None:
+        """A column from ``{date: value}``, missing elsewhere (dates outside the frame are dropped)."""
+        values = np.full(self.n_days, "" if text else np.nan, dtype=object if text else np.float64)
+        if by_day:
+            rows = self.positions(by_day)
+            keep = rows >= 0
+            values[rows[keep]] = np.array(list(by_day.values()), dtype=values.dtype)[keep]
+        self.set(name, values)
+
+    def reindex(self, start: date, end: date) -> "DayFrame":
+        """The same columns on days ``start``..``end``: slices where the days overlap, missing elsewhere."""
+        out = DayFrame.empty(start, end)
+        shift = (start - self.start).days
+        lo, hi = max(shift, 0), min(shift + out.n_days, self.n_days)
+        for name, values in self.values.items():
+            text = values.dtype == object
+            column = np.full(out.n_days, "" if text else np.nan, dtype=values.dtype)
+            mask = np.zeros(out.n_days, dtype=bool)
+            if lo < hi:
+                column[lo - shift:hi - shift] = values[lo:hi]
+                mask[lo - shift:hi - shift] = self.present[name][lo:hi]
+            out.values[name], out.present[name] = column, mask
+        return out
+
+    def join(self, *others: "DayFrame") -> "DayFrame":
+        """This frame's days with the columns of ``others`` added (left join on date)."""
+        out = self.reindex(self.start, self.end)
+        for other in others:
+            aligned = other.reindex(self.start, self.end)
+            for name in aligned.values:
+                if name in out.values:
+                    raise SystemExit(f"Column {name} is in more than one joined frame; select/rename it first")
+                out.values[name], out.present[name] = aligned.values[name], aligned.present[name]
+        return out
+
+    def select(self, columns) -> "DayFrame":
+        """Keep ``columns`` (a list, or {old: new} to rename), in that order; absent ones are all-missing."""
+        mapping = columns if isinstance(columns, dict) else {name: name for name in columns}
+        out = DayFrame(self.start, self.n_days)
+        for old, new in mapping.items():
+            if old in self.values:
+                out.values[new], out.present[new] = self.values[old], self.present[old]
+            else:
+                out.values[new], out.present[new] = np.full(self.n_days, np.nan), np.zeros(self.n_days, dtype=bool)
+        return out
+
+    def span(self, name: str | None = None) -> tuple[date, date] | None:
+        """First and last day on which ``name`` (default: any column) is present."""
+        if name is None:
+            mask = np.logical_or.reduce(list(self.present.values())) if self.present else np.zeros(self.n_days, bool)
+        else:
+            mask = self.present[name]
+        rows = np.flatnonzero(mask)
+        if not len(rows):
+            return None
+        return self.start + timedelta(days=int(rows[0])), self.start + timedelta(days=int(rows[-1]))
+
+    def to_csv(self, path: Path | str, formats: dict | None = None, date_column: str = "date") -> int:
+        """Write every day as a row; missing values are empty, floats ``str()``'d unless ``formats``
+        maps the column to a format string or callable. Returns the row count."""
+        formats = formats or {}
+        names = self.columns
+        cells = []
+        for name in names:
+            fmt = formats.get(name, str)
+            fmt = fmt.format if isinstance(fmt, str) else fmt
+            values, mask = self.values[name], self.present[name]
+            cells.append([fmt(v) if ok else "" for v, ok in zip(values.tolist(), mask.tolist())])
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", newline="", encoding="utf-8") as handle:
+            writer = csv.writer(handle)
+            writer.writerow([date_column] + names)
+            for k, day in enumerate(self.days()):
+                writer.writerow([day.isoformat()] + [column[k] for column in cells])
+        return self.n_days
+
+
+def _parse_column(texts: list[str]) -> np.ndarray:
+    """float64 (NaN for empty) if every non-empty value parses, else an object array of the text."""
+    try:
+        return np.array([float(t) if t not in ("", None) else np.nan for t in texts], dtype=np.float64)
+    except ValueError:
+        return np.array([t if t is not None else "" for t in texts], dtype=object)
+
+
+def read_csv(path: Path | str, date_column: str = "date", columns=None, start: date | None = None,
+             end: date | None = None, where: dict[str, str] | None = None) -> DayFrame:
+    """A ``DayFrame`` of ``columns`` (default: all but the date and ``where`` columns) from a day-keyed CSV.
+
+    Rows are streamed: only those dated ``start``..``end`` (default: the file's
+    own range) and matching every ``where`` column are kept. A date that
+    still repeats is a SystemExit (``where`` must pick one row per date). Each
+    column is numeric if every kept value parses as a float, text otherwise.
+    """
+    where = {k: str(v) for k, v in (where or {}).items()}
+    lo = start.toordinal() if start else None
+    hi = end.toordinal() if end else None
+    rows_by_day: dict[int, dict[str, str]] = {}
+    with Path(path).open(newline="", encoding="utf-8") as handle:
+        reader = csv.DictReader(handle)
+        fields = reader.fieldnames or []
+        if date_column not in fields:
+            raise SystemExit(f"{path} has no {date_column} column")
+        names = list(columns) if columns is not None else [f for f in fields if f != date_column and f not in where]
+        for row in reader:
+            if any(row.get(k) != v for k, v in where.items()):
+                continue
+            ordinal = date.fromisoformat(row[date_column]).toordinal()
+            if (lo is not None and ordinal < lo) or (hi is not None and ordinal > hi):
+                continue
+            if ordinal in rows_by_day:
+                keys = f" beyond {where}" if where else ""
+                raise SystemExit(f"{path}: {row[date_column]} has more than one row{keys}; "
+                                 "pass where= columns that pick one row per date")
+            rows_by_day[ordinal] = {name: row.get(name, "") for name in names}
+    first = lo if lo is not None else min(rows_by_day, default=date.today().toordinal())
+    last = hi if hi is not None else max(rows_by_day, default=first - 1)
+    frame = DayFrame(date.fromordinal(first), max(last - first + 1, 0))
+    rows = np.array(list(rows_by_day), dtype=np.int64) - first
+    for name in names:
+        parsed = _parse_column([row[name] for row in rows_by_day.values()])
+        text = parsed.dtype == object
+        values = np.full(frame.n_days, "" if text else np.nan, dtype=parsed.dtype)
+        values[rows] = parsed
+        frame.set(name, values)
+    return frame
+
+
+def load(name: str, data_dir: str = DATA_DIR, columns=None, start: date | None = None, end: date | None = None,
+         **where) -> DayFrame:
+    """``read_csv`` for a file listed in ``DATA_FILES`` (missing file or ``KEY_COLUMNS`` -> SystemExit)."""
+    if name not in DATA_FILES:
+        raise SystemExit(f"{name} is not a day-keyed docs/data CSV (choose from {', '.join(DATA_FILES)})")
+    missing = [key for key in KEY_COLUMNS.get(name, ()) if key not in where]
+    if missing:
+        raise SystemExit(f"{name} has several rows per date; pass {', '.join(f'{key}=...' for key in missing)}")
+    path = Path(data_dir) / name
+    if not path.exists():
+        raise SystemExit(f"{path} not found")
+    return read_csv(path, DATA_FILES[name], columns, start, end, where)
@@ -16,7 +16,8 @@ the run-up to each high-E. coli sample.
     python scripts/investigate_nearby_csos.py fetch    # ArcGIS -> nearby events CSV (needs network)
     python scripts/investigate_nearby_csos.py report   # offline: which spilled before the spikes
 
-Standard library only.
+Standard library only (NumPy optional: `daily` then reads the events from their
+binary sidecar, see ``csv_sidecar.py``).
 """
 from __future__ import annotations
 
@@ -32,6 +33,13 @@ from collections import defaultdict
 from datetime import date, datetime, time as dt_time, timedelta, timezone
 from pathlib import Path
 
+try:
+    import numpy as np
+except ImportError:  # load_events fallback
+    np = None
+
+from csv_sidecar import load_table
+
 ARCGIS_QUERY_URL = "https://services.arcgis.com/3SZ6e0uCvPROr4mS/arcgis/rest/services/Wessex_Water_Event_Duration_Monitoring_2025_view/FeatureServer/0/query"
 CONHAM_LAT = 51.444858
 CONHAM_LON = -2.534812
@@ -276,7 +284,28 @@ def aggregate_nearby_daily(events: list[dict]) -> list[dict]:
             continue
         d = e["_start"].date()
         by_day_hours[d] += float(e["duration_hours"]) if e["duration_hours"] not in ("", "?") else 0.0
+    return _nearby_daily_rows(by_day_hours)
+
+
+def aggregate_nearby_daily_table(table) -> list[dict]:
+    """``aggregate_nearby_daily`` over a ``csv_sidecar.Table`` of the events, as array masks.
 
+    Kept events are summed per day in file order (``np.bincount``), so the
+    totals match the row loop bit for bit.
+    """
+    distance = np.nan_to_num(table.floats("distance_miles"), nan=999.0)
+    keep = table.flags("upstream") & (distance <= NEARBY_PANEL_MILES)
+    days = table.day_ordinals("event_start")[keep]
+    if not len(days):
+        return _nearby_daily_rows({})
+    hours = np.nan_to_num(table.floats("duration_hours", blank=("", "?"))[keep])
+    first = int(days.min())
+    totals = np.bincount(days - first, weights=hours).tolist()
+    kept = np.bincount(days - first).tolist()
+    return _nearby_daily_rows({date.fromordinal(first + k): h for k, h in enumerate(totals) if kept[k]})
+
+
+def _nearby_daily_rows(by_day_hours: dict[date, float]) -> list[dict]:
     rows = []
     d = DAILY_START
     while d < DAILY_END:
@@ -294,8 +323,8 @@ def run_daily(args) -> int:
     events_path = Path(args.events)
     if not events_path.exists():
         raise SystemExit(f"{events_path} not found. Run `python {Path(__file__).name} fetch` first.")
-    events = load_events(events_path)
-    rows = aggregate_nearby_daily(events)
+    rows = aggregate_nearby_daily_table(load_table(events_path)) if np is not None \
+        else aggregate_nearby_daily(load_events(events_path))
     out = Path(args.daily)
     out.parent.mkdir(parents=True, exist_ok=True)
     with out.open("w", newline="", encoding="utf-8") as h:
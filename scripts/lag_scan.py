@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""Distributed-lag scan: which window of a daily driver tracks Conham E. coli?
+
+The models pick their windows from a handful of hand-chosen lookbacks (1-7
+days in the band features, offsets [lo, hi] up to a week in the weather
+script). This script scans the whole lag surface instead. For a daily driver
+series and every (offset, width) pair up to ``--max-offset`` x ``--max-width``
+days, the driver is summed over the days at offsets
+``[offset, offset + width - 1]`` before each sample (offset 0 = the sample day,
+as in ``weather_conham_ecoli.rain_offset_sum``), and each window sum is
+correlated with log10(E. coli).
+
+Drivers (``--driver``, repeatable):
+
+- ``cso``          -- Conham CSO spill hours per day (``conham_cso_daily.csv``);
+- ``nearby``       -- nearby-watercourse spill hours (``conham_cso_nearby_daily.csv``);
+- ``rain-conham``  -- daily precipitation at Conham (``conham_weather_daily.csv``);
+- ``rain-bath``    -- daily precipitation upstream in Bath;
+- ``intensity:<site>`` -- any site in ``rainfall_intensity_by_site.csv``
+  (``--intensity-column``, default ``rain_total_mm``);
+- ``<csv>:<column>`` -- any CSV with a ``date`` column.
+
+    python scripts/lag_scan.py                                  # all four default drivers, 31 x 30 surface
+    python scripts/lag_scan.py --driver cso --max-offset 60
+    python scripts/lag_scan.py --driver "intensity:Bradford-on-Avon" --driver rain-bath
+
+Method
+------
+Each driver is laid out on a dense day index and turned into prefix sums, so a
+window sum is one difference of two prefix entries. The window sums for every
+(offset, width, sample) come out of a single fancy-indexing step, and the
+correlations for a whole surface are one ``correlation.correlate`` call per
+set of usable samples. A sample is only used for a window that lies wholly
+inside the driver's record (a prefix count of present days gives this for free),
+so long windows at the start of the record drop early samples rather than
+silently summing zeros. Windows with fewer than ``--min-samples`` usable samples
+are left blank.
+
+Window sums go through ``log1p`` by default (``--transform none`` for signed
+drivers such as temperature); Spearman's rho does not depend on it.
+
+Output is long-format, one row per (driver, offset, width), ready to pivot into
+a heatmap, plus a markdown summary with the strongest windows and a coarse grid.
+With ~900 windows per driver on 25 samples the best cell is an optimistic pick;
+treat the surface's shape, not its maximum, as the result.
+
+Needs NumPy.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import math
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+from analyze_conham_cso_ecoli import read_samples
+from correlation import correlate
+from csv_sidecar import load_table
+
+SAMPLES_CSV = "docs/data/conham_sampling_2025_2026_e_coli.csv"
+CSO_DAILY_CSV = "docs/data/conham_cso_daily.csv"
+NEARBY_DAILY_CSV = "docs/data/conham_cso_nearby_daily.csv"
+WEATHER_CSV = "docs/data/conham_weather_daily.csv"
+UPSTREAM_WEATHER_CSV = "docs/data/conham_upstream_weather_daily.csv"
+INTENSITY_CSV = "docs/data/rainfall_intensity_by_site.csv"
+OUTPUT_CSV = "docs/data/conham_lag_scan.csv"
+REPORT_MD = "docs/data/conham_lag_scan.md"
+
+# name -> (csv, column)
+DRIVERS = {
+    "cso": (CSO_DAILY_CSV, "spill_hours_day"),
+    "nearby": (NEARBY_DAILY_CSV, "spill_hours_day"),
+    "rain-conham": (WEATHER_CSV, "precipitation_mm"),
+    "rain-bath": (UPSTREAM_WEATHER_CSV, "precipitation_mm"),
+}
+DEFAULT_DRIVERS = list(DRIVERS)
+TOP_WINDOWS = 10
+GRID_WIDTHS = (1, 2, 3, 5, 7, 10, 14, 21, 30)
+# Window sums are rounded before correlating so prefix-sum differences of
+# equal windows tie exactly (the inputs carry at most 2-3 decimals).
+ROUND_DECIMALS = 6
+
+
+# --------------------------------------------------------------------------- #
+# Drivers
+# --------------------------------------------------------------------------- #
+@dataclass
+class DailyDriver:
+    """A daily series on a dense day index; ``present`` marks days the source had."""
+
+    name: str
+    start: int            # ordinal of index 0
+    values: np.ndarray
+    present: np.ndarray
+
+    @classmethod
+    def from_days(cls, name: str, days: dict[str, float]) -> "DailyDriver":
+        if not days:
+            raise SystemExit(f"{name}: no daily values")
+        ordinals = {date.fromisoformat(d).toordinal(): v for d, v in days.items()}
+        start = min(ordinals)
+        n = max(ordinals) - start + 1
+        values = np.zeros(n)
+        present = np.zeros(n, dtype=bool)
+        for ordinal, v in ordinals.items():
+            values[ordinal - start] = v
+            present[ordinal - start] = True
+        return cls(name, start, values, present)
+
+    @property
+    def first_day(self) -> str:
+        return date.fromordinal(self.start).isoformat()
+
+    @property
+    def last_day(self) -> str:
+        return date.fromordinal(self.start + len(self.values) - 1).isoformat()
+
+
+def read_daily(path: Path, column: str, site: str | None = None) -> dict[str, float]:
+    """``{date: value}`` from a daily CSV (via its ``csv_sidecar`` columns), optionally
+    filtered to one ``site``; blanks are skipped."""
+    if not path.exists():
+        raise SystemExit(f"Missing {path}")
+    table = load_table(path)
+    if column not in table:
+        raise SystemExit(f"{path} has no column {column!r}")
+    values = table.floats(column)
+    keep = ~np.isnan(values)
+    if site is not None:
+        if "site" not in table:
+            raise SystemExit(f"{path} has no rows for site {site!r}")
+        codes, labels = table.categories("site")
+        keep &= codes == (labels.index(site) if site in labels else -1)
+    rows = np.flatnonzero(keep)
+    dates = table.text("date")
+    days = dict(zip([dates[k] for k in rows.tolist()], values[rows].tolist()))
+    if site is not None and not days:
+        raise SystemExit(f"{path} has no rows for site {site!r}")
+    return days
+
+
+def load_driver(spec: str, intensity_column: str) -> DailyDriver:
+    if spec in DRIVERS:
+        path, column = DRIVERS[spec]
+        return DailyDriver.from_days(spec, read_daily(Path(path), column))
+    kind, sep, rest = spec.partition(":")
+    if not sep or not rest:
+        raise SystemExit(f"Unknown driver {spec!r}: use {', '.join(DRIVERS)}, intensity:<site> or <csv>:<column>")
+    if kind == "intensity":
+        return DailyDriver.from_days(spec, read_daily(Path(INTENSITY_CSV), intensity_column, site=rest))
+    return DailyDriver.from_days(spec, read_daily(Path(kind), rest))
+
+
+# --------------------------------------------------------------------------- #
+# Lag surface
+# --------------------------------------------------------------------------- #
+def window_sums(driver: DailyDriver, sample_dates: list[date], offsets: np.ndarray,
+                widths: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """(sums, usable), each (offset x width x sample).
+
+    ``sums[i, j, s]`` is the driver summed over offsets
+    ``[offsets[i], offsets[i] + widths[j] - 1]`` before sample ``s``;
+    ``usable`` is True where every day of that window is in the record.
+    """
+    n = len(driver.values)
+    cum = np.concatenate(([0.0], np.cumsum(driver.values)))
+    have = np.concatenate(([0], np.cumsum(driver.present, dtype=np.int64)))
+    idx = np.array([d.toordinal() - driver.start for d in sample_dates], dtype=np.int64)
+    # Window days idx-o-w+1 .. idx-o, i.e. prefix entries [idx-o-w+1, idx-o+1).
+    end = idx[None, None, :] - offsets[:, None, None] + 1
+    begin = end - widths[None, :, None]
+    inside = (begin >= 0) & (end <= n)
+    e, b = np.clip(end, 0, n), np.clip(begin, 0, n)
+    sums = np.round(cum[e] - cum[b], ROUND_DECIMALS)
+    usable = inside & (have[e] - have[b] == widths[None, :, None])
+    return sums, usable
+
+
+def lag_surface(driver: DailyDriver, sample_dates: list[date], log_ecoli: list[float], max_offset: int,
+                max_width: int, transform: str, min_samples: int) -> list[dict[str, object]]:
+    """One row per (offset, width): n, Pearson r, Spearman rho and R^2 against log10 E. coli."""
+    offsets = np.arange(0, max_offset + 1)
+    widths = np.arange(1, max_width + 1)
+    sums, usable = window_sums(driver, sample_dates, offsets, widths)
+    cells = len(offsets) * len(widths)
+    x = sums.reshape(cells, len(sample_dates))
+    if transform == "log1p":
+        with np.errstate(invalid="ignore"):
+            x = np.log1p(x)
+    mask = usable.reshape(cells, len(sample_dates))
+    y = np.asarray(log_ecoli)
+
+    stats = {key: np.full(cells, np.nan) for key in ("pearson_r", "spearman_rho", "r_squared")}
+    n_used = mask.sum(axis=1)
+    # Windows that can use the same samples are correlated together.
+    groups, which = np.unique(mask, axis=0, return_inverse=True)
+    which = np.asarray(which).reshape(-1)
+    for g, keep in enumerate(groups):
+        if keep.sum() < min_samples:
+            continue
+        rows = np.flatnonzero(which == g)
+        result = correlate(x[rows][:, keep], y[keep])
+        for key in stats:
+            stats[key][rows] = result[key]
+
+    out = []
+    for cell in range(cells):
+        i, j = divmod(cell, len(widths))
+        out.append({
+            "driver": driver.name,
+            "offset_days": int(offsets[i]),
+            "width_days": int(widths[j]),
+            "n": int(n_used[cell]) if n_used[cell] >= min_samples else 0,
+            "pearson_r": float(stats["pearson_r"][cell]),
+            "spearman_rho": float(stats["spearman_rho"][cell]),
+            "r_squared": float(stats["r_squared"][cell]),
+        })
+    return out
+
+
+# --------------------------------------------------------------------------- #
+# Output
+# --------------------------------------------------------------------------- #
+def _fmt(value: float, places: int = 3) -> str:
+    return "" if math.isnan(value) else f"{value:.{places}f}"
+
+
+def write_csv(path: Path, rows: list[dict[str, object]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fields = ["driver", "offset_days", "width_days", "n", "pearson_r", "spearman_rho", "r_squared"]
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=fields)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({k: _fmt(v, 4) if isinstance(v, float) else v for k, v in row.items()})
+
+
+def write_report(path: Path, drivers: list[DailyDriver], surfaces: dict[str, list[dict[str, object]]],
+                 n_samples: int, args) -> None:
+    lines = [
+        "# Conham E. coli lag scan",
+        "",
+        f"Generated by `scripts/lag_scan.py`. Each daily driver is summed over the days at offsets "
+        f"`[offset, offset + width - 1]` before each of the {n_samples} E. coli samples (offset 0 = sample day), "
+        f"for offsets 0-{args.max_offset} and widths 1-{args.max_width}, and the "
+        f"{'log1p of the ' if args.transform == 'log1p' else ''}window sum is correlated with log10(E. coli). "
+        f"Samples whose window runs outside the driver's record are dropped for that window; windows with fewer "
+        f"than {args.min_samples} usable samples are blank. The full surface is in `{Path(args.output).as_posix()}`.",
+        "",
+        f"Every driver has {(args.max_offset + 1) * args.max_width} windows, so its best one is picked from many "
+        "correlated candidates on a small sample; read the shape of the surface rather than its maximum.",
+        "",
+    ]
+    for driver in drivers:
+        rows = [r for r in surfaces[driver.name] if not math.isnan(r["pearson_r"])]
+        lines += [f"## {driver.name}", "", f"Record {driver.first_day} to {driver.last_day}.", ""]
+        if not rows:
+            lines += ["No window had enough usable samples.", ""]
+            continue
+        lines += [
+            "Strongest windows by |Pearson r|:",
+            "",
+            "| Offset (days) | Width (days) | Days covered | n | Pearson r | Spearman rho | R^2 |",
+            "| ---: | ---: | --- | ---: | ---: | ---: | ---: |",
+        ]
+        for r in sorted(rows, key=lambda r: -abs(r["pearson_r"]))[:TOP_WINDOWS]:
+            last = r["offset_days"] + r["width_days"] - 1
+            lines.append(
+                f"| {r['offset_days']} | {r['width_days']} | {r['offset_days']}-{last} | {r['n']} | "
+                f"{_fmt(r['pearson_r'])} | {_fmt(r['spearman_rho'])} | {_fmt(r['r_squared'])} |"
+            )
+        widths = [w for w in GRID_WIDTHS if w <= args.max_width]
+        grid = {(r["offset_days"], r["width_days"]): r["pearson_r"] for r in surfaces[driver.name]}
+        lines += [
+            "",
+            "Pearson r by offset (rows) and width (columns):",
+            "",
+            "| Offset | " + " | ".join(f"w={w}" for w in widths) + " |",
+            "| ---: | " + " | ".join("---:" for _ in widths) + " |",
+        ]
+        for offset in range(args.max_offset + 1):
+            lines.append(f"| {offset} | " + " | ".join(_fmt(grid[(offset, w)], 2) for w in widths) + " |")
+        lines.append("")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("\n".join(lines), encoding="utf-8")
+
+
+# --------------------------------------------------------------------------- #
+# CLI
+# --------------------------------------------------------------------------- #
+def run_scan(args) -> int:
+    if args.max_offset < 0 or args.max_width < 1:
+        raise SystemExit("--max-offset must be >= 0 and --max-width >= 1")
+    samples = read_samples(Path(args.samples))
+    if not samples:
+        raise SystemExit(f"No samples in {args.samples}")
+    sample_dates = [s["sample_date"] for s in samples]
+    log_ecoli = [math.log10(s["e_coli_cfu_per_100ml"]) for s in samples]
+    drivers = [load_driver(spec, args.intensity_column) for spec in args.driver or DEFAULT_DRIVERS]
+
+    surfaces: dict[str, list[dict[str, object]]] = {}
+    for driver in drivers:
+        surfaces[driver.name] = lag_surface(driver, sample_dates, log_ecoli, args.max_offset, args.max_width,
+                                            args.transform, args.min_samples)
+    write_csv(Path(args.output), [row for driver in drivers for row in surfaces[driver.name]])
+    write_report(Path(args.report), drivers, surfaces, len(samples), args)
+
+    for driver in drivers:
+        rows = [r for r in surfaces[driver.name] if not math.isnan(r["pearson_r"])]
+        if rows:
+            best = max(rows, key=lambda r: abs(r["pearson_r"]))
+            print(f"{driver.name}: best offset {best['offset_days']} width {best['width_days']} "
+                  f"r={best['pearson_r']:.3f} (n={best['n']})")
+        else:
+            print(f"{driver.name}: no window had enough usable samples")
+    print(f"Wrote {args.output}")
+    print(f"Wrote {args.report}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--driver", action="append",
+                        help=f"Driver series (repeatable; default {', '.join(DEFAULT_DRIVERS)})")
+    parser.add_argument("--intensity-column", default="rain_total_mm",
+                        help="Column of rainfall_intensity_by_site.csv used by intensity:<site> drivers")
+    parser.add_argument("--samples", default=SAMPLES_CSV)
+    parser.add_argument("--max-offset", type=int, default=30, help="Largest offset in days (0 = sample day)")
+    parser.add_argument("--max-width", type=int, default=30, help="Largest window width in days")
+    parser.add_argument("--transform", choices=("log1p", "none"), default="log1p")
+    parser.add_argument("--min-samples", type=int, default=10,
+                        help="Leave a window blank with fewer usable samples than this")
+    parser.add_argument("--output", default=OUTPUT_CSV)
+    parser.add_argument("--report", default=REPORT_MD)
+    parser.set_defaults(func=run_scan)
+    return parser
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
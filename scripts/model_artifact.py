@@ -0,0 +1,97 @@
+"""Versioned artifacts for the fitted Conham E. coli models.
+
+Each fitting script ends with a full-data ridge fit that used to live only in
+its markdown report. ``write_artifact`` saves that fit as a small JSON document
+under ``docs/data/models/`` so it can be scored later without refitting:
+
+- the intercept and, per feature, its name, transform, source spec (where the
+  raw value comes from), standardisation mean/std and coefficient;
+- the ridge penalty and sample-weight exponent it was fitted with;
+- a SHA-256 of every training input plus the sample count and date range, so a
+  stale artifact is easy to spot;
+- the LOOCV metrics the script reported.
+
+The output is deterministic (no timestamps, fixed key order) so regenerating an
+unchanged model leaves the committed file untouched. Scoring lives in the root
+``nowcast.py``, which is pure Python so ``poo.py`` can use it in the workflow.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+from pathlib import Path
+
+ARTIFACT_FORMAT = "conham-ecoli-model"
+ARTIFACT_VERSION = 1
+MODELS_DIR = "docs/data/models"
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as handle:
+        for block in iter(lambda: handle.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def feature_entry(name: str, source: dict, transform: str | None, stat: tuple[float, float], coefficient: float) -> dict:
+    """One feature: ``source`` says how to compute the raw value, ``transform`` how to map it."""
+    mean, std = stat
+    return {
+        "name": name,
+        "source": source,
+        "transform": transform,
+        "mean": mean,
+        "std": std,
+        "coefficient": coefficient,
+    }
+
+
+def band_feature(spec: tuple[int, str, str | None], stat: tuple[float, float], coefficient: float) -> dict:
+    """A ``(lookback_days, column, transform)`` feature from analyze_conham_cso_ecoli's window summaries."""
+    lookback, column, transform = spec
+    source = {"kind": "band", "lookback_days": lookback, "column": column}
+    return feature_entry(f"{column}@{lookback}d", source, transform, stat, coefficient)
+
+
+def write_artifact(
+    path: Path,
+    *,
+    name: str,
+    script: str,
+    description: str,
+    beta: list[float],
+    features: list[dict],
+    ridge: float,
+    weight_exponent: float,
+    training_files: list[Path],
+    dates: list[str],
+    loocv: dict[str, float],
+) -> Path:
+    """Write a fitted model; ``features`` are ``feature_entry`` dicts in ``beta[1:]`` order."""
+    if len(features) != len(beta) - 1:
+        raise SystemExit(f"{name}: {len(features)} features for {len(beta) - 1} coefficients")
+    artifact = {
+        "format": ARTIFACT_FORMAT,
+        "version": ARTIFACT_VERSION,
+        "name": name,
+        "description": description,
+        "script": script,
+        "target": "log10(e_coli_cfu_per_100ml)",
+        "ridge": ridge,
+        "weight_exponent": weight_exponent,
+        "intercept": beta[0],
+        "features": features,
+        "training": {
+            "n_samples": len(dates),
+            "first_date": dates[0] if dates else None,
+            "last_date": dates[-1] if dates else None,
+            "files": {Path(p).as_posix(): file_sha256(p) for p in training_files},
+        },
+        "loocv": {k: None if math.isnan(v) else round(v, 6) for k, v in loocv.items()},
+    }
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(artifact, indent=2) + "\n", encoding="utf-8")
+    return path
@@ -31,7 +31,53 @@ Honest error reporting
 ----------------------
 Each day's "percentage it would be wrong by" is reported from the LOOCV
 prediction -- i.e. a model trained on the other 24 dates and asked to predict the
-held-out day -- not the in-sample fit. The script is standard-library only.
+held-out day -- not the in-sample fit. The ridge fit itself lives in
+``ridge.py`` (NumPy, with a pure-Python fallback).
+
+Uncertainty
+-----------
+With 25 samples the fit is fragile, so the report also gives bootstrap
+percentile intervals (``--bootstrap`` resamples, ``ridge.bootstrap_intervals``)
+for the coefficients and each day's fitted value.
+
+Rolling origin
+--------------
+LOOCV lets a model trained on later dates predict earlier ones, which flatters
+a live nowcast. The report therefore also gives expanding-window forecasts
+(``ridge.rolling_origin_predictions``): after the first ``--rolling-min-train``
+dates, each date is predicted by the model fitted on the dates before it only,
+with the normal equations updated one date at a time rather than refitted.
+Only the coefficients are refitted per origin: the feature set, weighting and
+ridge are the ones LOOCV chose on every date, so the rolling error is still
+optimistic.
+
+The full-data fit is also saved as a model artifact (``--artifact``, see
+``model_artifact.py``) that ``nowcast.py`` scores for the live report.
+
+Sweep
+-----
+``--sweep`` reproduces (and extends) the selection behind SELECTED_MODEL,
+WEIGHT_EXPONENT and the ridge penalty in one batch job: every ridge x weight
+exponent x feature set, where a feature set is up to ``--sweep-max-features``
+(lookback, column, transform) specs drawn from ``--sweep-lookbacks``. Each
+transformed column is computed once per (lookback, column, transform) and
+shared; each (ridge, exponent) pair scores all its feature sets in one batched
+LOOCV solve, with the pairs spread over ``--workers`` processes. Results are
+ranked by LOOCV MAE_log into a CSV and a markdown table. The sweep needs NumPy.
+
+Best subset
+-----------
+``--best-subset`` heuristically searches feature *sets* of up to ``--subset-max-size`` specs
+from the same space at the chosen ridge / weight exponent, level by level:
+every single spec is scored, then each size-k set that survives is extended by
+every other spec. A set survives if its LOOCV MAE_log is within
+``--subset-margin`` of the best set of its size. LOOCV error is not monotone in
+the feature set (adding a spec can help after hurting), so no bound on it is
+exact. The margin is a pruning heuristic, and ``--subset-margin inf`` makes the
+search exhaustive. Specs whose column is constant over every date are dropped
+first (they can only tie their parent set). Each level's candidates are scored
+in batched LOOCV solves sharded over ``--workers`` processes. The report gives
+the Pareto front of error against model size and the best sets of each size.
 """
 from __future__ import annotations
 
@@ -39,8 +85,26 @@ import argparse
 import csv
 import math
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import combinations
 from pathlib import Path
 
+from model_artifact import MODELS_DIR, band_feature, write_artifact
+from ridge import (
+    BOOTSTRAP_DRAWS,
+    BOOTSTRAP_LEVEL,
+    ROLLING_MIN_TRAIN,
+    bootstrap_intervals,
+    loocv_predictions,
+    loocv_predictions_batch,
+    predict_log,
+    rolling_origin_predictions,
+    solve_ridge,
+    standardise_apply,
+    standardise_fit,
+)
+
 # A model is a list of (lookback_days, column, transform) feature specs.
 # transform is one of: None (raw), "log1p", or "proximity" (1 / (1 + miles)).
 FeatureSpec = tuple[int, str, "str | None"]
@@ -52,6 +116,22 @@ SELECTED_MODEL: list[FeatureSpec] = [(7, "spill_hours_10_to_20_miles", "log1p")]
 # high-day error. Chosen from the LOOCV trade-off curve (see report).
 WEIGHT_EXPONENT = 0.5
 
+ARTIFACT_JSON = f"{MODELS_DIR}/conham_band.json"
+
+# Sweep defaults (--sweep): the grid the selection above was read off, widened.
+SWEEP_CSV = "docs/data/conham_ecoli_model_sweep.csv"
+SWEEP_MD = "docs/data/conham_ecoli_model_sweep.md"
+DEFAULT_RIDGE = 0.1  # standardised-feature ridge penalty (--ridge)
+SWEEP_RIDGES = "0.01,0.03,0.1,0.3,1,3"
+SWEEP_EXPONENTS = "0,0.25,0.5,0.75,1"
+SWEEP_LOOKBACKS = "1,2,3,4,5,6,7"
+
+# Best-subset defaults (--best-subset).
+SUBSET_CSV = "docs/data/conham_ecoli_model_subsets.csv"
+SUBSET_MD = "docs/data/conham_ecoli_model_subsets.md"
+SUBSET_SHARD = 2048            # candidate sets per batched solve / pool task
+SUBSET_REPORT_ROWS = 10        # best sets listed per size in the markdown
+
 # Days at or above this E. coli level are treated as "high" for the split
 # high/low error reporting that motivates the weighting.
 HIGH_THRESHOLD = 450.0
@@ -85,10 +165,28 @@ def parse_args() -> argparse.Namespace:
         default="docs/data/conham_ecoli_model.md",
         help="Markdown summary of the model and its errors",
     )
+    parser.add_argument(
+        "--bootstrap",
+        type=int,
+        default=BOOTSTRAP_DRAWS,
+        help="Bootstrap resamples for the report's intervals (0 = skip)",
+    )
+    parser.add_argument("--bootstrap-seed", type=int, default=0, help="Seed for the bootstrap resamples")
+    parser.add_argument(
+        "--rolling-min-train",
+        type=int,
+        default=ROLLING_MIN_TRAIN,
+        help="Dates trained on before the first rolling-origin forecast (0 = skip)",
+    )
+    parser.add_argument(
+        "--artifact",
+        default=ARTIFACT_JSON,
+        help="Fitted-model JSON for nowcast.py",
+    )
     parser.add_argument(
         "--ridge",
         type=float,
-        default=0.1,
+        default=DEFAULT_RIDGE,
         help="Ridge penalty on standardised features (intercept unpenalised)",
     )
     parser.add_argument(
@@ -97,6 +195,26 @@ def parse_args() -> argparse.Namespace:
         default=WEIGHT_EXPONENT,
         help="Weight each sample by (E. coli ** this) to tilt toward high-count days",
     )
+    sweep = parser.add_argument_group("sweep", "Grid search instead of the selected model (--sweep)")
+    sweep.add_argument("--sweep", action="store_true", help="Rank every ridge x exponent x feature set by LOOCV")
+    sweep.add_argument("--sweep-ridges", default=SWEEP_RIDGES, help="Comma-separated ridge penalties")
+    sweep.add_argument("--sweep-exponents", default=SWEEP_EXPONENTS, help="Comma-separated weight exponents")
+    sweep.add_argument("--sweep-lookbacks", default=SWEEP_LOOKBACKS, help="Comma-separated lookback days")
+    sweep.add_argument("--sweep-max-features", type=int, default=1, help="Largest feature set to try")
+    sweep.add_argument("--sweep-output", default=SWEEP_CSV, help="Ranked sweep results CSV")
+    sweep.add_argument("--sweep-report", default=SWEEP_MD, help="Markdown table of the best sweep results")
+    sweep.add_argument("--top", type=int, default=25, help="Rows in the sweep markdown table (per size for --best-subset)")
+    sweep.add_argument("--workers", type=int, default=1,
+                       help="Processes for the sweep / subset search / bootstrap (1 = in-process)")
+    subset = parser.add_argument_group("best subset", "Search feature sets at --ridge / --weight-exponent (--best-subset)")
+    subset.add_argument("--best-subset", action="store_true", help="Margin-pruned level-by-level search over feature sets by LOOCV "
+                        "(heuristic unless --subset-margin inf)")
+    subset.add_argument("--subset-max-size", type=int, default=3, help="Largest feature set to search")
+    subset.add_argument("--subset-margin", type=float, default=0.05,
+                        help="Extend a set only if its MAE_log is within this of its size's best (inf = exhaustive)")
+    subset.add_argument("--subset-lookbacks", default=SWEEP_LOOKBACKS, help="Comma-separated lookback days")
+    subset.add_argument("--subset-output", default=SUBSET_CSV, help="Best sets of each size, CSV")
+    subset.add_argument("--subset-report", default=SUBSET_MD, help="Pareto front and best sets, markdown")
     return parser.parse_args()
 
 
@@ -134,60 +252,6 @@ def design_matrix(
     return [[feature_value(by_date, d, spec) for spec in specs] for d in dates]
 
 
-# --------------------------------------------------------------------------- #
-# Linear algebra (standard library only)
-# --------------------------------------------------------------------------- #
-def standardise_fit(matrix: list[list[float]]) -> list[tuple[float, float]]:
-    if not matrix or not matrix[0]:
-        return []
-    stats = []
-    for j in range(len(matrix[0])):
-        col = [row[j] for row in matrix]
-        mean = sum(col) / len(col)
-        std = math.sqrt(sum((v - mean) ** 2 for v in col) / len(col))
-        stats.append((mean, std))
-    return stats
-
-
-def standardise_apply(matrix: list[list[float]], stats: list[tuple[float, float]]) -> list[list[float]]:
-    return [
-        [(row[j] - stats[j][0]) / stats[j][1] if stats[j][1] > 0 else 0.0 for j in range(len(stats))]
-        for row in matrix
-    ]
-
-
-def solve_ridge(
-    matrix: list[list[float]], target: list[float], ridge: float, weights: list[float] | None = None
-) -> list[float]:
-    """Weighted ridge regression with an unpenalised intercept (Gaussian elimination)."""
-    n = len(matrix)
-    p = len(matrix[0]) if matrix and matrix[0] else 0
-    design = [[1.0] + row for row in matrix]
-    w = weights if weights is not None else [1.0] * n
-    width = p + 1
-    xtx = [[sum(w[k] * design[k][i] * design[k][j] for k in range(n)) for j in range(width)] for i in range(width)]
-    xty = [sum(w[k] * design[k][i] * target[k] for k in range(n)) for i in range(width)]
-    for i in range(1, width):  # do not penalise the intercept
-        xtx[i][i] += ridge
-    aug = [xtx[i] + [xty[i]] for i in range(width)]
-    for col in range(width):
-        pivot = max(range(col, width), key=lambda r: abs(aug[r][col]))
-        aug[col], aug[pivot] = aug[pivot], aug[col]
-        pivot_val = aug[col][col]
-        if abs(pivot_val) < 1e-12:
-            continue
-        for r in range(width):
-            if r == col:
-                continue
-            factor = aug[r][col] / pivot_val
-            aug[r] = [aug[r][k] - factor * aug[col][k] for k in range(width + 1)]
-    return [aug[i][width] / aug[i][i] if abs(aug[i][i]) > 1e-12 else 0.0 for i in range(width)]
-
-
-def predict_log(beta: list[float], standardised_row: list[float]) -> float:
-    return beta[0] + sum(beta[1 + j] * standardised_row[j] for j in range(len(standardised_row)))
-
-
 # --------------------------------------------------------------------------- #
 # Fitting and cross-validation
 # --------------------------------------------------------------------------- #
@@ -205,18 +269,24 @@ def fit_full(by_date, dates, ecoli, specs, ridge, exponent=0.0) -> tuple[list[fl
 
 
 def loocv_log_predictions(by_date, dates, ecoli, specs, ridge, exponent=0.0) -> dict[str, float]:
-    """Return the held-out log10 prediction for each date (trained on the rest)."""
-    preds: dict[str, float] = {}
-    for test in dates:
-        train = [d for d in dates if d != test]
-        matrix = design_matrix(by_date, train, specs)
-        stats = standardise_fit(matrix)
-        standardised = standardise_apply(matrix, stats)
-        target = [math.log10(ecoli[d]) for d in train]
-        beta = solve_ridge(standardised, target, ridge, sample_weights(ecoli, train, exponent))
-        test_row = standardise_apply(design_matrix(by_date, [test], specs), stats)[0]
-        preds[test] = predict_log(beta, test_row)
-    return preds
+    """Return the held-out log10 prediction for each date (trained on the rest).
+
+    Exact closed-form LOOCV (``ridge.loocv_predictions``): the same numbers as
+    re-standardising and refitting without each date, from one batched solve.
+    """
+    matrix = design_matrix(by_date, dates, specs)
+    target = [math.log10(ecoli[d]) for d in dates]
+    preds = loocv_predictions(matrix, target, ridge, sample_weights(ecoli, dates, exponent))
+    return dict(zip(dates, preds))
+
+
+def rolling_log_predictions(by_date, dates, ecoli, specs, ridge, exponent=0.0,
+                            min_train=ROLLING_MIN_TRAIN) -> dict[str, float]:
+    """Expanding-window forecast for each date after the first ``min_train``, from earlier dates only."""
+    matrix = design_matrix(by_date, dates, specs)
+    target = [math.log10(ecoli[d]) for d in dates]
+    preds = rolling_origin_predictions(matrix, target, ridge, sample_weights(ecoli, dates, exponent), min_train)
+    return {d: pred for d, pred in zip(dates, preds) if not math.isnan(pred)}
 
 
 def error_metrics(ecoli: dict[str, float], dates: list[str], log_preds: dict[str, float]) -> dict[str, float]:
@@ -250,6 +320,333 @@ def describe_model(specs: list[FeatureSpec]) -> str:
     return ", ".join(parts)
 
 
+# --------------------------------------------------------------------------- #
+# Sweep
+# --------------------------------------------------------------------------- #
+def _number_list(text: str, kind=float) -> list:
+    try:
+        return [kind(v) for v in text.split(",") if v.strip()]
+    except ValueError:
+        raise SystemExit(f"Expected a comma-separated list of numbers, got {text!r}")
+
+
+def sweep_specs(by_date, dates: list[str], lookbacks: list[int]) -> list[FeatureSpec]:
+    """Every (lookback, column, transform) the feature CSV supports at these lookbacks."""
+    header = by_date[dates[0]][lookbacks[0]].keys()
+    columns = [c for c in header if c.startswith("spill_hours_") or c == "event_count"]
+    specs: list[FeatureSpec] = []
+    for lookback in lookbacks:
+        specs += [(lookback, c, t) for c in columns for t in (None, "log1p")]
+        if "nearest_spill_miles" in header:
+            specs.append((lookback, "nearest_spill_miles", "proximity"))
+    return specs
+
+
+def design_cache(by_date, dates: list[str], specs: list[FeatureSpec]) -> dict[FeatureSpec, list[float]]:
+    """One transformed column per (lookback, column, transform), shared by every model using it."""
+    return {spec: [feature_value(by_date, d, spec) for d in dates] for spec in specs}
+
+
+# Worker state for the sweep pool, set once per process by _sweep_init.
+_SWEEP: dict = {}
+
+
+def _sweep_init(columns, feature_sets, dates, ecoli) -> None:
+    """Assemble each feature set's design from the shared columns, grouped by size for batching."""
+    by_size: dict[int, tuple[list[int], list[list[list[float]]]]] = {}
+    for i, specs in enumerate(feature_sets):
+        indices, designs = by_size.setdefault(len(specs), ([], []))
+        indices.append(i)
+        designs.append([list(row) for row in zip(*(columns[spec] for spec in specs))])
+    _SWEEP.update(by_size=by_size, dates=dates, ecoli=ecoli)
+
+
+def _sweep_metrics(batch: list[list[float]], dates: list[str], ecoli: dict[str, float]) -> list[dict[str, float]]:
+    """``error_metrics`` for a batch of LOOCV prediction lists, as array reductions."""
+    import numpy as np
+
+    preds = np.asarray(batch, dtype=float)
+    actual = np.array([ecoli[d] for d in dates])
+    err = np.abs(preds - np.log10(actual))
+    ape = np.abs(10 ** preds - actual) / actual * 100.0
+    high = actual >= HIGH_THRESHOLD
+    nan = np.full(len(preds), float("nan"))
+    columns = {
+        "mae_log": err.mean(axis=1),
+        "mae_log_high": err[:, high].mean(axis=1) if high.any() else nan,
+        "mae_log_low": err[:, ~high].mean(axis=1) if (~high).any() else nan,
+        "median_ape": np.sort(ape, axis=1)[:, len(dates) // 2],
+        "mape": ape.mean(axis=1),
+    }
+    return [dict(zip(columns, values)) for values in zip(*(c.tolist() for c in columns.values()))]
+
+
+def _sweep_task(task: tuple[float, float]) -> list[tuple[float, float, int, dict[str, float]]]:
+    """Score every feature set at one (ridge, exponent): one batched LOOCV solve per set size."""
+    ridge, exponent = task
+    dates, ecoli = _SWEEP["dates"], _SWEEP["ecoli"]
+    target = [math.log10(ecoli[d]) for d in dates]
+    weights = sample_weights(ecoli, dates, exponent)
+    scored = []
+    for indices, designs in _SWEEP["by_size"].values():
+        metrics = _sweep_metrics(loocv_predictions_batch(designs, target, ridge, weights), dates, ecoli)
+        scored += [(ridge, exponent, i, m) for i, m in zip(indices, metrics)]
+    return scored
+
+
+def run_sweep(args, dates, ecoli, by_date) -> int:
+    ridges = _number_list(args.sweep_ridges)
+    exponents = _number_list(args.sweep_exponents)
+    lookbacks = _number_list(args.sweep_lookbacks, int)
+    missing = [lb for lb in lookbacks if any(lb not in by_date[d] for d in dates)]
+    if missing:
+        raise SystemExit(f"Lookback(s) {missing} not present for every date in {args.features}")
+    specs = sweep_specs(by_date, dates, lookbacks)
+    columns = design_cache(by_date, dates, specs)
+    feature_sets = [list(combo) for k in range(1, args.sweep_max_features + 1) for combo in combinations(specs, k)]
+    tasks = [(r, e) for r in ridges for e in exponents]
+    print(f"Sweep: {len(feature_sets)} feature sets x {len(ridges)} ridges x {len(exponents)} exponents "
+          f"= {len(feature_sets) * len(tasks)} models ({len(columns)} cached columns)")
+
+    init = (columns, feature_sets, dates, ecoli)
+    if args.workers > 1:
+        with ProcessPoolExecutor(args.workers, initializer=_sweep_init, initargs=init) as pool:
+            scored = [row for rows in pool.map(_sweep_task, tasks) for row in rows]
+    else:
+        _sweep_init(*init)
+        scored = [row for task in tasks for row in _sweep_task(task)]
+
+    scored.sort(key=lambda r: (r[3]["mae_log"], len(feature_sets[r[2]]), r[0], r[1], r[2]))
+    rows = []
+    for rank, (ridge, exponent, i, m) in enumerate(scored, 1):
+        rows.append({
+            "rank": rank,
+            "ridge": ridge,
+            "weight_exponent": exponent,
+            "n_features": len(feature_sets[i]),
+            "features": describe_model(feature_sets[i]),
+            "mae_log": round(m["mae_log"], 4),
+            "mae_log_high": round(m["mae_log_high"], 4),
+            "mae_log_low": round(m["mae_log_low"], 4),
+            "median_ape": round(m["median_ape"], 1),
+            "mape": round(m["mape"], 1),
+        })
+    out_path = Path(args.sweep_output)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with out_path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+    current = describe_model(SELECTED_MODEL)
+    current_row = next((r for r in rows if r["features"] == current and r["ridge"] == args.ridge
+                        and r["weight_exponent"] == args.weight_exponent), None)
+    lines = [
+        "# Conham E. coli model sweep",
+        "",
+        "Generated by `scripts/model_conham_ecoli.py --sweep`. Every ridge penalty x",
+        "weight exponent x feature set, ranked by leave-one-out `MAE_log` (lower is",
+        "better). Weighting is `E. coli ** exponent`; `MAE_high` / `MAE_low` split at",
+        f"{HIGH_THRESHOLD:g} CFU/100ml.",
+        "",
+        f"- Ridge: {', '.join(f'{r:g}' for r in ridges)}",
+        f"- Weight exponent: {', '.join(f'{e:g}' for e in exponents)}",
+        f"- Lookbacks: {', '.join(str(lb) for lb in lookbacks)} days; up to {args.sweep_max_features} feature(s)",
+        f"- Models scored: {len(rows)}",
+        "",
+        "| Rank | Ridge | Weight `p` | Features | MAE_log | MAE_high | MAE_low | Median APE |",
+        "|---:|---:|---:|---|---:|---:|---:|---:|",
+    ]
+    for r in rows[:args.top]:
+        lines.append(
+            f"| {r['rank']} | {r['ridge']:g} | {r['weight_exponent']:g} | `{r['features']}` | {r['mae_log']:.3f} | "
+            f"{r['mae_log_high']:.3f} | {r['mae_log_low']:.3f} | {r['median_ape']:.1f}% |"
+        )
+    if current_row is not None:
+        lines.extend([
+            "",
+            f"The current defaults (`{current}`, ridge {args.ridge:g}, `p = {args.weight_exponent:g}`) rank "
+            f"**{current_row['rank']}** with `MAE_log` {current_row['mae_log']:.3f}.",
+        ])
+    lines.append("")
+    Path(args.sweep_report).write_text("\n".join(lines), encoding="utf-8")
+    print(f"Wrote {out_path}")
+    print(f"Wrote {args.sweep_report}")
+    best = rows[0]
+    print(f"Best: {best['features']}  ridge {best['ridge']:g}  p {best['weight_exponent']:g}  MAE_log {best['mae_log']:.3f}")
+    return 0
+
+
+# --------------------------------------------------------------------------- #
+# Best subset
+# --------------------------------------------------------------------------- #
+# Worker state for the subset search, set once per process by _subset_init.
+_SUBSETS: dict = {}
+
+
+def _subset_init(columns, dates, ecoli, ridge, exponent) -> None:
+    import numpy as np
+
+    _SUBSETS.update(
+        columns=np.asarray(columns, dtype=float),
+        dates=dates,
+        ecoli=ecoli,
+        ridge=ridge,
+        target=[math.log10(ecoli[d]) for d in dates],
+        weights=sample_weights(ecoli, dates, exponent),
+    )
+
+
+def _subset_task(sets: list[tuple[int, ...]]) -> list[dict[str, float]]:
+    """LOOCV metrics for equal-size sets of column indices, from one batched solve."""
+    import numpy as np
+
+    designs = _SUBSETS["columns"][np.asarray(sets)].transpose(0, 2, 1)
+    preds = loocv_predictions_batch(designs, _SUBSETS["target"], _SUBSETS["ridge"], _SUBSETS["weights"])
+    return _sweep_metrics(preds, _SUBSETS["dates"], _SUBSETS["ecoli"])
+
+
+def best_subsets(columns, dates, ecoli, ridge, exponent, max_size, margin, workers=1):
+    """Score feature sets level by level, extending only those within ``margin`` of their size's best.
+
+    ``columns`` is one list of values per candidate spec. Returns
+    ``{set of column indices: metrics}`` for every set scored.
+    """
+    init = (columns, dates, ecoli, ridge, exponent)
+    scored: dict[tuple[int, ...], dict[str, float]] = {}
+    frontier: list[tuple[int, ...]] = [()]
+    with ProcessPoolExecutor(workers, initializer=_subset_init, initargs=init) if workers > 1 else nullcontext() as pool:
+        if pool is None:
+            _subset_init(*init)
+        for size in range(1, max_size + 1):
+            candidates = sorted({tuple(sorted(parent + (j,)))
+                                 for parent in frontier for j in range(len(columns)) if j not in parent})
+            if not candidates:
+                break
+            shards = [candidates[i:i + SUBSET_SHARD] for i in range(0, len(candidates), SUBSET_SHARD)]
+            results = pool.map(_subset_task, shards) if pool is not None else map(_subset_task, shards)
+            level = {s: m for shard, metrics in zip(shards, results) for s, m in zip(shard, metrics)}
+            scored.update(level)
+            best = min(m["mae_log"] for m in level.values())
+            frontier = [s for s, m in level.items() if m["mae_log"] <= best + margin]
+            print(f"  size {size}: {len(level)} sets scored, best MAE_log {best:.3f}, {len(frontier)} extended")
+    return scored
+
+
+def pareto_front(best_by_size: dict[int, tuple[float, object]]) -> list[int]:
+    """Sizes whose best error beats every smaller size's best (error vs size front)."""
+    front, floor = [], float("inf")
+    for size in sorted(best_by_size):
+        if best_by_size[size][0] < floor:
+            front.append(size)
+            floor = best_by_size[size][0]
+    return front
+
+
+def run_best_subset(args, dates, ecoli, by_date) -> int:
+    lookbacks = _number_list(args.subset_lookbacks, int)
+    missing = [lb for lb in lookbacks if any(lb not in by_date[d] for d in dates)]
+    if missing:
+        raise SystemExit(f"Lookback(s) {missing} not present for every date in {args.features}")
+    cache = design_cache(by_date, dates, sweep_specs(by_date, dates, lookbacks))
+    specs = [spec for spec, values in cache.items() if min(values) < max(values)]
+    print(f"Best subset: {len(specs)} specs ({len(cache) - len(specs)} constant dropped), up to "
+          f"{args.subset_max_size} features, margin {args.subset_margin:g}, ridge {args.ridge:g}, "
+          f"p {args.weight_exponent:g}")
+    scored = best_subsets([cache[spec] for spec in specs], dates, ecoli, args.ridge, args.weight_exponent,
+                          args.subset_max_size, args.subset_margin, args.workers)
+
+    baseline = error_metrics(ecoli, dates, loocv_log_predictions(by_date, dates, ecoli, [], args.ridge,
+                                                                  args.weight_exponent))
+    by_size: dict[int, list[tuple[dict[str, float], list[FeatureSpec]]]] = {0: [(baseline, [])]}
+    for indices, m in scored.items():
+        by_size.setdefault(len(indices), []).append((m, [specs[i] for i in indices]))
+    for rows in by_size.values():
+        rows.sort(key=lambda r: (r[0]["mae_log"], describe_model(r[1])))
+    front = pareto_front({size: (rows[0][0]["mae_log"], rows[0][1]) for size, rows in by_size.items()})
+
+    out_rows = []
+    for size, rows in sorted(by_size.items()):
+        for rank, (m, feature_set) in enumerate(rows[:args.top], 1):
+            out_rows.append({
+                "n_features": size,
+                "rank_in_size": rank,
+                "pareto": int(rank == 1 and size in front),
+                "features": describe_model(feature_set),
+                "mae_log": round(m["mae_log"], 4),
+                "mae_log_high": round(m["mae_log_high"], 4),
+                "mae_log_low": round(m["mae_log_low"], 4),
+                "median_ape": round(m["median_ape"], 1),
+                "mape": round(m["mape"], 1),
+            })
+    out_path = Path(args.subset_output)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with out_path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=list(out_rows[0]))
+        writer.writeheader()
+        writer.writerows(out_rows)
+
+    current = describe_model(SELECTED_MODEL)
+    current_rank = next((i for i, (_, fs) in enumerate(by_size.get(len(SELECTED_MODEL), []), 1)
+                         if describe_model(fs) == current), None)
+    lines = [
+        "# Conham E. coli feature-set search (margin-pruned best subset)",
+        "",
+        "Generated by `scripts/model_conham_ecoli.py --best-subset`. Feature sets drawn",
+        f"from every lookback/column/transform spec at lookbacks {', '.join(str(lb) for lb in lookbacks)},",
+        f"fitted at ridge {args.ridge:g} with weights `E. coli ** {args.weight_exponent:g}` and scored by",
+        "leave-one-out `MAE_log` (lower is better). Sets are grown one feature at a time, and",
+        "only those within the pruning margin of their size's best are extended. Unless the",
+        "margin is `inf` this is a heuristic, not an exact best-subset search: the \"best\" sets",
+        "below are the best ones it found.",
+        "",
+        f"- Specs searched: {len(specs)} (constant columns dropped)",
+        f"- Sets scored: {len(scored)} up to size {args.subset_max_size}",
+        f"- Pruning margin: {args.subset_margin:g} log10 (a set is extended only if it is within this of",
+        "  the best set of its size; LOOCV error is not monotone, so only `inf` is exhaustive)",
+        "",
+        "## Pareto front (error vs model size)",
+        "",
+        "| Features | Best set | MAE_log | MAE_high | MAE_low | Median APE |",
+        "|---:|---|---:|---:|---:|---:|",
+    ]
+    for size in front:
+        m, feature_set = by_size[size][0]
+        lines.append(
+            f"| {size} | `{describe_model(feature_set)}` | {m['mae_log']:.3f} | {m['mae_log_high']:.3f} | "
+            f"{m['mae_log_low']:.3f} | {m['median_ape']:.1f}% |"
+        )
+    lines.extend(["", "## Best sets of each size", ""])
+    for size, rows in sorted(by_size.items()):
+        if size == 0:
+            continue
+        lines.extend([
+            f"### {size} feature{'s' if size > 1 else ''}",
+            "",
+            "| Rank | Features | MAE_log | MAE_high | MAE_low | Median APE |",
+            "|---:|---|---:|---:|---:|---:|",
+        ])
+        for rank, (m, feature_set) in enumerate(rows[:SUBSET_REPORT_ROWS], 1):
+            lines.append(
+                f"| {rank} | `{describe_model(feature_set)}` | {m['mae_log']:.3f} | {m['mae_log_high']:.3f} | "
+                f"{m['mae_log_low']:.3f} | {m['median_ape']:.1f}% |"
+            )
+        lines.append("")
+    if current_rank is not None:
+        lines.extend([
+            f"The current `SELECTED_MODEL` (`{current}`) ranks **{current_rank}** of "
+            f"{len(by_size[len(SELECTED_MODEL)])} sets of its size.",
+            "",
+        ])
+    Path(args.subset_report).write_text("\n".join(lines), encoding="utf-8")
+    print(f"Wrote {out_path}")
+    print(f"Wrote {args.subset_report}")
+    for size in front:
+        m, feature_set = by_size[size][0]
+        print(f"  front: {size} feature(s)  MAE_log {m['mae_log']:.3f}  {describe_model(feature_set)}")
+    return 0
+
+
 # --------------------------------------------------------------------------- #
 # Reporting
 # --------------------------------------------------------------------------- #
@@ -257,6 +654,10 @@ def main() -> int:
     args = parse_args()
     path = Path(args.features)
     dates, ecoli, by_date = load_features(path)
+    if args.sweep:
+        return run_sweep(args, dates, ecoli, by_date)
+    if args.best_subset:
+        return run_best_subset(args, dates, ecoli, by_date)
     exponent = args.weight_exponent
 
     # Reference comparison (unweighted): feature was chosen by LOOCV beating these.
@@ -276,8 +677,26 @@ def main() -> int:
     fitted_log = {d: predict_log(beta, standardise_apply(design_matrix(by_date, [d], SELECTED_MODEL), stats)[0]) for d in dates}
     loocv_log = loocv_log_predictions(by_date, dates, ecoli, SELECTED_MODEL, args.ridge, exponent)
     metrics = error_metrics(ecoli, dates, loocv_log)
+    boot = None
+    if args.bootstrap > 0:
+        boot = bootstrap_intervals(
+            design_matrix(by_date, dates, SELECTED_MODEL), [math.log10(ecoli[d]) for d in dates], args.ridge,
+            sample_weights(ecoli, dates, exponent), args.bootstrap, seed=args.bootstrap_seed, workers=args.workers,
+        )
     n_high = sum(1 for d in dates if ecoli[d] >= HIGH_THRESHOLD)
 
+    # Rolling origin: each date forecast from the dates before it only.
+    rolling_log, rolling = {}, []
+    if 0 < args.rolling_min_train < len(dates):
+        rolling_log = rolling_log_predictions(by_date, dates, ecoli, SELECTED_MODEL, args.ridge, exponent,
+                                              args.rolling_min_train)
+        rolled = [d for d in dates if d in rolling_log]
+        for name, specs in (("mean baseline (intercept only)", []), ("selected model", SELECTED_MODEL)):
+            loocv_specs = loocv_log if specs else loocv_log_predictions(by_date, dates, ecoli, [], args.ridge, exponent)
+            rolling_specs = rolling_log if specs else rolling_log_predictions(
+                by_date, dates, ecoli, [], args.ridge, exponent, args.rolling_min_train)
+            rolling.append((name, error_metrics(ecoli, rolled, loocv_specs), error_metrics(ecoli, rolled, rolling_specs)))
+
     predictions = []
     for d in dates:
         actual = ecoli[d]
@@ -291,6 +710,7 @@ def main() -> int:
                 "loocv_cfu_per_100ml": round(loocv, 1),
                 "loocv_signed_pct_error": round((loocv - actual) / actual * 100.0, 1),
                 "loocv_abs_pct_error": round(abs(loocv - actual) / actual * 100.0, 1),
+                "rolling_cfu_per_100ml": round(10 ** rolling_log[d], 1) if d in rolling_log else "",
             }
         )
 
@@ -303,6 +723,7 @@ def main() -> int:
         "loocv_cfu_per_100ml",
         "loocv_signed_pct_error",
         "loocv_abs_pct_error",
+        "rolling_cfu_per_100ml",
     ]
     with out_path.open("w", newline="", encoding="utf-8") as handle:
         writer = csv.DictWriter(handle, fieldnames=fieldnames)
@@ -364,13 +785,16 @@ def main() -> int:
             "",
             "## Selected model coefficients (standardised feature, log10 target)",
             "",
-            "| Term | Coefficient |",
-            "|---|---:|",
-            f"| intercept | {beta[0]:.4f} |",
         ]
     )
-    for spec, coef in zip(SELECTED_MODEL, beta[1:]):
-        lines.append(f"| `{describe_model([spec])}` | {coef:.4f} |")
+    terms = ["intercept"] + [f"`{describe_model([spec])}`" for spec in SELECTED_MODEL]
+    if boot is None:
+        lines.extend(["| Term | Coefficient |", "|---|---:|"])
+        lines.extend(f"| {term} | {coef:.4f} |" for term, coef in zip(terms, beta))
+    else:
+        lines.extend([f"| Term | Coefficient | {BOOTSTRAP_LEVEL:.0%} bootstrap interval |", "|---|---:|---:|"])
+        lines.extend(f"| {term} | {coef:.4f} | {lo:.4f} to {hi:.4f} |"
+                     for term, coef, (lo, hi) in zip(terms, beta, boot["coef"]))
     lines.extend(
         [
             "",
@@ -394,6 +818,62 @@ def main() -> int:
             "",
             "(The CSV also includes the in-sample `fitted_cfu_per_100ml` column.)",
             "",
+        ]
+    )
+    if rolling:
+        lines.extend(
+            [
+                f"## Rolling-origin evaluation (expanding window, first {args.rolling_min_train} dates train only)",
+                "",
+                "Each later date is forecast by the model's coefficients fitted on the dates before it",
+                "only. LOOCV is shown on the same dates for comparison; it may also train on later dates.",
+                "The feature set, weighting and ridge were still chosen by LOOCV over every date, so this",
+                "is not what a live nowcast would have said that day and the rolling MAE is still optimistic.",
+                "",
+                "| Model | LOOCV MAE_log | Rolling MAE_log | Rolling MAE_high | Rolling median APE |",
+                "|---|---:|---:|---:|---:|",
+            ]
+        )
+        for name, loo, roll in rolling:
+            lines.append(
+                f"| {name} | {loo['mae_log']:.3f} | {roll['mae_log']:.3f} | {roll['mae_log_high']:.3f} | "
+                f"{roll['median_ape']:.1f}% |"
+            )
+        lines.extend(
+            [
+                "",
+                "| Sample date | Actual | LOOCV predicted | Rolling predicted | Trained on |",
+                "|---|---:|---:|---:|---:|",
+            ]
+        )
+        for i, p in enumerate(predictions):
+            if p["rolling_cfu_per_100ml"] != "":
+                lines.append(
+                    f"| {p['sample_date']} | {p['actual_cfu_per_100ml']:.0f} | {p['loocv_cfu_per_100ml']:.0f} | "
+                    f"{p['rolling_cfu_per_100ml']:.0f} | {i} dates |"
+                )
+        lines.append("")
+    if boot is not None:
+        lines.extend(
+            [
+                f"## Bootstrap intervals ({args.bootstrap} resamples, {BOOTSTRAP_LEVEL:.0%} percentile)",
+                "",
+                f"Each resample redraws the {len(dates)} days with replacement and refits; the interval is",
+                "the spread of the refitted model's estimate for each day. Wide intervals mean",
+                "the fit leans heavily on a few days.",
+                "",
+                "| Sample date | Actual | Fitted | Interval |",
+                "|---|---:|---:|---:|",
+            ]
+        )
+        for p, (lo, hi) in zip(predictions, boot["log_pred"]):
+            lines.append(
+                f"| {p['sample_date']} | {p['actual_cfu_per_100ml']:.0f} | {p['fitted_cfu_per_100ml']:.0f} | "
+                f"{10 ** lo:.0f} to {10 ** hi:.0f} |"
+            )
+        lines.append("")
+    lines.extend(
+        [
             "## Caveats",
             "",
             f"- {windows_with_spill} of {len(dates)} sample windows recorded upstream CSO spill",
@@ -412,14 +892,32 @@ def main() -> int:
         ]
     )
     Path(args.report).write_text("\n".join(lines), encoding="utf-8")
+    write_artifact(
+        Path(args.artifact),
+        name="conham_band",
+        script="scripts/model_conham_ecoli.py",
+        description=f"{describe_model(SELECTED_MODEL)}, weighted by E. coli ** {exponent:g}",
+        beta=beta,
+        features=[band_feature(spec, stat, coef) for spec, stat, coef in zip(SELECTED_MODEL, stats, beta[1:])],
+        ridge=args.ridge,
+        weight_exponent=exponent,
+        training_files=[path],
+        dates=dates,
+        loocv=metrics,
+    )
 
     print(f"Wrote {out_path}")
     print(f"Wrote {args.report}")
+    print(f"Wrote {args.artifact}")
     print(f"Selected model: {describe_model(SELECTED_MODEL)}  weight exponent {exponent:g}")
     print(
         f"LOOCV  median APE {metrics['median_ape']:.1f}%  MAE_log {metrics['mae_log']:.3f}  "
         f"MAE_high {metrics['mae_log_high']:.3f}  MAE_low {metrics['mae_log_low']:.3f}"
     )
+    if rolling:
+        roll = rolling[-1][2]
+        print(f"Rolling  median APE {roll['median_ape']:.1f}%  MAE_log {roll['mae_log']:.3f}  "
+              f"({len(rolling_log)} forecasts after {args.rolling_min_train} training dates)")
     return 0
 
 
@@ -30,13 +30,32 @@ spill hours are accumulated for every 1- to 7-day lookback. The ``model`` step
 then:
 
 1. ranks each outfall by the univariate correlation of log1p(spill hours) with
-   log10(E. coli) -- this is the "which ones matter most" answer;
+   log10(E. coli) -- this is the "which ones matter most" answer -- with a
+   permutation p-value and FDR q-value per outfall (``permutation.py``);
 2. builds a parsimonious multi-outfall model by forward selection scored with
    leave-one-out cross-validation (LOOCV), since there are far more outfalls than
    samples;
-3. reports the per-day percentage error of that model.
-
-Standard library only.
+3. reports the per-day percentage error of that model, with bootstrap intervals
+   for its coefficients and fitted values (``--bootstrap`` resamples of the
+   chosen outfalls), and saves the full-data fit as a model artifact
+   (``--artifact``, see ``model_artifact.py``);
+4. forecasts each date after the first ``--rolling-min-train`` from the dates
+   before it only (``ridge.rolling_origin_predictions``, an expanding window
+   with incremental normal-equation updates), next to the LOOCV numbers.
+
+``lasso`` is an alternative to the greedy search: a lasso / elastic-net path
+(``lasso.py``: sparse columns, coordinate descent with warm starts and
+strong-rule screening) over every outfall at every lookback at once. Each
+distinct set of outfalls the path visits is refitted with the ridge and scored
+by the same LOOCV as forward selection, and the report compares the two:
+
+    python scripts/model_conham_ecoli_by_site.py lasso             # all lookbacks, alpha 1
+    python scripts/model_conham_ecoli_by_site.py lasso --alpha 0.5 --lookbacks 3,7
+
+The features CSV is read once into ``SiteFeatures``, a (date x outfall) store
+of raw and log1p spill hours for every lookback, which the ranking, selection
+and final fit all index into. Standard library plus the shared ridge fit in
+``ridge.py`` (NumPy when available, pure Python otherwise).
 """
 from __future__ import annotations
 
@@ -49,9 +68,35 @@ import urllib.error
 import urllib.parse
 import urllib.request
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from datetime import date, datetime, time as dt_time, timedelta, timezone
 from pathlib import Path
 
+try:
+    import numpy as np
+except ImportError:  # pure-Python fallback
+    np = None
+
+from lasso import LAMBDA_RATIO, PATH_LENGTH, CscMatrix, lasso_path
+from model_artifact import MODELS_DIR, feature_entry, write_artifact
+from correlation import correlate
+from csv_sidecar import load_table
+from permutation import PERMUTATIONS, bh_qvalues, permutation_pvalues
+from ridge import (
+    BOOTSTRAP_DRAWS,
+    BOOTSTRAP_LEVEL,
+    ROLLING_MIN_TRAIN,
+    ForwardLoocv,
+    bootstrap_intervals,
+    loocv_predictions,
+    predict_log,
+    rolling_origin_predictions,
+    solve_ridge,
+    standardise_apply,
+    standardise_fit,
+)
+
 ARCGIS_QUERY_URL = "https://services.arcgis.com/3SZ6e0uCvPROr4mS/arcgis/rest/services/Wessex_Water_Event_Duration_Monitoring_2025_view/FeatureServer/0/query"
 CONHAM_RIVERS = [
     "RIVER AVON",
@@ -69,12 +114,16 @@ MAX_LOOKBACK = 7
 SITE_FEATURES_CSV = "docs/data/conham_cso_site_features.csv"
 PREDICTIONS_CSV = "docs/data/conham_ecoli_site_model_predictions.csv"
 REPORT_MD = "docs/data/conham_ecoli_site_model.md"
+ARTIFACT_JSON = f"{MODELS_DIR}/conham_by_site.json"
+LASSO_CSV = "docs/data/conham_ecoli_site_lasso.csv"
+LASSO_MD = "docs/data/conham_ecoli_site_lasso.md"
 
 # Modelling knobs.
 DEFAULT_LOOKBACK = 7          # best window for the band model; reused here
 DEFAULT_RIDGE = 0.3           # standardised-feature ridge penalty
 MAX_SELECTED_OUTFALLS = 4     # cap on forward-selected outfalls (n=25 samples)
 MIN_ACTIVE_WINDOWS = 3        # an outfall must spill in >= this many windows to be a candidate
+LASSO_MAX_SUPPORT = 8         # path stops once this many outfall features are non-zero
 
 
 # --------------------------------------------------------------------------- #
@@ -226,66 +275,76 @@ def write_site_features(rows: list[dict], path: Path) -> None:
         writer.writerows(rows)
 
 
-# --------------------------------------------------------------------------- #
-# Linear algebra (standard library only)
-# --------------------------------------------------------------------------- #
-def pearson(xs: list[float], ys: list[float]) -> float:
-    if len(xs) < 3 or len(set(xs)) < 2 or len(set(ys)) < 2:
-        return float("nan")
-    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
-    sx = math.sqrt(sum((x - mx) ** 2 for x in xs))
-    sy = math.sqrt(sum((y - my) ** 2 for y in ys))
-    return sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / (sx * sy)
-
-
-def standardise_fit(matrix):
-    if not matrix or not matrix[0]:
-        return []
-    stats = []
-    for j in range(len(matrix[0])):
-        col = [row[j] for row in matrix]
-        mean = sum(col) / len(col)
-        std = math.sqrt(sum((v - mean) ** 2 for v in col) / len(col))
-        stats.append((mean, std))
-    return stats
-
-
-def standardise_apply(matrix, stats):
-    return [
-        [(row[j] - stats[j][0]) / stats[j][1] if stats[j][1] > 0 else 0.0 for j in range(len(stats))]
-        for row in matrix
-    ]
-
-
-def solve_ridge(matrix, target, ridge):
-    n = len(matrix)
-    p = len(matrix[0]) if matrix and matrix[0] else 0
-    design = [[1.0] + row for row in matrix]
-    width = p + 1
-    xtx = [[sum(design[k][i] * design[k][j] for k in range(n)) for j in range(width)] for i in range(width)]
-    xty = [sum(design[k][i] * target[k] for k in range(n)) for i in range(width)]
-    for i in range(1, width):
-        xtx[i][i] += ridge
-    aug = [xtx[i] + [xty[i]] for i in range(width)]
-    for col in range(width):
-        pivot = max(range(col, width), key=lambda r: abs(aug[r][col]))
-        aug[col], aug[pivot] = aug[pivot], aug[col]
-        pivot_val = aug[col][col]
-        if abs(pivot_val) < 1e-12:
-            continue
-        for r in range(width):
-            if r == col:
-                continue
-            factor = aug[r][col] / pivot_val
-            aug[r] = [aug[r][k] - factor * aug[col][k] for k in range(width + 1)]
-    return [aug[i][width] / aug[i][i] if abs(aug[i][i]) > 1e-12 else 0.0 for i in range(width)]
-
-
 # --------------------------------------------------------------------------- #
 # Step 2: model
 # --------------------------------------------------------------------------- #
-def load_site_features(path: Path, samples_path: Path, lookback: int):
-    """Return (dates, ecoli, site_meta, spill[date][site]) at a fixed lookback.
+class SiteFeatures:
+    """Per-outfall spill hours for every sample date, as (date x outfall) columns.
+
+    Built once by ``load_site_features``: ``raw`` holds the summed spill hours
+    and ``log`` their ``math.log1p``, one (date x outfall) matrix per lookback
+    (NumPy arrays when available, nested lists otherwise). ``at(lookback)``
+    returns that lookback's slice; the model code then takes columns and
+    sub-matrices by outfall index, so nothing is re-transformed per fold,
+    candidate or selection step. Outfalls that never appear at a lookback are
+    all-zero columns there.
+    """
+
+    def __init__(self, dates, ecoli, meta, sites, raw, lookback=None):
+        self.dates = dates
+        self.ecoli = ecoli
+        self.meta = meta
+        self.sites = sites
+        self.index = {site: j for j, site in enumerate(sites)}
+        self.target = [math.log10(ecoli[d]) for d in dates]
+        self.lookback = lookback
+        self._raw = raw        # lookback -> (date x outfall)
+        self._log = {
+            lb: [[math.log1p(v) for v in row] for row in rows] for lb, rows in raw.items()
+        }
+        if np is not None:
+            self._raw = {lb: np.array(rows, dtype=float).reshape(len(dates), len(sites)) for lb, rows in self._raw.items()}
+            self._log = {lb: np.array(rows, dtype=float).reshape(len(dates), len(sites)) for lb, rows in self._log.items()}
+
+    @property
+    def lookbacks(self) -> list[int]:
+        return sorted(self._raw)
+
+    def at(self, lookback: int) -> "SiteFeatures":
+        """The same store narrowed to one lookback (the arrays are shared, not copied)."""
+        if lookback not in self._raw:
+            raise SystemExit(f"No rows at lookback_days={lookback}")
+        view = object.__new__(SiteFeatures)
+        view.__dict__.update(self.__dict__)
+        view.lookback = lookback
+        return view
+
+    @property
+    def raw(self):
+        return self._raw[self.lookback]
+
+    @property
+    def log(self):
+        return self._log[self.lookback]
+
+    def column(self, site: str, log: bool = True) -> list[float]:
+        """One outfall's values in date order (log1p by default)."""
+        j = self.index[site]
+        matrix = self.log if log else self.raw
+        if np is not None:
+            return matrix[:, j].tolist()
+        return [row[j] for row in matrix]
+
+    def matrix(self, sites: list[str]):
+        """(date x len(sites)) log1p design for a set of outfalls."""
+        idx = [self.index[site] for site in sites]
+        if np is not None:
+            return np.take(self.log, idx, axis=1)  # C-ordered, like an array built from rows
+        return [[row[j] for j in idx] for row in self.log]
+
+
+def load_site_features(path: Path, samples_path: Path) -> SiteFeatures:
+    """Read every lookback of the per-outfall CSV into a ``SiteFeatures`` store.
 
     The authoritative date/E. coli list comes from the sampling CSV so that
     sample dates with no spill anywhere (no rows in the per-outfall CSV) are kept
@@ -294,87 +353,153 @@ def load_site_features(path: Path, samples_path: Path, lookback: int):
     ecoli: dict[str, float] = {
         s["sample_date"].isoformat(): float(s["e_coli_cfu_per_100ml"]) for s in read_samples(samples_path)
     }
-    spill: dict[str, dict[str, float]] = defaultdict(dict)
+    if np is not None:
+        return _site_features_from_table(load_table(path), ecoli)
+    spill: dict[int, dict[str, dict[str, float]]] = defaultdict(lambda: defaultdict(dict))
     meta: dict[str, dict] = {}
     with path.open(newline="", encoding="utf-8") as handle:
         for row in csv.DictReader(handle):
-            if int(row["lookback_days"]) != lookback:
-                continue
             d = row["sample_date"]
             if d not in ecoli:  # ignore stray dates not in the sampling CSV
                 continue
+            by_site = spill[int(row["lookback_days"])][d]
             site = row["site_name"] or row["site_id"]
-            spill[d][site] = spill[d].get(site, 0.0) + float(row["spill_hours"])
+            by_site[site] = by_site.get(site, 0.0) + float(row["spill_hours"])
             meta.setdefault(site, {"distance_miles": row.get("distance_miles", ""), "watercourse": row.get("receiving_watercourse", "")})
     dates = sorted(ecoli)
-    return dates, ecoli, meta, spill
+    sites = sorted(meta)
+    raw = {
+        lookback: [[by_date[d].get(site, 0.0) for site in sites] for d in dates]
+        for lookback, by_date in spill.items()
+    }
+    return SiteFeatures(dates, ecoli, meta, sites, raw)
+
+
+def _site_features_from_table(table, ecoli: dict[str, float]) -> SiteFeatures:
+    """``load_site_features`` from the CSV's binary sidecar (``csv_sidecar.py``).
+
+    The per-(lookback, date, outfall) sums are one ``np.add.at``, which adds the
+    rows in file order, so they match the row loop bit for bit.
+    """
+    dates = sorted(ecoli)
+    row_dates = table.text("sample_date")
+    kept = [k for k, d in enumerate(row_dates) if d in ecoli]  # ignore stray dates not in the sampling CSV
+    names, ids = table.text("site_name"), table.text("site_id")
+    distances = table.text("distance_miles") if "distance_miles" in table else None
+    watercourses = table.text("receiving_watercourse") if "receiving_watercourse" in table else None
+    meta: dict[str, dict] = {}
+    keys = []
+    for k in kept:
+        site = names[k] or ids[k]
+        keys.append(site)
+        meta.setdefault(site, {"distance_miles": distances[k] if distances else "",
+                               "watercourse": watercourses[k] if watercourses else ""})
+    sites = sorted(meta)
+    site_index = {site: j for j, site in enumerate(sites)}
+    date_index = {d: i for i, d in enumerate(dates)}
+    lookback_of = table.ints("lookback_days")[kept].tolist()
+    lookbacks = list(dict.fromkeys(lookback_of))  # first-seen order, as the row loop's dict
+    lookback_index = {lookback: i for i, lookback in enumerate(lookbacks)}
+
+    spill = np.zeros((len(lookbacks), len(dates), len(sites)))
+    np.add.at(
+        spill,
+        (
+            np.array([lookback_index[lb] for lb in lookback_of], dtype=np.int64),
+            np.array([date_index[row_dates[k]] for k in kept], dtype=np.int64),
+            np.array([site_index[site] for site in keys], dtype=np.int64),
+        ),
+        table.floats("spill_hours")[kept],
+    )
+    raw = {lookback: spill[i].tolist() for i, lookback in enumerate(lookbacks)}
+    return SiteFeatures(dates, ecoli, meta, sites, raw)
+
+
+def loocv_mae_log(features: SiteFeatures, sites, ridge) -> tuple[float, dict[str, float]]:
+    """LOOCV mean absolute log10 error for a fixed set of outfall features.
+
+    Closed-form (``ridge.loocv_predictions``): the same predictions as
+    re-standardising and refitting without each date, from one batched solve.
+    """
+    matrix = features.matrix(sites)
+    preds = dict(zip(features.dates, loocv_predictions(matrix, features.target, ridge)))
+    return mae_log(preds.values(), features.target), preds
+
 
+def rolling_mae_log(features: SiteFeatures, sites, ridge, min_train=ROLLING_MIN_TRAIN) -> tuple[float, dict[str, float]]:
+    """Expanding-window MAE_log for a fixed set of outfalls: each date after ``min_train`` from earlier dates only."""
+    preds = rolling_origin_predictions(features.matrix(sites), features.target, ridge, None, min_train)
+    rolled = {d: pred for d, pred in zip(features.dates, preds) if not math.isnan(pred)}
+    return mae_log(rolled.values(), [t for t, pred in zip(features.target, preds) if not math.isnan(pred)]), rolled
 
-def site_vector(dates, spill, site) -> list[float]:
-    return [math.log1p(spill[d].get(site, 0.0)) for d in dates]
 
+def mae_log(log_preds, target) -> float:
+    abs_log = [abs(p - t) for p, t in zip(log_preds, target)]
+    return sum(abs_log) / len(abs_log)
 
-def loocv_mae_log(dates, ecoli, spill, sites, ridge) -> tuple[float, dict[str, float]]:
-    """LOOCV mean absolute log10 error for a fixed set of outfall features."""
-    preds: dict[str, float] = {}
-    abs_log = []
-    for test in dates:
-        train = [d for d in dates if d != test]
-        matrix = [[math.log1p(spill[d].get(s, 0.0)) for s in sites] for d in train]
-        stats = standardise_fit(matrix) if sites else []
-        std_train = standardise_apply(matrix, stats) if sites else [[] for _ in train]
-        target = [math.log10(ecoli[d]) for d in train]
-        beta = solve_ridge(std_train, target, ridge)
-        test_row = standardise_apply([[math.log1p(spill[test].get(s, 0.0)) for s in sites]], stats)[0] if sites else []
-        log_pred = beta[0] + sum(beta[1 + j] * test_row[j] for j in range(len(sites)))
-        preds[test] = log_pred
-        abs_log.append(abs(log_pred - math.log10(ecoli[test])))
-    return sum(abs_log) / len(abs_log), preds
 
+def forward_select(features: SiteFeatures, candidates, ridge, max_features, workers=1):
+    """Greedily add the outfall that most improves LOOCV MAE_log; stop when no gain.
 
-def forward_select(dates, ecoli, spill, candidates, ridge, max_features):
-    """Greedily add the outfall that most improves LOOCV MAE_log; stop when no gain."""
+    Each step scores every remaining candidate against the current selection's
+    fold factorisations (``ridge.ForwardLoocv``, a bordered update per
+    candidate); ``workers`` > 1 splits the candidates across a process pool.
+    """
+    target = features.target
+    columns = {site: features.column(site) for site in candidates}
+    search = ForwardLoocv(target, ridge)
     selected: list[str] = []
-    best_mae, _ = loocv_mae_log(dates, ecoli, spill, selected, ridge)
+    best_mae = mae_log(search.predictions(), target)
     history = [("(intercept only)", best_mae)]
-    while len(selected) < max_features:
-        trials = []
-        for site in candidates:
-            if site in selected:
-                continue
-            mae, _ = loocv_mae_log(dates, ecoli, spill, selected + [site], ridge)
-            trials.append((mae, site))
-        if not trials:
-            break
-        trials.sort()
-        mae, site = trials[0]
-        if mae >= best_mae - 1e-4:  # require a real improvement
-            break
-        selected.append(site)
-        best_mae = mae
-        history.append((site, mae))
+    with ProcessPoolExecutor(workers) if workers > 1 else nullcontext() as pool:
+        while len(selected) < max_features:
+            remaining = [site for site in candidates if site not in selected]
+            if not remaining:
+                break
+            if pool is None:
+                batch = search.score([columns[site] for site in remaining])
+            else:
+                shards = [remaining[i::workers] for i in range(workers)]
+                scored = pool.map(search.score, [[columns[site] for site in shard] for shard in shards])
+                by_site = {site: preds for shard, preds in zip(shards, scored) for site, preds in zip(shard, preds)}
+                batch = [by_site[site] for site in remaining]
+            trials = sorted((mae_log(preds, target), site) for preds, site in zip(batch, remaining))
+            mae, site = trials[0]
+            if mae >= best_mae - 1e-4:  # require a real improvement
+                break
+            selected.append(site)
+            search.add(columns[site])
+            best_mae = mae
+            history.append((site, mae))
     return selected, best_mae, history
 
 
-def rank_outfalls(dates, ecoli, spill, meta):
-    y = [math.log10(ecoli[d]) for d in dates]
-    rows = []
-    for site in sorted({s for d in dates for s in spill[d]}):
-        values = [spill[d].get(site, 0.0) for d in dates]
+def rank_outfalls(features: SiteFeatures, permutations=PERMUTATIONS):
+    """Outfalls by |Pearson r| of log1p(spill hours) with log10(E. coli), with permutation p / BH q-values."""
+    y = features.target
+    rows, columns = [], []
+    for site in features.sites:
+        values = features.column(site, log=False)
         active = sum(1 for v in values if v > 0)
         if active == 0:
             continue
-        r = pearson([math.log1p(v) for v in values], y)
+        columns.append(features.column(site))
         rows.append(
             {
                 "site": site,
-                "watercourse": meta.get(site, {}).get("watercourse", ""),
-                "distance_miles": meta.get(site, {}).get("distance_miles", ""),
+                "watercourse": features.meta.get(site, {}).get("watercourse", ""),
+                "distance_miles": features.meta.get(site, {}).get("distance_miles", ""),
                 "active_windows": active,
                 "total_spill_hours": round(sum(values), 1),
-                "pearson_r": r,
             }
         )
+    corr = correlate(columns, y)
+    p_values = permutation_pvalues(columns, y, permutations)
+    rho_p_values = permutation_pvalues(columns, y, permutations, rank=True)
+    for row, r, p_value, q_value, rho, rho_p in zip(rows, corr["pearson_r"], p_values, bh_qvalues(p_values),
+                                                  corr["spearman_rho"], rho_p_values):
+        row["pearson_r"], row["p_value"], row["q_value"] = r, p_value, q_value
+        row["spearman_rho"], row["spearman_p"] = rho, rho_p
     rows.sort(key=lambda r: (-(abs(r["pearson_r"]) if not math.isnan(r["pearson_r"]) else -1)))
     return rows
 
@@ -386,21 +511,39 @@ def run_model(args) -> int:
             f"{path} not found. Run `python {Path(__file__).name} fetch` first "
             "(needs network access to the ArcGIS 2025 EDM view)."
         )
-    dates, ecoli, meta, spill = load_site_features(path, Path(args.samples), args.lookback)
-    if not dates:
+    store = load_site_features(path, Path(args.samples))
+    if args.lookback not in store.lookbacks:
         raise SystemExit(f"No rows at lookback_days={args.lookback} in {path}")
+    features = store.at(args.lookback)
+    dates, ecoli, target = features.dates, features.ecoli, features.target
 
-    ranking = rank_outfalls(dates, ecoli, spill, meta)
-    candidates = [r["site"] for r in ranking if r["active_windows"] >= MIN_ACTIVE_WINDOWS]
-    selected, sel_mae, history = forward_select(dates, ecoli, spill, candidates, args.ridge, args.max_outfalls)
+    ranking = rank_outfalls(features, args.permutations)
+    candidates = [r["site"] for r in ranking if r["active_windows"] >= args.min_active]
+    selected, sel_mae, history = forward_select(features, candidates, args.ridge, args.max_outfalls, args.workers)
 
     # Final model: full-fit coefficients (impact direction) + LOOCV per-day errors.
-    matrix = [[math.log1p(spill[d].get(s, 0.0)) for s in selected] for d in dates]
+    matrix = features.matrix(selected)
     stats = standardise_fit(matrix) if selected else []
     std = standardise_apply(matrix, stats) if selected else [[] for _ in dates]
-    beta = solve_ridge(std, [math.log10(ecoli[d]) for d in dates], args.ridge)
-    _, loocv_log = loocv_mae_log(dates, ecoli, spill, selected, args.ridge)
-    mean_mae, _ = loocv_mae_log(dates, ecoli, spill, [], args.ridge)
+    beta = solve_ridge(std, target, args.ridge)
+    boot = None
+    if args.bootstrap > 0:
+        boot = bootstrap_intervals(matrix if selected else [[] for _ in dates], target,
+                                   args.ridge, None, args.bootstrap, seed=args.bootstrap_seed, workers=args.workers)
+        boot["fitted"] = [predict_log(beta, row) for row in std]
+    _, loocv_log = loocv_mae_log(features, selected, args.ridge)
+    mean_mae, mean_loocv = loocv_mae_log(features, [], args.ridge)
+    rolling_log, rolling = {}, None
+    if 0 < args.rolling_min_train < len(dates):
+        _, rolling_log = rolling_mae_log(features, selected, args.ridge, args.rolling_min_train)
+        _, mean_rolling = rolling_mae_log(features, [], args.ridge, args.rolling_min_train)
+        rolled = [d for d in dates if d in rolling_log]
+        rolled_target = [math.log10(ecoli[d]) for d in rolled]
+        rolling = {"min_train": args.rolling_min_train, "rows": []}
+        for name, loo, roll in (("mean baseline", mean_loocv, mean_rolling), ("selected outfalls", loocv_log, rolling_log)):
+            apes = sorted(abs(10 ** roll[d] - ecoli[d]) / ecoli[d] * 100.0 for d in rolled)
+            rolling["rows"].append((name, mae_log([loo[d] for d in rolled], rolled_target),
+                                    mae_log([roll[d] for d in rolled], rolled_target), apes[len(apes) // 2]))
 
     predictions, apes = [], []
     for d in dates:
@@ -415,6 +558,7 @@ def run_model(args) -> int:
                 "loocv_predicted_cfu_per_100ml": round(pred, 1),
                 "loocv_signed_pct_error": round((pred - actual) / actual * 100.0, 1),
                 "loocv_abs_pct_error": round(ape, 1),
+                "rolling_predicted_cfu_per_100ml": round(10 ** rolling_log[d], 1) if d in rolling_log else "",
             }
         )
     median_ape = sorted(apes)[len(apes) // 2]
@@ -425,22 +569,46 @@ def run_model(args) -> int:
     with out_csv.open("w", newline="", encoding="utf-8") as handle:
         writer = csv.DictWriter(
             handle,
-            fieldnames=["sample_date", "actual_cfu_per_100ml", "loocv_predicted_cfu_per_100ml", "loocv_signed_pct_error", "loocv_abs_pct_error"],
+            fieldnames=["sample_date", "actual_cfu_per_100ml", "loocv_predicted_cfu_per_100ml", "loocv_signed_pct_error",
+                        "loocv_abs_pct_error", "rolling_predicted_cfu_per_100ml"],
         )
         writer.writeheader()
         writer.writerows(predictions)
 
     write_report(Path(args.report), dates, args.lookback, ranking, selected, beta, stats, history,
-                 sel_mae, mean_mae, median_ape, mape, predictions)
+                 sel_mae, mean_mae, median_ape, mape, predictions, boot, rolling)
+    entries = [
+        feature_entry(f"{site}@{args.lookback}d", {"kind": "outfall", "lookback_days": args.lookback, "site": site},
+                      "log1p", stat, coef)
+        for site, stat, coef in zip(selected, stats, beta[1:])
+    ]
+    write_artifact(
+        Path(args.artifact),
+        name="conham_by_site",
+        script="scripts/model_conham_ecoli_by_site.py",
+        description=f"log1p spill hours at {len(selected)} forward-selected outfalls, {args.lookback}-day lookback",
+        beta=beta,
+        features=entries,
+        ridge=args.ridge,
+        weight_exponent=0.0,
+        training_files=[path, Path(args.samples)],
+        dates=dates,
+        loocv={"mae_log": sel_mae, "mean_baseline_mae_log": mean_mae, "median_ape": median_ape, "mape": mape},
+    )
     print(f"Wrote {out_csv}")
     print(f"Wrote {args.report}")
+    print(f"Wrote {args.artifact}")
     print(f"Outfalls considered: {len(ranking)}; selected: {len(selected)}")
     print(f"LOOCV MAE_log: selected {sel_mae:.3f} vs mean baseline {mean_mae:.3f}; median APE {median_ape:.1f}%")
+    if rolling:
+        (_, _, mean_roll, _), (_, _, sel_roll, _) = rolling["rows"]
+        print(f"Rolling MAE_log: selected {sel_roll:.3f} vs mean baseline {mean_roll:.3f} "
+              f"({len(rolling_log)} forecasts after {args.rolling_min_train} training dates)")
     return 0
 
 
 def write_report(path, dates, lookback, ranking, selected, beta, stats, history,
-                 sel_mae, mean_mae, median_ape, mape, predictions) -> None:
+                 sel_mae, mean_mae, median_ape, mape, predictions, boot=None, rolling=None) -> None:
     lines = [
         "# Conham E. coli model by individual CSO outfall",
         "",
@@ -458,17 +626,24 @@ def write_report(path, dates, lookback, ranking, selected, beta, stats, history,
         "Univariate correlation of each outfall's log1p(spill hours) with log10(E. coli).",
         "Positive `r` = more spilling at that outfall coincides with higher E. coli.",
         "`active windows` is how many of the sample windows that outfall actually spilled in",
-        "(low counts mean a fragile correlation).",
+        "(low counts mean a fragile correlation). `p` is a two-sided permutation p-value",
+        "(E. coli shuffled across sample dates) and `q` its Benjamini-Hochberg FDR-adjusted",
+        f"value across all {len(ranking)} outfalls tested. Spearman `rho` and its `p` are the same",
+        "test on ranks.",
         "",
-        "| Rank | Outfall | Watercourse | Dist (mi) | Active windows | Total spill h | Pearson r |",
-        "|---:|---|---|---:|---:|---:|---:|",
+        "| Rank | Outfall | Watercourse | Dist (mi) | Active windows | Total spill h | Pearson r | p | q | Spearman rho | rho p |",
+        "|---:|---|---|---:|---:|---:|---:|---:|---:|---:|---:|",
     ]
     for i, r in enumerate(ranking[:20], 1):
         rv = "n/a" if math.isnan(r["pearson_r"]) else f"{r['pearson_r']:+.3f}"
+        pv = "n/a" if math.isnan(r["p_value"]) else f"{r['p_value']:.4f}"
+        qv = "n/a" if math.isnan(r["q_value"]) else f"{r['q_value']:.4f}"
+        rho = "n/a" if math.isnan(r["spearman_rho"]) else f"{r['spearman_rho']:+.3f}"
+        rho_p = "n/a" if math.isnan(r["spearman_p"]) else f"{r['spearman_p']:.4f}"
         sel = " ★" if r["site"] in selected else ""
         lines.append(
             f"| {i} | {r['site']}{sel} | {r['watercourse']} | {r['distance_miles']} | "
-            f"{r['active_windows']} | {r['total_spill_hours']:.0f} | {rv} |"
+            f"{r['active_windows']} | {r['total_spill_hours']:.0f} | {rv} | {pv} | {qv} | {rho} | {rho_p} |"
         )
     lines.extend(
         [
@@ -494,15 +669,23 @@ def write_report(path, dates, lookback, ranking, selected, beta, stats, history,
             "",
             "### Coefficients (standardised log1p spill hours, log10 target)",
             "",
-            "| Term | Coefficient |",
-            "|---|---:|",
-            f"| intercept | {beta[0]:.4f} |",
         ]
     )
-    for site, coef in zip(selected, beta[1:]):
-        lines.append(f"| {site} | {coef:+.4f} |")
+    if boot is None:
+        lines.extend(["| Term | Coefficient |", "|---|---:|", f"| intercept | {beta[0]:.4f} |"])
+        for site, coef in zip(selected, beta[1:]):
+            lines.append(f"| {site} | {coef:+.4f} |")
+    else:
+        (lo, hi), intervals = boot["coef"][0], boot["coef"][1:]
+        lines.extend([
+            f"| Term | Coefficient | {BOOTSTRAP_LEVEL:.0%} bootstrap interval |",
+            "|---|---:|---:|",
+            f"| intercept | {beta[0]:.4f} | {lo:.4f} to {hi:.4f} |",
+        ])
+        for site, coef, (lo, hi) in zip(selected, beta[1:], intervals):
+            lines.append(f"| {site} | {coef:+.4f} | {lo:+.4f} to {hi:+.4f} |")
     if not selected:
-        lines.append("| _(no outfall improved LOOCV; model is intercept-only)_ | |")
+        lines.append("| _(no outfall improved LOOCV; model is intercept-only)_ | |" + (" |" if boot else ""))
     lines.extend(
         [
             "",
@@ -519,6 +702,49 @@ def write_report(path, dates, lookback, ranking, selected, beta, stats, history,
             f"| {p['sample_date']} | {p['actual_cfu_per_100ml']:.0f} | {p['loocv_predicted_cfu_per_100ml']:.0f} | "
             f"{p['loocv_signed_pct_error']:+.1f}% | {p['loocv_abs_pct_error']:.1f}% |"
         )
+    if rolling is not None:
+        lines.extend(
+            [
+                "",
+                f"## Rolling-origin evaluation (expanding window, first {rolling['min_train']} dates train only)",
+                "",
+                "Each later date is forecast by the chosen outfalls' model fitted on the dates",
+                "before it only. LOOCV is shown on the same dates; it may train on later dates.",
+                "The outfalls were still chosen by LOOCV over every date, so this is not what a",
+                "live nowcast would have said and the rolling MAE is still optimistic.",
+                "",
+                "| Model | LOOCV MAE_log | Rolling MAE_log | Rolling median APE |",
+                "|---|---:|---:|---:|",
+            ]
+        )
+        for name, loo, roll, ape in rolling["rows"]:
+            lines.append(f"| {name} | {loo:.3f} | {roll:.3f} | {ape:.1f}% |")
+        lines.extend(["", "| Sample date | Actual | LOOCV predicted | Rolling predicted |", "|---|---:|---:|---:|"])
+        for p in predictions:
+            if p["rolling_predicted_cfu_per_100ml"] != "":
+                lines.append(
+                    f"| {p['sample_date']} | {p['actual_cfu_per_100ml']:.0f} | "
+                    f"{p['loocv_predicted_cfu_per_100ml']:.0f} | {p['rolling_predicted_cfu_per_100ml']:.0f} |"
+                )
+    if boot is not None:
+        lines.extend(
+            [
+                "",
+                f"## Bootstrap intervals ({BOOTSTRAP_LEVEL:.0%} percentile)",
+                "",
+                "Each resample redraws the sample days with replacement and refits the chosen",
+                "outfalls (selection itself is not redone). The interval is the spread of each",
+                "day's in-sample estimate across the refits.",
+                "",
+                "| Sample date | Actual | Fitted | Interval |",
+                "|---|---:|---:|---:|",
+            ]
+        )
+        for p, fitted, (lo, hi) in zip(predictions, boot["fitted"], boot["log_pred"]):
+            lines.append(
+                f"| {p['sample_date']} | {p['actual_cfu_per_100ml']:.0f} | {10 ** fitted:.0f} | "
+                f"{10 ** lo:.0f} to {10 ** hi:.0f} |"
+            )
     lines.extend(
         [
             "",
@@ -538,6 +764,163 @@ def write_report(path, dates, lookback, ranking, selected, beta, stats, history,
     path.write_text("\n".join(lines), encoding="utf-8")
 
 
+# --------------------------------------------------------------------------- #
+# Step 3 (optional): lasso path
+# --------------------------------------------------------------------------- #
+def parse_lookbacks(text: str, available: list[int]) -> list[int]:
+    """"all", "1-7" or "1,3,7" -> lookbacks present in the features CSV."""
+    if text == "all":
+        return available
+    days: set[int] = set()
+    for part in text.split(","):
+        lo, _, hi = part.partition("-")
+        days.update(range(int(lo), int(hi or lo) + 1))
+    missing = sorted(days - set(available))
+    if missing:
+        raise SystemExit(f"No rows at lookback_days={missing} (have {available})")
+    return sorted(days)
+
+
+def lasso_candidates(store: SiteFeatures, lookbacks: list[int], min_active: int):
+    """(names, log1p columns) for every outfall x lookback spilling in >= ``min_active`` windows."""
+    names, columns = [], []
+    for lookback in lookbacks:
+        features = store.at(lookback)
+        for site in features.sites:
+            if sum(1 for v in features.column(site, log=False) if v > 0) >= min_active:
+                names.append((site, lookback))
+                columns.append(features.column(site))
+    return names, columns
+
+
+def run_lasso(args) -> int:
+    path = Path(args.features)
+    if not path.exists():
+        raise SystemExit(f"{path} not found. Run `python {Path(__file__).name} fetch` first.")
+    store = load_site_features(path, Path(args.samples))
+    lookbacks = parse_lookbacks(args.lookbacks, store.lookbacks)
+    features = store.at(lookbacks[0])
+    target = features.target
+
+    start = time.perf_counter()
+    names, columns = lasso_candidates(store, lookbacks, args.min_active)
+    design = CscMatrix.from_columns(columns, len(target))
+    _, lasso = lasso_path(design, target, args.alpha, args.path_length, args.lambda_ratio,
+                          max_active=args.max_support)
+    path_seconds = time.perf_counter() - start
+
+    # Relaxed lasso: every distinct support the path visits, refitted with the
+    # ridge and scored by the same LOOCV as forward selection.
+    steps, seen = [], {}
+    for point in lasso:
+        support = tuple(point["coef"])
+        if len(support) > args.max_support:
+            break
+        if support not in seen:
+            matrix = [list(row) for row in zip(*(columns[j] for j in support))] if support else [[] for _ in target]
+            seen[support] = mae_log(loocv_predictions(matrix, target, args.ridge), target)
+        steps.append({"lambda": point["lambda"], "support": support, "mae_log": seen[support],
+                      "coef": point["coef"]})
+    scored_seconds = time.perf_counter() - start
+    best = min(seen, key=lambda support: (seen[support], len(support)))
+
+    greedy_features = store.at(args.lookback) if args.lookback in store.lookbacks else None
+    greedy = None
+    if greedy_features is not None:
+        start = time.perf_counter()
+        ranking = rank_outfalls(greedy_features, 0)
+        candidates = [r["site"] for r in ranking if r["active_windows"] >= args.min_active]
+        selected, sel_mae, _ = forward_select(greedy_features, candidates, args.ridge, args.max_outfalls)
+        greedy = (selected, sel_mae, time.perf_counter() - start, len(candidates))
+
+    def label(j):
+        site, lookback = names[j]
+        return f"{site}@{lookback}d"
+
+    out_csv = Path(args.output)
+    out_csv.parent.mkdir(parents=True, exist_ok=True)
+    with out_csv.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=["lambda", "n_features", "features", "relaxed_loocv_mae_log"])
+        writer.writeheader()
+        for step in steps:
+            writer.writerow({
+                "lambda": f"{step['lambda']:.6g}",
+                "n_features": len(step["support"]),
+                "features": "; ".join(label(j) for j in step["support"]),
+                "relaxed_loocv_mae_log": f"{step['mae_log']:.4f}",
+            })
+    write_lasso_report(Path(args.report), args, features.dates, lookbacks, names, design, steps, seen, best,
+                       greedy, label, path_seconds, scored_seconds)
+    print(f"Wrote {out_csv}")
+    print(f"Wrote {args.report}")
+    print(f"Lasso path over {len(names)} outfall x lookback features ({design.nnz} non-zeros): "
+          f"{len(lasso)} penalties in {path_seconds:.3f}s, {len(seen)} supports scored by {scored_seconds:.3f}s")
+    print(f"Best relaxed-lasso LOOCV MAE_log {seen[best]:.3f} with {len(best)} features"
+          + (f"; forward selection @ {args.lookback}d {greedy[1]:.3f}" if greedy else ""))
+    return 0
+
+
+def write_lasso_report(path, args, dates, lookbacks, names, design, steps, seen, best, greedy, label,
+                       path_seconds, scored_seconds) -> None:
+    density = design.nnz / max(len(names) * len(dates), 1)
+    lines = [
+        "# Conham E. coli per-outfall lasso path",
+        "",
+        "Generated by `scripts/model_conham_ecoli_by_site.py lasso`. A "
+        + ("lasso" if args.alpha == 1 else f"elastic-net (alpha {args.alpha:g})") + " path over",
+        "log1p spill hours at every outfall and lookback at once, fitted by coordinate descent",
+        "on a sparse design. Every distinct set of features the path visits is then refitted",
+        f"with the ridge (penalty {args.ridge:g}) and scored by the same LOOCV as forward selection.",
+        "",
+        f"- Sample dates: {len(dates)}",
+        f"- Lookbacks: {', '.join(str(lb) for lb in lookbacks)} days",
+        f"- Candidate features (outfall x lookback, spilling in >= {args.min_active} windows): {len(names)}",
+        f"- Non-zeros: {design.nnz} ({density:.1%} of the design)",
+        f"- Path: {path_seconds:.3f}s; with LOOCV of {len(seen)} supports: {scored_seconds:.3f}s",
+        "",
+        "## Lasso vs forward selection",
+        "",
+        "| Method | Features | LOOCV MAE_log |",
+        "|---|---|---:|",
+        f"| Relaxed lasso (best support on the path) | {'; '.join(label(j) for j in best) or 'intercept'} | "
+        f"{seen[best]:.3f} |",
+    ]
+    small = [support for support in seen if len(support) <= args.max_outfalls]
+    if small and len(best) > args.max_outfalls:
+        capped = min(small, key=lambda support: (seen[support], len(support)))
+        lines.append(f"| Relaxed lasso (best with at most {args.max_outfalls} features) | "
+                     f"{'; '.join(label(j) for j in capped) or 'intercept'} | {seen[capped]:.3f} |")
+    if greedy is not None:
+        selected, sel_mae, seconds, n_candidates = greedy
+        lines.append(f"| Forward selection @ {args.lookback}d ({n_candidates} candidates, {seconds:.3f}s) | "
+                     f"{'; '.join(f'{site}@{args.lookback}d' for site in selected) or 'intercept'} | {sel_mae:.3f} |")
+    lines.extend(
+        [
+            "",
+            "Both choose their features using every date, so both LOOCV figures are",
+            "somewhat optimistic (see `conham_ecoli_site_model.md`).",
+            "",
+            "## Path",
+            "",
+            "Coefficients are on standardised features; a feature's first row is where it enters.",
+            "",
+            "| lambda | Features | Newly entered | Relaxed LOOCV MAE_log |",
+            "|---:|---:|---|---:|",
+        ]
+    )
+    previous: set[int] = set()
+    for step in steps:
+        support = set(step["support"])
+        if support == previous and step is not steps[0]:
+            continue
+        entered = ", ".join(f"{label(j)} ({step['coef'][j]:+.3f})" for j in sorted(support - previous)) or "-"
+        lines.append(f"| {step['lambda']:.4f} | {len(support)} | {entered} | {step['mae_log']:.3f} |")
+        previous = support
+    lines.append("")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("\n".join(lines), encoding="utf-8")
+
+
 # --------------------------------------------------------------------------- #
 # CLI
 # --------------------------------------------------------------------------- #
@@ -575,20 +958,62 @@ def build_parser() -> argparse.ArgumentParser:
     m.add_argument("--samples", default="docs/data/conham_sampling_2025_2026_e_coli.csv", help="E. coli sampling CSV (authoritative date list)")
     m.add_argument("--predictions", default=PREDICTIONS_CSV)
     m.add_argument("--report", default=REPORT_MD)
+    m.add_argument("--artifact", default=ARTIFACT_JSON, help="Fitted-model JSON for nowcast.py")
     m.add_argument("--lookback", type=int, default=DEFAULT_LOOKBACK)
     m.add_argument("--ridge", type=float, default=DEFAULT_RIDGE)
     m.add_argument("--max-outfalls", type=int, default=MAX_SELECTED_OUTFALLS)
+    m.add_argument("--min-active", type=int, default=MIN_ACTIVE_WINDOWS,
+                   help="Only outfalls spilling in at least this many windows are candidates (1 = all)")
+    m.add_argument("--workers", type=int, default=1,
+                   help="Processes for forward selection and the bootstrap (1 = in-process)")
+    m.add_argument("--bootstrap", type=int, default=BOOTSTRAP_DRAWS,
+                   help="Bootstrap resamples for the report's intervals (0 = skip)")
+    m.add_argument("--bootstrap-seed", type=int, default=0)
+    m.add_argument("--rolling-min-train", type=int, default=ROLLING_MIN_TRAIN,
+                   help="Dates trained on before the first rolling-origin forecast (0 = skip)")
+    m.add_argument("--permutations", type=int, default=PERMUTATIONS,
+                   help="Shuffles for the outfall ranking's permutation p-values (0 = skip)")
     m.set_defaults(func=run_model)
 
+    lasso = sub.add_parser("lasso", help="Lasso / elastic-net path over every outfall and lookback (offline)")
+    lasso.add_argument("--features", **common_features)
+    lasso.add_argument("--samples", default="docs/data/conham_sampling_2025_2026_e_coli.csv", help="E. coli sampling CSV (authoritative date list)")
+    lasso.add_argument("--output", default=LASSO_CSV, help="Path CSV: each penalty's features and relaxed LOOCV error")
+    lasso.add_argument("--report", default=LASSO_MD)
+    lasso.add_argument("--lookbacks", default="all", help='Lookbacks to search, e.g. "all", "1-7" or "3,7"')
+    lasso.add_argument("--alpha", type=float, default=1.0, help="Elastic-net mix: 1 = lasso, smaller adds a ridge term")
+    lasso.add_argument("--path-length", type=int, default=PATH_LENGTH, help="Penalties on the path")
+    lasso.add_argument("--lambda-ratio", type=float, default=LAMBDA_RATIO, help="Smallest penalty as a fraction of the largest")
+    lasso.add_argument("--max-support", type=int, default=LASSO_MAX_SUPPORT,
+                       help="Stop the path once more features than this are non-zero")
+    lasso.add_argument("--ridge", type=float, default=DEFAULT_RIDGE, help="Ridge penalty for the relaxed refits")
+    lasso.add_argument("--min-active", type=int, default=MIN_ACTIVE_WINDOWS,
+                       help="Only features spilling in at least this many windows are candidates (1 = all)")
+    lasso.add_argument("--lookback", type=int, default=DEFAULT_LOOKBACK, help="Lookback for the forward-selection comparison")
+    lasso.add_argument("--max-outfalls", type=int, default=MAX_SELECTED_OUTFALLS)
+    lasso.set_defaults(func=run_lasso)
+
     a = sub.add_parser("all", help="fetch then model")
     a.add_argument("--input", default="docs/data/conham_sampling_2025_2026_e_coli.csv")
     a.add_argument("--samples", default="docs/data/conham_sampling_2025_2026_e_coli.csv", help="E. coli sampling CSV (authoritative date list)")
     a.add_argument("--features", **common_features)
     a.add_argument("--predictions", default=PREDICTIONS_CSV)
     a.add_argument("--report", default=REPORT_MD)
+    a.add_argument("--artifact", default=ARTIFACT_JSON, help="Fitted-model JSON for nowcast.py")
     a.add_argument("--lookback", type=int, default=DEFAULT_LOOKBACK)
     a.add_argument("--ridge", type=float, default=DEFAULT_RIDGE)
     a.add_argument("--max-outfalls", type=int, default=MAX_SELECTED_OUTFALLS)
+    a.add_argument("--min-active", type=int, default=MIN_ACTIVE_WINDOWS,
+                   help="Only outfalls spilling in at least this many windows are candidates (1 = all)")
+    a.add_argument("--workers", type=int, default=1,
+                   help="Processes for forward selection and the bootstrap (1 = in-process)")
+    a.add_argument("--bootstrap", type=int, default=BOOTSTRAP_DRAWS,
+                   help="Bootstrap resamples for the report's intervals (0 = skip)")
+    a.add_argument("--bootstrap-seed", type=int, default=0)
+    a.add_argument("--rolling-min-train", type=int, default=ROLLING_MIN_TRAIN,
+                   help="Dates trained on before the first rolling-origin forecast (0 = skip)")
+    a.add_argument("--permutations", type=int, default=PERMUTATIONS,
+                   help="Shuffles for the outfall ranking's permutation p-values (0 = skip)")
     a.add_argument("--page-size", type=int, default=2000)
     a.add_argument("--sleep", type=float, default=0.1)
     a.set_defaults(func=lambda args: run_fetch(args) or run_model(args))
@@ -0,0 +1,127 @@
+"""Permutation tests for the correlation rankings.
+
+``analyze_conham_cso_ecoli.model_table``, ``model_conham_ecoli_by_site``'s
+outfall ranking and ``weather_conham_ecoli``'s weather table each rank dozens
+to hundreds of features by their correlation with log10(E. coli) on ~25
+samples. The top of such a list is partly chance, so each table now also gives:
+
+- ``permutation_pvalues`` -- a two-sided permutation p-value per feature. The
+  target is shuffled ``permutations`` times (the same shuffles for every
+  feature), and p = (1 + #{|r_null| >= |r|}) / (1 + permutations).
+- ``bh_qvalues`` -- Benjamini-Hochberg FDR-adjusted q-values over the table.
+
+With NumPy the columns and target are centred and scaled to unit norm once.
+Every batch of shuffles is then a single (features x n) @ (n x batch) product
+giving all the null correlations at once. Spearman's rho is the same test on
+ranks (ranking commutes with shuffling): pass ``rank=True``. Without NumPy the
+same shuffles are scored in pure Python, which is slower but gives the same
+answer.
+
+As in ``correlation.correlate``, a constant column or one with a NaN anywhere
+has no defined r and gets a NaN p-value (which ``bh_qvalues`` leaves out),
+not the smallest p a shuffle count allows.
+"""
+from __future__ import annotations
+
+import math
+import random
+from functools import lru_cache
+
+from correlation import ranks
+
+try:
+    import numpy as np
+except ImportError:  # pure-Python fallback
+    np = None
+
+PERMUTATIONS = 9999
+# Relative slack when comparing null and observed |r|, so a shuffle that
+# reproduces the observed ordering counts despite rounding.
+_TIE = 1e-12
+
+
+def _unit(values: list[float]) -> list[float] | None:
+    """Centred, unit-norm copy of ``values``; None if it is constant or not all finite."""
+    if not values or not all(math.isfinite(v) for v in values):
+        return None
+    mean = sum(values) / len(values)
+    centred = [v - mean for v in values]
+    norm = math.sqrt(sum(c * c for c in centred))
+    if len(set(values)) < 2 or norm == 0.0:
+        return None
+    return [c / norm for c in centred]
+
+
+@lru_cache(maxsize=8)
+def _shuffles(n: int, permutations: int, seed: int) -> tuple[tuple[int, ...], ...]:
+    """The shuffles for ``n`` samples, drawn once per process and reused by every table."""
+    rng = random.Random(seed)
+    order = list(range(n))
+    out = []
+    for _ in range(permutations):
+        rng.shuffle(order)
+        out.append(tuple(order))
+    return tuple(out)
+
+
+@lru_cache(maxsize=8)
+def _shuffle_array(n: int, permutations: int, seed: int):
+    return np.array(_shuffles(n, permutations, seed), dtype=np.int64).reshape(permutations, n)
+
+
+def _prepare(values, rank: bool) -> list[float] | None:
+    values = [float(v) for v in values]
+    if rank and all(math.isfinite(v) for v in values):
+        values = ranks(values)
+    return _unit(values)
+
+
+def permutation_pvalues(columns, target, permutations: int = PERMUTATIONS, seed: int = 0,
+                        batch: int = 2000, rank: bool = False) -> list[float]:
+    """Two-sided permutation p-value of Pearson r (Spearman's rho with ``rank``) for each column vs ``target``.
+
+    ``columns`` is one list per feature. Constant columns and columns holding
+    NaN (undefined r) get NaN. The shuffles depend only on ``seed`` and
+    ``len(target)``, so every feature and both code paths see the same null
+    draws.
+    """
+    n = len(target)
+    y = _prepare(target, rank)
+    units = [_prepare(c, rank) for c in columns]
+    if y is None or n < 3 or permutations < 1:
+        return [float("nan")] * len(units)
+    live = [i for i, u in enumerate(units) if u is not None]
+    counts = [0] * len(live)
+    if np is not None and live:
+        z = np.array([units[i] for i in live])                      # features x n
+        yv = np.array(y)
+        observed = np.abs(z @ yv) * (1.0 - _TIE)
+        hits = np.zeros(len(live), dtype=np.int64)
+        order = _shuffle_array(n, permutations, seed)
+        for start in range(0, permutations, batch):
+            shuffled = yv[order[start:start + batch]]               # batch x n
+            hits += (np.abs(z @ shuffled.T) >= observed[:, None]).sum(axis=1)
+        counts = hits.tolist()
+    else:
+        order = _shuffles(n, permutations, seed)
+        for k, i in enumerate(live):
+            u = units[i]
+            observed = abs(sum(a * b for a, b in zip(u, y))) * (1.0 - _TIE)
+            counts[k] = sum(1 for perm in order if abs(sum(u[j] * y[p] for j, p in enumerate(perm))) >= observed)
+    out = [float("nan")] * len(units)
+    for k, i in enumerate(live):
+        out[i] = (1 + counts[k]) / (1 + permutations)
+    return out
+
+
+def bh_qvalues(pvalues: list[float]) -> list[float]:
+    """Benjamini-Hochberg q-values; NaN p-values stay NaN and are not counted as tests."""
+    tested = sorted((p, i) for i, p in enumerate(pvalues) if not math.isnan(p))
+    m = len(tested)
+    out = [float("nan")] * len(pvalues)
+    running = 1.0
+    for rank in range(m, 0, -1):
+        p, i = tested[rank - 1]
+        running = min(running, p * m / rank)
+        out[i] = running
+    return out
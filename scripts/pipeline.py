@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""Rebuild the derived Conham data, re-running only the steps whose inputs changed.
+
+The offline analysis is a chain of scripts whose outputs feed each other: the
+daily CSO aggregates feed the 2025 timeseries, the three model fits feed the
+model comparison, and so on. ``STEPS`` declares each script invocation with
+the files under ``docs/data`` it reads and writes. The DAG comes from matching
+one step's outputs to another's inputs.
+
+A step is re-run when any of these is true:
+
+- the SHA-256 of one of its inputs differs from the last successful run;
+- the source of its script, or of a sibling module it imports, has changed;
+- an output is missing or no longer matches what the step last wrote.
+
+Hashes are taken just before a step would run, so a step whose upstream
+re-ran but wrote byte-identical outputs (the scripts are deterministic) is
+skipped too. Steps whose producers have finished run in parallel, each in its
+own process (``--jobs``), so the three model fits go side by side. State lives
+in ``.cache/pipeline_state.json`` (not committed). Deleting that file forces a
+full rebuild.
+
+    python scripts/pipeline.py                  # bring everything up to date
+    python scripts/pipeline.py --dry-run        # list the stale steps, run nothing
+    python scripts/pipeline.py --force compare  # re-run one step (and whatever it changes)
+    python scripts/pipeline.py --fetch          # include the network steps
+
+Network steps (``--fetch``) query live services. Without the flag, their
+outputs are treated as committed source files. Standard library only.
+"""
+from __future__ import annotations
+
+import argparse
+import ast
+import json
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from model_artifact import file_sha256
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPTS = ROOT / "scripts"
+STATE_JSON = ".cache/pipeline_state.json"
+
+DATA = "docs/data"
+MODELS = f"{DATA}/models"
+SAMPLES = f"{DATA}/conham_sampling_2025_2026_e_coli.csv"
+CSO_FEATURES = f"{DATA}/conham_cso_ecoli_features.csv"
+WEATHER = f"{DATA}/conham_weather_daily.csv"
+
+
+@dataclass(frozen=True)
+class Step:
+    """One script invocation: ``argv`` is run from the repository root."""
+
+    name: str
+    argv: tuple[str, ...]
+    inputs: tuple[str, ...]
+    outputs: tuple[str, ...]
+    network: bool = False
+
+    @property
+    def script(self) -> str:
+        return self.argv[0]
+
+
+STEPS: tuple[Step, ...] = (
+    Step("cso_daily", ("scripts/daily_cso.py", "build"),
+         (f"{DATA}/conham_cso_events_2025.csv",),
+         (f"{DATA}/conham_cso_daily.csv",)),
+    Step("nearby_daily", ("scripts/investigate_nearby_csos.py", "daily"),
+         (f"{DATA}/conham_nearby_cso_events.csv",),
+         (f"{DATA}/conham_cso_nearby_daily.csv",)),
+    Step("rainfall_intensity", ("scripts/rainfall_intensity.py", "fetch", "--batch"),
+         (SAMPLES,),
+         (f"{DATA}/rainfall_intensity_by_site.csv", f"{DATA}/rainfall_intensity_daily_max.csv"),
+         network=True),
+    Step("weather", ("scripts/weather_conham_ecoli.py", "analyze"),
+         (SAMPLES, WEATHER, f"{DATA}/conham_upstream_weather_daily.csv", CSO_FEATURES),
+         (f"{DATA}/conham_weather_ecoli_predictions.csv", f"{DATA}/conham_weather_ecoli_analysis.md",
+          f"{MODELS}/conham_weather.json")),
+    Step("band_model", ("scripts/model_conham_ecoli.py",),
+         (CSO_FEATURES,),
+         (f"{DATA}/conham_ecoli_model_predictions.csv", f"{DATA}/conham_ecoli_model.md",
+          f"{MODELS}/conham_band.json")),
+    Step("site_model", ("scripts/model_conham_ecoli_by_site.py", "model"),
+         (f"{DATA}/conham_cso_site_features.csv", SAMPLES),
+         (f"{DATA}/conham_ecoli_site_model_predictions.csv", f"{DATA}/conham_ecoli_site_model.md",
+          f"{MODELS}/conham_by_site.json")),
+    Step("compare", ("scripts/compare_conham_models.py",),
+         (f"{DATA}/conham_ecoli_model_predictions.csv", f"{DATA}/conham_ecoli_site_model_predictions.csv",
+          f"{DATA}/conham_weather_ecoli_predictions.csv"),
+         (f"{DATA}/conham_ecoli_model_comparison.csv", f"{DATA}/conham_ecoli_model_comparison.md")),
+    Step("timeseries", ("scripts/build_2025_timeseries.py",),
+         (WEATHER, CSO_FEATURES, f"{DATA}/conham_sampling_2025_2026.csv", f"{DATA}/conham_cso_daily.csv",
+          f"{DATA}/conham_cso_nearby_daily.csv", f"{DATA}/rainfall_intensity_daily_max.csv"),
+         (f"{DATA}/conham_2025_timeseries.csv",)),
+)
+
+
+# --------------------------------------------------------------------------- #
+# Graph
+# --------------------------------------------------------------------------- #
+def check_graph(steps: tuple[Step, ...]) -> dict[str, set[str]]:
+    """Each step's upstream step names; SystemExit on a duplicate output or a cycle."""
+    producer: dict[str, str] = {}
+    for step in steps:
+        for path in step.outputs:
+            if path in producer:
+                raise SystemExit(f"{path} is written by both {producer[path]} and {step.name}")
+            producer[path] = step.name
+    upstream = {step.name: {producer[p] for p in step.inputs if p in producer} - {step.name} for step in steps}
+    done: set[str] = set()
+    pending = dict(upstream)
+    while pending:
+        ready = [name for name, deps in pending.items() if deps <= done]
+        if not ready:
+            raise SystemExit(f"Pipeline has a cycle among: {', '.join(sorted(pending))}")
+        for name in ready:
+            done.add(name)
+            del pending[name]
+    return upstream
+
+
+def downstream_of(names: set[str], upstream: dict[str, set[str]]) -> set[str]:
+    """``names`` plus every step that (transitively) reads their outputs."""
+    out = set(names)
+    grew = True
+    while grew:
+        grew = False
+        for name, deps in upstream.items():
+            if name not in out and deps & out:
+                out.add(name)
+                grew = True
+    return out
+
+
+# --------------------------------------------------------------------------- #
+# Fingerprints
+# --------------------------------------------------------------------------- #
+def script_modules(script: str) -> list[str]:
+    """The script plus every sibling module it imports, transitively (repo-relative paths)."""
+    seen: list[str] = []
+    queue = [ROOT / script]
+    while queue:
+        path = queue.pop()
+        relative = path.relative_to(ROOT).as_posix()
+        if relative in seen:
+            continue
+        seen.append(relative)
+        tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names = [node.module]
+            elif isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            else:
+                continue
+            for name in names:
+                sibling = SCRIPTS / f"{name.split('.')[0]}.py"
+                if sibling.exists():
+                    queue.append(sibling)
+    return sorted(seen)
+
+
+def fingerprint(paths) -> dict[str, str | None]:
+    """SHA-256 of each path, None where the file does not exist."""
+    return {p: file_sha256(ROOT / p) if (ROOT / p).exists() else None for p in paths}
+
+
+def stale_reason(step: Step, record: dict | None) -> tuple[str | None, dict]:
+    """Why ``step`` has to run (None if it is up to date) and the input fingerprint to record."""
+    inputs = fingerprint(list(step.inputs) + script_modules(step.script))
+    if record is None:
+        return "never run", inputs
+    if record.get("argv") != list(step.argv):
+        return "command changed", inputs
+    changed = sorted(p for p, digest in inputs.items() if record["inputs"].get(p, "") != digest)
+    if changed:
+        return f"changed: {', '.join(changed)}", inputs
+    outputs = fingerprint(step.outputs)
+    if any(digest is None for digest in outputs.values()):
+        return "output missing", inputs
+    if outputs != record["outputs"]:
+        return "output edited since last run", inputs
+    return None, inputs
+
+
+def load_state(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        print(f"Ignoring unreadable {path}; everything will re-run")
+        return {}
+
+
+def save_state(path: Path, state: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(state, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+# --------------------------------------------------------------------------- #
+# Running
+# --------------------------------------------------------------------------- #
+@dataclass
+class Outcome:
+    step: Step
+    returncode: int
+    seconds: float
+    output: str = field(repr=False, default="")
+
+
+def run_step(step: Step) -> Outcome:
+    started = time.perf_counter()
+    proc = subprocess.run([sys.executable, *step.argv], cwd=ROOT, capture_output=True, text=True)
+    return Outcome(step, proc.returncode, time.perf_counter() - started, proc.stdout + proc.stderr)
+
+
+def run_pipeline(args) -> int:
+    steps = STEPS if args.fetch else tuple(s for s in STEPS if not s.network)
+    by_name = {s.name: s for s in steps}
+    forced = set(by_name) if args.force == [] else set(args.force or ())
+    unknown = sorted(forced - set(by_name))
+    if unknown:
+        raise SystemExit(f"Unknown step(s): {', '.join(unknown)} (choose from {', '.join(by_name)})")
+    upstream = check_graph(steps)
+    state_path = ROOT / args.state
+    state = load_state(state_path)
+
+    if args.dry_run:
+        # Only the direct reasons are knowable without running anything: a step
+        # downstream of a stale one may or may not end up with changed inputs.
+        stale = {}
+        for step in steps:
+            reason = "forced" if step.name in forced else stale_reason(step, state.get(step.name))[0]
+            if reason:
+                stale[step.name] = reason
+        maybe = downstream_of(set(stale), upstream) - set(stale)
+        for step in steps:
+            if step.name in stale:
+                print(f"  run    {step.name:<20} {stale[step.name]}")
+            elif step.name in maybe:
+                print(f"  maybe  {step.name:<20} if its upstream output changes")
+            else:
+                print(f"  fresh  {step.name}")
+        return 0
+
+    pending = {s.name for s in steps}
+    finished: set[str] = set()
+    failed: set[str] = set()
+    ran = skipped = 0
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(args.jobs, 1)) as pool:
+        running = {}
+        while pending or running:
+            for name in sorted(pending):
+                if not upstream[name] <= finished | failed:
+                    continue
+                pending.discard(name)
+                step = by_name[name]
+                if upstream[name] & failed:
+                    failed.add(name)
+                    print(f"  blocked  {name} (upstream failed)")
+                    continue
+                reason, inputs = stale_reason(step, state.get(name))
+                if name in forced:
+                    reason = "forced"
+                if reason is None:
+                    finished.add(name)
+                    skipped += 1
+                    print(f"  fresh    {name}")
+                    continue
+                print(f"  run      {name}: {reason}")
+                running[pool.submit(run_step, step)] = inputs
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                inputs = running.pop(future)
+                outcome = future.result()
+                name = outcome.step.name
+                ran += 1
+                if outcome.returncode:
+                    failed.add(name)
+                    state.pop(name, None)
+                    print(f"  FAILED   {name} (exit {outcome.returncode}, {outcome.seconds:.1f} s)")
+                    print("\n".join(f"    | {line}" for line in outcome.output.rstrip().splitlines()))
+                else:
+                    finished.add(name)
+                    state[name] = {"argv": list(outcome.step.argv), "inputs": inputs,
+                                   "outputs": fingerprint(outcome.step.outputs)}
+                    print(f"  done     {name} ({outcome.seconds:.1f} s)")
+                    if args.verbose:
+                        print("\n".join(f"    | {line}" for line in outcome.output.rstrip().splitlines()))
+                save_state(state_path, state)
+
+    print(f"{ran} step(s) run, {skipped} up to date, {len(failed)} failed "
+          f"in {time.perf_counter() - started:.1f} s")
+    return 1 if failed else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--force", nargs="*", metavar="STEP",
+                        help="Re-run the named steps even if up to date (every step if none are named)")
+    parser.add_argument("--dry-run", action="store_true", help="Report what is stale without running it")
+    parser.add_argument("--fetch", action="store_true", help="Include the steps that need network access")
+    parser.add_argument("--jobs", type=int, default=3, help="Steps run at once (each in its own process)")
+    parser.add_argument("--state", default=STATE_JSON, help="Fingerprints of the last successful runs")
+    parser.add_argument("--list", action="store_true", help="List the steps with their inputs and outputs")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Echo each step's output")
+    return parser
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    if args.list:
+        for step in STEPS:
+            print(f"{step.name}{' (network, --fetch)' if step.network else ''}: {' '.join(step.argv)}")
+            for path in step.inputs:
+                print(f"    <- {path}")
+            for path in step.outputs:
+                print(f"    -> {path}")
+        return 0
+    return run_pipeline(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""Gridded hourly rainfall over the Bristol Avon catchment, interpolated locally.
+
+``rainfall_intensity.SITES`` is a hand-picked list of 31 points and
+``weather_conham_ecoli.py`` fetches Conham and Bath separately, so every new
+point (an outfall, a sub-catchment) costs another API round-trip. This script
+instead ingests one regular lat/lon grid of hourly precipitation covering the
+catchment into a compact array store, then answers "how much rain fell *here*"
+for any point or polygon from that store with no further requests:
+
+- points (sites, outfalls, anything with a lat/lon) -- **bilinear**
+  interpolation between the four surrounding grid nodes;
+- polygons (a sub-catchment outline, as GeoJSON) -- **area-weighted** mean of
+  the grid cells the polygon covers, each cell weighted by the fraction of it
+  inside the polygon (estimated on a sub-cell lattice) times its true area.
+
+Grid nodes are requested with Open-Meteo's multi-coordinate archive calls
+(``rainfall_intensity._request_hourly_multi``), ``--chunk`` nodes per request,
+so a 0.1-degree grid over the catchment (~60 nodes) is a handful of requests
+however many points are later sampled. The store is
+``.cache/rain_grid.npz`` (not committed): ``lats``, ``lons``, ``hours``
+(UTC epoch hours) and ``precip`` as float32 ``(hour x lat x lon)``.
+
+    python scripts/rain_grid.py fetch --start 2025-05-01 --end 2025-12-31   # needs network
+    python scripts/rain_grid.py sample                      # rainfall at the catchment SITES (offline)
+    python scripts/rain_grid.py sample --outfalls           # ... at every CSO outfall in the spill cube
+    python scripts/rain_grid.py sample --polygons subcatchments.geojson
+
+``sample`` writes a tidy daily table (UTC days): ``date, name, lat, lon,
+rain_total_mm, rain_max_mm_per_h``. Caveat: interpolating ERA5 does not add
+detail the reanalysis doesn't have -- it just spreads one consistent field to
+arbitrary locations instead of snapping each point to its own grid cell.
+
+Needs NumPy.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import urllib.error
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from rainfall_intensity import ARCHIVE_URL, SITES, _request_hourly_multi
+
+GRID_NPZ = ".cache/rain_grid.npz"
+OUTPUT_CSV = "docs/data/rain_grid_daily.csv"
+OUTFALLS_CSV = ".cache/spill_cube/outfalls.csv"
+# Catchment bounding box: a margin around the rainfall_intensity SITES.
+BBOX = {"min_lat": 51.20, "max_lat": 51.70, "min_lon": -2.80, "max_lon": -1.90}
+DEFAULT_STEP = 0.1
+DEFAULT_CHUNK = 50
+SUBCELL = 8  # sub-cell lattice per side when estimating polygon coverage
+
+
+# --------------------------------------------------------------------------- #
+# Ingest
+# --------------------------------------------------------------------------- #
+def grid_axes(bbox: dict[str, float], step: float) -> tuple[np.ndarray, np.ndarray]:
+    lats = np.round(np.arange(bbox["min_lat"], bbox["max_lat"] + step / 2, step), 4)
+    lons = np.round(np.arange(bbox["min_lon"], bbox["max_lon"] + step / 2, step), 4)
+    return lats, lons
+
+
+def fetch_grid(start: date, end: date, lats: np.ndarray, lons: np.ndarray, chunk: int, model: str | None) -> dict[str, np.ndarray]:
+    nodes = [(float(lat), float(lon)) for lat in lats for lon in lons]
+    series: list[list[float | None]] = []
+    times: list[str] = []
+    for i in range(0, len(nodes), chunk):
+        batch = nodes[i:i + chunk]
+        params = {
+            "latitude": ",".join(f"{lat}" for lat, _ in batch),
+            "longitude": ",".join(f"{lon}" for _, lon in batch),
+            "start_date": start.isoformat(),
+            "end_date": end.isoformat(),
+            "hourly": "precipitation",
+            "timezone": "GMT",
+        }
+        if model:
+            params["models"] = model
+        for block in _request_hourly_multi(ARCHIVE_URL, params, len(batch)):
+            times = times or block.get("time", [])
+            series.append(block.get("precipitation", [None] * len(times)))
+        print(f"  nodes {i + 1}-{i + len(batch)} of {len(nodes)}")
+    precip = np.array([[np.nan if v is None else v for v in s] for s in series], dtype=np.float32)
+    hours = np.array(
+        [int(datetime.fromisoformat(t).replace(tzinfo=timezone.utc).timestamp()) // 3600 for t in times],
+        dtype=np.int64,
+    )
+    return {
+        "lats": lats,
+        "lons": lons,
+        "hours": hours,
+        "precip": precip.T.reshape(len(hours), len(lats), len(lons)),
+    }
+
+
+# --------------------------------------------------------------------------- #
+# Interpolation
+# --------------------------------------------------------------------------- #
+def weighted_mean(values: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Per hour, the ``weights``-weighted mean of ``values`` (hour x node) over its non-NaN nodes.
+
+    Weights are renormalised over the valid nodes, so one missing node does
+    not blank the hour; an hour with no valid weighted node is NaN.
+    """
+    valid = ~np.isnan(values)
+    total = valid @ weights
+    sums = np.where(valid, values, 0.0) @ weights
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(total > 0, sums / total, np.nan)
+
+
+class RainGrid:
+    """Hourly precipitation on a regular grid; point and polygon sampling."""
+
+    def __init__(self, path: Path | str = GRID_NPZ):
+        path = Path(path)
+        if not path.exists():
+            raise SystemExit(f"{path} not found. Run `python scripts/rain_grid.py fetch` first (needs network).")
+        with np.load(path) as data:
+            self.lats, self.lons = data["lats"], data["lons"]
+            self.hours, self.precip = data["hours"], data["precip"]
+
+    def bilinear_weights(self, lat: float, lon: float) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(lat indices, lon indices, weights) of the 4 nodes around a point.
+
+        Points outside the grid are clamped to its edge.
+        """
+        def axis(values: np.ndarray, x: float) -> tuple[int, float]:
+            i = int(np.clip(np.searchsorted(values, x) - 1, 0, len(values) - 2))
+            frac = float(np.clip((x - values[i]) / (values[i + 1] - values[i]), 0.0, 1.0))
+            return i, frac
+
+        i, fy = axis(self.lats, lat)
+        j, fx = axis(self.lons, lon)
+        rows = np.array([i, i, i + 1, i + 1])
+        cols = np.array([j, j + 1, j, j + 1])
+        weights = np.array([(1 - fy) * (1 - fx), (1 - fy) * fx, fy * (1 - fx), fy * fx])
+        return rows, cols, weights
+
+    def point_series(self, lat: float, lon: float) -> np.ndarray:
+        rows, cols, weights = self.bilinear_weights(lat, lon)
+        return weighted_mean(self.precip[:, rows, cols], weights)
+
+    def polygon_weights(self, ring: list[tuple[float, float]]) -> np.ndarray:
+        """(lat x lon) weights: cell area x fraction of the cell inside ``ring``.
+
+        ``ring`` is [(lat, lon), ...]. Coverage is estimated by testing a
+        ``SUBCELL x SUBCELL`` lattice of points in each cell.
+        """
+        dlat, dlon = self.lats[1] - self.lats[0], self.lons[1] - self.lons[0]
+        offsets = (np.arange(SUBCELL) + 0.5) / SUBCELL - 0.5
+        sub_lat = (self.lats[:, None] + offsets[None, :] * dlat).ravel()
+        sub_lon = (self.lons[:, None] + offsets[None, :] * dlon).ravel()
+        lat_pts, lon_pts = np.meshgrid(sub_lat, sub_lon, indexing="ij")
+        inside = points_in_polygon(lat_pts.ravel(), lon_pts.ravel(), ring).reshape(lat_pts.shape)
+        coverage = inside.reshape(len(self.lats), SUBCELL, len(self.lons), SUBCELL).mean(axis=(1, 3))
+        return coverage * np.cos(np.radians(self.lats))[:, None]
+
+    def polygon_series(self, ring: list[tuple[float, float]]) -> np.ndarray:
+        weights = self.polygon_weights(ring)
+        return weighted_mean(self.precip.reshape(len(self.hours), -1), weights.ravel())
+
+    def daily(self, series: np.ndarray) -> list[tuple[str, float, float]]:
+        """[(UTC date, total mm, max mm/h), ...] for an hourly series on this grid's hours."""
+        days = self.hours // 24
+        out = []
+        for day in np.unique(days):
+            values = series[days == day]
+            iso = datetime.fromtimestamp(int(day) * 86400, tz=timezone.utc).date().isoformat()
+            out.append((iso, round(float(np.nansum(values)), 2), round(float(np.nanmax(values)), 2)))
+        return out
+
+
+def points_in_polygon(lat: np.ndarray, lon: np.ndarray, ring: list[tuple[float, float]]) -> np.ndarray:
+    """Vectorised even-odd ray casting."""
+    inside = np.zeros(lat.shape, dtype=bool)
+    n = len(ring)
+    for k in range(n):
+        (y1, x1), (y2, x2) = ring[k], ring[(k + 1) % n]
+        if y1 == y2:
+            continue
+        crosses = (y1 > lat) != (y2 > lat)
+        x_at = x1 + (lat - y1) * (x2 - x1) / (y2 - y1)
+        inside ^= crosses & (lon < x_at)
+    return inside
+
+
+# --------------------------------------------------------------------------- #
+# CLI
+# --------------------------------------------------------------------------- #
+def load_points(args) -> list[tuple[str, float, float]]:
+    if args.points:
+        with Path(args.points).open(newline="", encoding="utf-8") as handle:
+            return [(r["name"], float(r["lat"]), float(r["lon"])) for r in csv.DictReader(handle)]
+    if args.outfalls:
+        path = Path(OUTFALLS_CSV)
+        if not path.exists():
+            raise SystemExit(f"{path} not found. Run `python scripts/spill_cube.py build` first.")
+        with path.open(newline="", encoding="utf-8") as handle:
+            return [
+                (r["site_name"] or r["site_id"], float(r["outfall_lat"]), float(r["outfall_lon"]))
+                for r in csv.DictReader(handle) if r["outfall_lat"]
+            ]
+    return list(SITES)
+
+
+def load_polygons(path: Path) -> list[tuple[str, list[tuple[float, float]]]]:
+    """GeoJSON Polygon features -> [(name, outer ring as (lat, lon)), ...]."""
+    data = json.loads(path.read_text(encoding="utf-8"))
+    features = data["features"] if data.get("type") == "FeatureCollection" else [data]
+    polygons = []
+    for i, feature in enumerate(features):
+        geometry = feature.get("geometry", feature)
+        if geometry.get("type") != "Polygon":
+            continue
+        name = (feature.get("properties") or {}).get("name", f"polygon_{i}")
+        polygons.append((name, [(lat, lon) for lon, lat in geometry["coordinates"][0]]))
+    return polygons
+
+
+def run_fetch(args) -> int:
+    start, end = date.fromisoformat(args.start), date.fromisoformat(args.end)
+    lats, lons = grid_axes(BBOX, args.step)
+    print(f"Fetching a {len(lats)} x {len(lons)} grid ({args.step:g} deg) of hourly precipitation, {start}..{end}")
+    try:
+        grid = fetch_grid(start, end, lats, lons, args.chunk, args.model)
+    except urllib.error.URLError as exc:
+        raise SystemExit(
+            f"Could not reach Open-Meteo ({ARCHIVE_URL}): {exc}.\n"
+            "Run `fetch` where archive-api.open-meteo.com egress is allowed."
+        )
+    out = Path(args.grid)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(out, **grid)
+    print(f"Wrote {out} ({grid['precip'].shape[0]} hours x {len(lats)} x {len(lons)} nodes)")
+    return 0
+
+
+def run_sample(args) -> int:
+    grid = RainGrid(args.grid)
+    targets: list[tuple[str, float | str, float | str, np.ndarray]] = []
+    if args.polygons:
+        for name, ring in load_polygons(Path(args.polygons)):
+            lat = sum(p[0] for p in ring) / len(ring)
+            lon = sum(p[1] for p in ring) / len(ring)
+            targets.append((name, round(lat, 4), round(lon, 4), grid.polygon_series(ring)))
+    else:
+        for name, lat, lon in load_points(args):
+            targets.append((name, lat, lon, grid.point_series(lat, lon)))
+    out = Path(args.output)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with out.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["date", "name", "lat", "lon", "rain_total_mm", "rain_max_mm_per_h"])
+        for name, lat, lon, series in targets:
+            for day, total, peak in grid.daily(series):
+                writer.writerow([day, name, lat, lon, total, peak])
+    print(f"Wrote {out} ({len(targets)} {'polygons' if args.polygons else 'points'} from the grid, no requests)")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command")
+
+    f = sub.add_parser("fetch", help="Ingest a catchment grid of hourly precipitation (needs network)")
+    f.add_argument("--start", required=True, help="ISO date")
+    f.add_argument("--end", required=True, help="ISO date")
+    f.add_argument("--step", type=float, default=DEFAULT_STEP, help="Grid spacing in degrees")
+    f.add_argument("--chunk", type=int, default=DEFAULT_CHUNK, help="Grid nodes per multi-coordinate request")
+    f.add_argument("--model", help='Open-Meteo archive model, e.g. "era5_land" (default: API best match)')
+    f.add_argument("--grid", default=GRID_NPZ)
+    f.set_defaults(func=run_fetch)
+
+    s = sub.add_parser("sample", help="Interpolate daily rainfall to points or polygons (offline)")
+    s.add_argument("--grid", default=GRID_NPZ)
+    s.add_argument("--output", default=OUTPUT_CSV)
+    s.add_argument("--points", help="CSV with name,lat,lon columns (default: rainfall_intensity SITES)")
+    s.add_argument("--outfalls", action="store_true", help="Every outfall in the spill cube's outfalls.csv")
+    s.add_argument("--polygons", help="GeoJSON of Polygon features (area-weighted)")
+    s.set_defaults(func=run_sample)
+
+    return parser
+
+
+def main() -> int:
+    parser = build_parser()
+    args = parser.parse_args()
+    if not getattr(args, "command", None):
+        parser.print_help()
+        return 1
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""Memory-mapped cumulative spill cube: any CSO window in two array reads.
+
+Every CSO feature builder re-derives windowed spill sums from raw events:
+``analyze_conham_cso_ecoli.summarise_window`` (7 lookbacks per sample, one
+ArcGIS query each), ``model_conham_ecoli_by_site.fetch_site_features`` and, via
+the feature CSV, the CSO term in ``weather_conham_ecoli.py``. This script
+builds that arithmetic once, offline, from the committed raw events
+(``conham_cso_events_2025.csv`` from ``daily_cso.py fetch``):
+
+- ``hours.npy``  -- float64 ``(outfall x hour+1)`` cumulative spill hours
+  (float32 would leave ~0.002 h of noise in a year-long running sum);
+- ``counts.npy`` -- float32 ``(outfall x hour+1)`` cumulative event counts;
+- ``outfalls.csv`` -- every known outfall (id, name, watercourse, lat/lon,
+  miles from Conham) and the cube row it maps to;
+- ``meta.json`` -- the hour origin, cube shape and a hash of the source events.
+
+Column 0 is all zeros, so the spill in ``[start, end)`` for every outfall is
+``hours[:, end] - hours[:, start]`` -- two column reads, whatever the window
+length. Outfall subsets and distance bands are row masks on that difference.
+The cube is opened with ``mmap_mode="r"``, so a query touches only the two
+columns it needs.
+
+Layout is sparse in the outfall dimension: only outfalls with at least one
+event get a cube row. The many outfalls that never spilled in the source (known
+from the coordinate tables) are listed in ``outfalls.csv`` with ``row = -1`` and
+cost no storage -- their windowed sums are implicitly zero.
+
+Conventions match the existing features: an event's full duration is counted
+in the hour it *started* (exactly as ``EventStart >= window start`` filters it),
+windows end at the sample time (midnight by default, so the sample day is
+excluded) and resolution is one hour. The events CSV has no coordinates, so
+lat/lon are joined by ``site_id`` from the per-outfall feature CSV and the
+nearby-events CSV; outfalls with no known coordinates are kept for per-outfall
+queries but, like ``summarise_window``, left out of distance-band summaries.
+
+    python scripts/spill_cube.py build           # events CSV -> .cache/spill_cube/
+    python scripts/spill_cube.py features        # band features for any lookbacks (offline)
+    python scripts/spill_cube.py site-features   # per-outfall features (offline)
+
+``features`` writes the same schema as ``conham_cso_ecoli_features.csv``, so
+its output can be passed straight to ``model_conham_ecoli.py --features`` or
+``weather_conham_ecoli.py analyze --cso``; ``site-features`` matches
+``conham_cso_site_features.csv`` for ``model_conham_ecoli_by_site.py model``.
+
+Needs NumPy.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import hashlib
+import json
+import math
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+
+from analyze_conham_cso_ecoli import BANDS, CONHAM_LAT, CONHAM_LON, haversine, read_samples
+from csv_sidecar import load_table
+
+EVENTS_CSV = "docs/data/conham_cso_events_2025.csv"
+# Tables that carry outfall coordinates keyed by site_id (the events CSV doesn't).
+COORD_SOURCES = ["docs/data/conham_cso_site_features.csv", "docs/data/conham_nearby_cso_events.csv"]
+SAMPLES_CSV = "docs/data/conham_sampling_2025_2026_e_coli.csv"
+CUBE_DIR = ".cache/spill_cube"
+FEATURES_CSV = "docs/data/conham_cso_cube_features.csv"
+SITE_FEATURES_CSV = "docs/data/conham_cso_cube_site_features.csv"
+HOUR_SECONDS = 3600
+
+
+# --------------------------------------------------------------------------- #
+# Build
+# --------------------------------------------------------------------------- #
+def _file_hash(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def load_coordinates(paths: list[Path]) -> dict[str, tuple[float, float]]:
+    """{site_id: (lat, lon)} from any CSV with site_id/outfall_lat/outfall_lon columns."""
+    coords: dict[str, tuple[float, float]] = {}
+    for path in paths:
+        if not path.exists():
+            continue
+        table = load_table(path)
+        if not all(name in table for name in ("site_id", "outfall_lat", "outfall_lon")):
+            continue
+        codes, site_ids = table.categories("site_id")
+        lat, lon = table.floats("outfall_lat"), table.floats("outfall_lon")
+        located = np.flatnonzero(~np.isnan(lat) & ~np.isnan(lon))
+        # First located row of each outfall, in file order.
+        _, first = np.unique(codes[located], return_index=True)
+        for i in sorted(located[first].tolist()):
+            site_id = site_ids[codes[i]]
+            if site_id and site_id not in coords:
+                coords[site_id] = (float(lat[i]), float(lon[i]))
+    return coords
+
+
+def build_cube(events_path: Path, coord_paths: list[Path], out_dir: Path) -> dict:
+    """Write the cumulative hour cubes + outfall table for ``events_path``."""
+    coords = load_coordinates(coord_paths)
+    events = load_table(events_path)
+    if not len(events):
+        raise SystemExit(f"No events in {events_path}")
+
+    # Outfall table: every outfall seen in the events, plus coordinate-only
+    # outfalls (never spilled in this source) which get no cube row. The
+    # site_id labels come sorted, so an event's code is its outfall's row.
+    rows, active = events.categories("site_id")
+    _, first = np.unique(rows, return_index=True)
+    names: dict[str, tuple[str, str]] = dict(zip(active, zip(events["site_name"][first].tolist(),
+                                                             events["receiving_watercourse"][first].tolist())))
+    row_of = {site: i for i, site in enumerate(active)}
+    idle = sorted(set(coords) - set(names))
+
+    starts = events.timestamps("event_start")
+    origin = datetime.fromtimestamp(starts.min(), tz=timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    last = datetime.fromtimestamp(starts.max(), tz=timezone.utc).date() + timedelta(days=1)
+    n_hours = int((datetime.combine(last, dt_time.min, tzinfo=timezone.utc) - origin).total_seconds()) // HOUR_SECONDS
+
+    hour_idx = ((starts - origin.timestamp()) // HOUR_SECONDS).astype(np.int64)
+    rows = rows.astype(np.int64)
+    durations = events.floats("duration_hours")
+
+    hourly = np.zeros((len(active), n_hours + 1))
+    np.add.at(hourly, (rows, hour_idx + 1), durations)
+    hours = np.cumsum(hourly, axis=1)
+    hourly[:] = 0.0
+    np.add.at(hourly, (rows, hour_idx + 1), 1.0)
+    counts = np.cumsum(hourly, axis=1).astype(np.float32)
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    np.save(out_dir / "hours.npy", hours)
+    np.save(out_dir / "counts.npy", counts)
+    with (out_dir / "outfalls.csv").open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["site_id", "site_name", "receiving_watercourse", "outfall_lat", "outfall_lon", "distance_miles", "row"])
+        for site in active + idle:
+            name, watercourse = names.get(site, ("", ""))
+            lat, lon = coords.get(site, ("", ""))
+            distance = round(haversine(CONHAM_LAT, CONHAM_LON, lat, lon), 3) if lat != "" else ""
+            writer.writerow([site, name, watercourse, lat, lon, distance, row_of.get(site, -1)])
+    meta = {
+        "origin": origin.isoformat(),
+        "n_hours": n_hours,
+        "n_active_outfalls": len(active),
+        "n_idle_outfalls": len(idle),
+        "n_events": len(events),
+        "source": str(events_path),
+        "source_sha256": _file_hash(events_path),
+    }
+    (out_dir / "meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    return meta
+
+
+# --------------------------------------------------------------------------- #
+# Query
+# --------------------------------------------------------------------------- #
+class SpillCube:
+    """Read-only view of a built cube; windows cost two column reads.
+
+    ``hours`` / ``counts`` are memory-mapped ``(active outfall x hour+1)``
+    arrays; ``site_ids`` / ``site_names`` / ``watercourses`` / ``lat`` / ``lon``
+    / ``distance_miles`` describe the active rows in order, and ``idle`` lists
+    the outfalls that have no row (never spilled in the source).
+    """
+
+    def __init__(self, cube_dir: Path | str = CUBE_DIR):
+        cube_dir = Path(cube_dir)
+        if not (cube_dir / "meta.json").exists():
+            raise SystemExit(f"No spill cube in {cube_dir}. Run `python scripts/spill_cube.py build` first.")
+        self.meta = json.loads((cube_dir / "meta.json").read_text(encoding="utf-8"))
+        self.origin = datetime.fromisoformat(self.meta["origin"])
+        self.n_hours = int(self.meta["n_hours"])
+        self.hours = np.load(cube_dir / "hours.npy", mmap_mode="r")
+        self.counts = np.load(cube_dir / "counts.npy", mmap_mode="r")
+        active, self.idle = [], []
+        with (cube_dir / "outfalls.csv").open(newline="", encoding="utf-8") as handle:
+            for row in csv.DictReader(handle):
+                (active if int(row["row"]) >= 0 else self.idle).append(row)
+        active.sort(key=lambda r: int(r["row"]))
+        self.site_ids = [r["site_id"] for r in active]
+        self.site_names = [r["site_name"] for r in active]
+        self.watercourses = [r["receiving_watercourse"] for r in active]
+        self.lat = np.array([float(r["outfall_lat"]) if r["outfall_lat"] else np.nan for r in active])
+        self.lon = np.array([float(r["outfall_lon"]) if r["outfall_lon"] else np.nan for r in active])
+        self.distance_miles = np.array([float(r["distance_miles"]) if r["distance_miles"] else np.nan for r in active])
+
+    def hour_index(self, when: datetime) -> int:
+        """Cube column for an instant, rounded up to the next hour boundary and clamped."""
+        offset = math.ceil((when - self.origin).total_seconds() / HOUR_SECONDS)
+        return min(max(offset, 0), self.n_hours)
+
+    def window(self, start: datetime, end: datetime) -> tuple[np.ndarray, np.ndarray]:
+        """(spill hours, event count) per active outfall for events starting in [start, end)."""
+        i, j = self.hour_index(start), self.hour_index(end)
+        return (
+            self.hours[:, j].astype(np.float64) - self.hours[:, i],
+            self.counts[:, j].astype(np.float64) - self.counts[:, i],
+        )
+
+    def windows(self, ends: list[datetime], lookbacks: list[int]) -> tuple[np.ndarray, np.ndarray]:
+        """``window`` for every (end, lookback) pair at once: two (outfall x end x lookback) arrays.
+
+        One gather of the end columns and one of the start columns, however many
+        sites share the ends; ``window(end - lookback, end)`` is one slice.
+        """
+        j = np.array([self.hour_index(end) for end in ends], dtype=np.int64)
+        i = np.array([[self.hour_index(end - timedelta(days=lb)) for lb in lookbacks] for end in ends],
+                     dtype=np.int64).reshape(len(ends), len(lookbacks))
+        return (
+            self.hours[:, j].astype(np.float64)[:, :, None] - self.hours[:, i],
+            self.counts[:, j].astype(np.float64)[:, :, None] - self.counts[:, i],
+        )
+
+    def distances_from(self, lat: float, lon: float) -> np.ndarray:
+        """Haversine miles from (lat, lon) to every active outfall (NaN if unknown)."""
+        phi1, phi2 = math.radians(lat), np.radians(self.lat)
+        dphi = phi2 - phi1
+        dlambda = np.radians(self.lon - lon)
+        a = np.sin(dphi / 2) ** 2 + math.cos(phi1) * np.cos(phi2) * np.sin(dlambda / 2) ** 2
+        return 3958.8 * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+    def band_summary(self, start: datetime, end: datetime, distances: np.ndarray | None = None) -> dict[str, float | int | str]:
+        """``summarise_window``-compatible distance-band summary for [start, end)."""
+        distances = self.distance_miles if distances is None else distances
+        hours, counts = self.window(start, end)
+        located = ~np.isnan(distances)
+        hours, counts, distances = hours[located], counts[located], distances[located]
+        summary: dict[str, float | int | str] = {}
+        for lower, upper, label in BANDS:
+            in_band = (distances > lower) & (distances <= upper)
+            summary[f"spill_hours_{label}"] = round(float(hours[in_band].sum()), 3)
+        event_count = int(round(float(counts.sum())))
+        spilled = counts > 0.5
+        summary["queried_feature_count"] = event_count
+        summary["event_count"] = event_count
+        summary["spill_hours_total"] = round(float(hours.sum()), 3)
+        summary["nearest_spill_miles"] = round(float(distances[spilled].min()), 3) if spilled.any() else ""
+        return summary
+
+
+def band_table(hours: np.ndarray, counts: np.ndarray, distances: np.ndarray,
+               keep: np.ndarray | None = None) -> dict[str, np.ndarray]:
+    """``band_summary`` columns for many windows: ``hours`` / ``counts`` are (outfall x ...).
+
+    ``distances`` are miles from the site (NaN = unknown, left out as in
+    ``band_summary``); ``keep`` optionally masks outfalls further (e.g. to the
+    ones upstream of the site). Each column is an array over the trailing axes;
+    ``nearest_spill_miles`` is NaN where nothing spilled.
+    """
+    located = ~np.isnan(distances)
+    if keep is not None:
+        located &= keep
+    hours, counts, distances = hours[located], counts[located], distances[located]
+    table: dict[str, np.ndarray] = {}
+    for lower, upper, label in BANDS:
+        in_band = (distances > lower) & (distances <= upper)
+        table[f"spill_hours_{label}"] = np.round(hours[in_band].sum(axis=0), 3)
+    table["event_count"] = np.rint(counts.sum(axis=0))
+    table["spill_hours_total"] = np.round(hours.sum(axis=0), 3)
+    shape = (len(distances),) + (1,) * (hours.ndim - 1)
+    nearest = np.where(counts > 0.5, distances.reshape(shape), np.inf).min(axis=0, initial=np.inf)
+    table["nearest_spill_miles"] = np.where(np.isinf(nearest), np.nan, np.round(nearest, 3))
+    return table
+
+
+# --------------------------------------------------------------------------- #
+# Feature tables
+# --------------------------------------------------------------------------- #
+def parse_lookbacks(text: str) -> list[int]:
+    """"1-7" or "1,3,14" -> sorted unique lookback days."""
+    days: set[int] = set()
+    for part in text.split(","):
+        lo, _, hi = part.partition("-")
+        days.update(range(int(lo), int(hi or lo) + 1))
+    return sorted(days)
+
+
+def sample_end(sample_date: date, sample_time: str) -> datetime:
+    return datetime.combine(sample_date, dt_time.fromisoformat(sample_time), tzinfo=timezone.utc)
+
+
+def run_build(args) -> int:
+    events_path = Path(args.events)
+    if not events_path.exists():
+        raise SystemExit(f"{events_path} not found. Run `python scripts/daily_cso.py fetch` first.")
+    meta = build_cube(events_path, [Path(p) for p in args.coords], Path(args.cube))
+    print(
+        f"Wrote {args.cube} ({meta['n_active_outfalls']} spilling outfalls x {meta['n_hours']} hours "
+        f"from {meta['n_events']} events; {meta['n_idle_outfalls']} idle outfalls stored sparsely)"
+    )
+    return 0
+
+
+def run_features(args) -> int:
+    cube = SpillCube(args.cube)
+    samples = read_samples(Path(args.samples))
+    rows = []
+    for sample in samples:
+        end = sample_end(sample["sample_date"], args.sample_time)
+        for lookback in parse_lookbacks(args.lookbacks):
+            summary = cube.band_summary(end - timedelta(days=lookback), end)
+            rows.append({**sample, "lookback_days": lookback, **summary})
+    out = Path(args.output)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with out.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"Wrote {out} ({len(rows)} sample-window rows from the cube)")
+    return 0
+
+
+def run_site_features(args) -> int:
+    cube = SpillCube(args.cube)
+    samples = read_samples(Path(args.samples))
+    rows = []
+    for sample in samples:
+        end = sample_end(sample["sample_date"], args.sample_time)
+        for lookback in parse_lookbacks(args.lookbacks):
+            hours, counts = cube.window(end - timedelta(days=lookback), end)
+            for i in np.flatnonzero(counts > 0.5):
+                rows.append({
+                    "sample_date": sample["sample_date"].isoformat(),
+                    "e_coli_cfu_per_100ml": sample["e_coli_cfu_per_100ml"],
+                    "lookback_days": lookback,
+                    "site_id": cube.site_ids[i],
+                    "site_name": cube.site_names[i],
+                    "receiving_watercourse": cube.watercourses[i],
+                    "outfall_lat": "" if np.isnan(cube.lat[i]) else cube.lat[i],
+                    "outfall_lon": "" if np.isnan(cube.lon[i]) else cube.lon[i],
+                    "distance_miles": "" if np.isnan(cube.distance_miles[i]) else cube.distance_miles[i],
+                    "spill_hours": round(float(hours[i]), 3),
+                    "event_count": int(round(float(counts[i]))),
+                })
+    out = Path(args.output)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with out.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=[
+            "sample_date", "e_coli_cfu_per_100ml", "lookback_days", "site_id", "site_name",
+            "receiving_watercourse", "outfall_lat", "outfall_lon", "distance_miles",
+            "spill_hours", "event_count",
+        ])
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"Wrote {out} ({len(rows)} site-window rows from the cube)")
+    return 0
+
+
+# --------------------------------------------------------------------------- #
+# CLI
+# --------------------------------------------------------------------------- #
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command")
+
+    b = sub.add_parser("build", help="Build the cumulative cube from the committed raw events (offline)")
+    b.add_argument("--events", default=EVENTS_CSV)
+    b.add_argument("--coords", nargs="*", default=COORD_SOURCES, help="CSVs with site_id/outfall_lat/outfall_lon")
+    b.add_argument("--cube", default=CUBE_DIR)
+    b.set_defaults(func=run_build)
+
+    for name, output, func, help_text in (
+        ("features", FEATURES_CSV, run_features, "Distance-band features per sample window (offline)"),
+        ("site-features", SITE_FEATURES_CSV, run_site_features, "Per-outfall features per sample window (offline)"),
+    ):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument("--cube", default=CUBE_DIR)
+        p.add_argument("--samples", default=SAMPLES_CSV)
+        p.add_argument("--output", default=output)
+        p.add_argument("--lookbacks", default="1-7", help='Lookback days, e.g. "1-7" or "1,3,14,30"')
+        p.add_argument("--sample-time", default="00:00", help="UTC time of day each window ends (default midnight)")
+        p.set_defaults(func=func)
+
+    return parser
+
+
+def main() -> int:
+    parser = build_parser()
+    args = parser.parse_args()
+    if not getattr(args, "command", None):
+        parser.print_help()
+        return 1
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
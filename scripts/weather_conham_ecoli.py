@@ -22,6 +22,10 @@ Two steps, like model_conham_ecoli_by_site.py, because the fetch needs network:
     python scripts/weather_conham_ecoli.py fetch     # -> Conham + Bath daily weather CSVs
     python scripts/weather_conham_ecoli.py analyze   # offline correlations + combined model
 
+``fetch --store`` syncs the incremental hourly archive in ``weather_store.py``
+(fetching only days it doesn't hold, plus the provisional trailing days) and
+aggregates the daily CSVs from it instead of asking the daily API.
+
 Method (analyze)
 ----------------
 For each E. coli sample date, weather is summarised over 1- to 7-day lookback
@@ -29,14 +33,26 @@ windows: cumulative rainfall, heaviest single day, mean/min temperature. The
 script then:
 
 1. ranks weather features (local + upstream rainfall, temperature) by univariate
-   correlation with log10(E. coli);
+   correlation with log10(E. coli), with permutation p- and FDR q-values
+   (``permutation.py``);
 2. compares leave-one-out cross-validation (LOOCV) error for rainfall-only
    (local and upstream), the best CSO feature, and combined CSO+weather models,
    to see whether weather adds anything beyond the CSO signal;
 3. reports per-day percentage error and compares local vs upstream rainfall on
    the high-E. coli days the CSO model could not explain.
 
-Standard library only.
+Every model is also scored by rolling origin: each date after the first
+``--rolling-min-train`` is forecast from the dates before it only
+(``ridge.rolling_origin_predictions``, an expanding window with incremental
+normal-equation updates), next to LOOCV on the same dates.
+
+The featured CSO + weather model is refitted on every date, reported with
+bootstrap intervals for its coefficients and fitted values (``--bootstrap``
+resamples) and saved as a model artifact (``--artifact``, see
+``model_artifact.py``).
+
+Standard library (NumPy optional): the lookback windows for every sample date
+are summed at once on ``weather_engine.DailySeries``.
 """
 from __future__ import annotations
 
@@ -51,6 +67,23 @@ from collections import defaultdict
 from datetime import date, timedelta
 from pathlib import Path
 
+from model_artifact import MODELS_DIR, band_feature, feature_entry, write_artifact
+from correlation import correlate
+from permutation import PERMUTATIONS, bh_qvalues, permutation_pvalues
+from ridge import (
+    BOOTSTRAP_DRAWS,
+    BOOTSTRAP_LEVEL,
+    ROLLING_MIN_TRAIN,
+    bootstrap_intervals,
+    loocv_predictions,
+    predict_log,
+    rolling_origin_predictions,
+    solve_ridge,
+    standardise_apply,
+    standardise_fit,
+)
+from weather_engine import DailySeries
+
 ARCHIVE_URL = "https://archive-api.open-meteo.com/v1/archive"
 CONHAM_LAT = 51.444858
 CONHAM_LON = -2.534812
@@ -67,6 +100,7 @@ CSO_FEATURES_CSV = "docs/data/conham_cso_ecoli_features.csv"
 SAMPLES_CSV = "docs/data/conham_sampling_2025_2026_e_coli.csv"
 PREDICTIONS_CSV = "docs/data/conham_weather_ecoli_predictions.csv"
 REPORT_MD = "docs/data/conham_weather_ecoli_analysis.md"
+ARTIFACT_JSON = f"{MODELS_DIR}/conham_weather.json"
 
 # Best single CSO predictor, from conham_ecoli_model.md (band model selection).
 BEST_CSO_LOOKBACK = 7
@@ -134,7 +168,24 @@ def run_fetch(args) -> int:
         ("Conham", CONHAM_LAT, CONHAM_LON, Path(args.weather)),
         ("Bath (upstream)", BATH_LAT, BATH_LON, Path(args.upstream_weather)),
     ]
+    store = None
+    if args.store:
+        from weather_store import WeatherStore
+
+        store = WeatherStore(args.store_dir)
+        try:
+            store.sync([(name, lat, lon) for name, lat, lon, _ in locations], start, end)
+        except urllib.error.URLError as exc:
+            raise SystemExit(
+                f"Could not reach Open-Meteo ({ARCHIVE_URL}): {exc}.\n"
+                "Run `fetch` where archive-api.open-meteo.com egress is allowed."
+            )
     for name, lat, lon, out in locations:
+        if store is not None:
+            rows = store.daily(name, start, end)
+            _write_weather(rows, out)
+            print(f"Wrote {out} ({name}: {len(rows)} days from the local store, {start}..{end})")
+            continue
         try:
             rows = fetch_weather(start, end, lat, lon)
         except urllib.error.URLError as exc:
@@ -166,25 +217,15 @@ def load_weather(path: Path) -> dict[str, dict[str, float]]:
     return daily
 
 
-def weather_features(daily: dict[str, dict[str, float]], sample_date: str, lookback: int) -> dict[str, float]:
-    end = date.fromisoformat(sample_date)
-    window = [end - timedelta(days=k) for k in range(1, lookback + 1)]
-    precip = [daily[d.isoformat()]["precip"] for d in window if d.isoformat() in daily]
-    tmean = [daily[d.isoformat()]["temp_mean"] for d in window if d.isoformat() in daily]
-    if not precip:
-        return {"rain_sum": 0.0, "rain_max": 0.0, "temp_mean": 0.0}
-    return {
-        "rain_sum": sum(precip),
-        "rain_max": max(precip),
-        "temp_mean": sum(tmean) / len(tmean) if tmean else 0.0,
-    }
+def temp_mean(series: DailySeries, sample_dates: list[str], lookback: int) -> list[float]:
+    """Mean temperature over days 1..lookback before each sample (0.0 with no data)."""
+    total, _, count = series.window(sample_dates, lookback, "temp_mean")
+    return [t / c if c else 0.0 for t, c in zip(total, count)]
 
 
-def rain_offset_sum(daily: dict[str, dict[str, float]], sample_date: str, lo: int, hi: int) -> float:
-    """Sum rainfall over days at offsets [lo, hi] before the sample (offset 0 = sample day)."""
-    end = date.fromisoformat(sample_date)
-    days = [(end - timedelta(days=k)).isoformat() for k in range(lo, hi + 1)]
-    return sum(daily[d]["precip"] for d in days if d in daily)
+def rain_offset_sum(series: DailySeries, sample_dates: list[str], lo: int, hi: int) -> list[float]:
+    """Rainfall summed over days at offsets [lo, hi] before each sample (offset 0 = sample day)."""
+    return series.offset_sum("precip", sample_dates, lo, hi)
 
 
 def load_cso_feature(path: Path, lookback: int, column: str) -> dict[str, float]:
@@ -202,68 +243,25 @@ def load_cso_feature(path: Path, lookback: int, column: str) -> dict[str, float]
 # --------------------------------------------------------------------------- #
 # Stats helpers
 # --------------------------------------------------------------------------- #
-def pearson(xs, ys) -> float:
-    if len(xs) < 3 or len(set(xs)) < 2 or len(set(ys)) < 2:
-        return float("nan")
-    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
-    sx = math.sqrt(sum((x - mx) ** 2 for x in xs))
-    sy = math.sqrt(sum((y - my) ** 2 for y in ys))
-    return sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / (sx * sy)
-
-
-def standardise_fit(matrix):
-    if not matrix or not matrix[0]:
-        return []
-    stats = []
-    for j in range(len(matrix[0])):
-        col = [r[j] for r in matrix]
-        m = sum(col) / len(col)
-        s = math.sqrt(sum((v - m) ** 2 for v in col) / len(col))
-        stats.append((m, s))
-    return stats
-
-
-def standardise_apply(matrix, stats):
-    return [[(r[j] - stats[j][0]) / stats[j][1] if stats[j][1] > 0 else 0.0 for j in range(len(stats))] for r in matrix]
-
-
-def solve_ridge(matrix, target, ridge):
-    n = len(matrix)
-    p = len(matrix[0]) if matrix and matrix[0] else 0
-    design = [[1.0] + row for row in matrix]
-    width = p + 1
-    xtx = [[sum(design[k][i] * design[k][j] for k in range(n)) for j in range(width)] for i in range(width)]
-    xty = [sum(design[k][i] * target[k] for k in range(n)) for i in range(width)]
-    for i in range(1, width):
-        xtx[i][i] += ridge
-    aug = [xtx[i] + [xty[i]] for i in range(width)]
-    for col in range(width):
-        pivot = max(range(col, width), key=lambda r: abs(aug[r][col]))
-        aug[col], aug[pivot] = aug[pivot], aug[col]
-        pv = aug[col][col]
-        if abs(pv) < 1e-12:
-            continue
-        for r in range(width):
-            if r == col:
-                continue
-            f = aug[r][col] / pv
-            aug[r] = [aug[r][k] - f * aug[col][k] for k in range(width + 1)]
-    return [aug[i][width] / aug[i][i] if abs(aug[i][i]) > 1e-12 else 0.0 for i in range(width)]
+def loocv(dates, ecoli, feats, names, ridge):
+    """feats[date] -> dict of feature values; names = ordered features to use. LOOCV log preds.
+
+    Closed-form (``ridge.loocv_predictions``), identical to refitting per fold.
+    """
+    matrix = [[feats[d][n] for n in names] for d in dates]
+    target = [math.log10(ecoli[d]) for d in dates]
+    preds = dict(zip(dates, loocv_predictions(matrix, target, ridge)))
+    abs_log = [abs(preds[d] - target[i]) for i, d in enumerate(dates)]
+    return sum(abs_log) / len(abs_log), preds
 
 
-def loocv(dates, ecoli, feats, names, ridge):
-    """feats[date] -> dict of feature values; names = ordered features to use. LOOCV log preds."""
-    preds = {}
-    abs_log = []
-    for test in dates:
-        train = [d for d in dates if d != test]
-        matrix = [[feats[d][n] for n in names] for d in train]
-        stats = standardise_fit(matrix) if names else []
-        std = standardise_apply(matrix, stats) if names else [[] for _ in train]
-        beta = solve_ridge(std, [math.log10(ecoli[d]) for d in train], ridge)
-        trow = standardise_apply([[feats[test][n] for n in names]], stats)[0] if names else []
-        preds[test] = beta[0] + sum(beta[1 + j] * trow[j] for j in range(len(names)))
-        abs_log.append(abs(preds[test] - math.log10(ecoli[test])))
+def rolling(dates, ecoli, feats, names, ridge, min_train=ROLLING_MIN_TRAIN):
+    """Like ``loocv``, but each date after ``min_train`` is forecast from earlier dates only."""
+    matrix = [[feats[d][n] for n in names] for d in dates]
+    target = [math.log10(ecoli[d]) for d in dates]
+    preds = {d: p for d, p in zip(dates, rolling_origin_predictions(matrix, target, ridge, None, min_train))
+             if not math.isnan(p)}
+    abs_log = [abs(preds[d] - t) for d, t in zip(dates, target) if d in preds]
     return sum(abs_log) / len(abs_log), preds
 
 
@@ -279,9 +277,9 @@ def run_analyze(args) -> int:
         )
     ecoli = read_samples(Path(args.samples))
     dates = sorted(ecoli)
-    daily = load_weather(weather_path)
+    daily = DailySeries(load_weather(weather_path))
     upstream_path = Path(args.upstream_weather)
-    upstream = load_weather(upstream_path) if upstream_path.exists() else None
+    upstream = DailySeries(load_weather(upstream_path)) if upstream_path.exists() else None
     y = [math.log10(ecoli[d]) for d in dates]
 
     # 1. Univariate correlations. Antecedent windows (days 1..L before the
@@ -295,23 +293,30 @@ def run_analyze(args) -> int:
     # Rainfall feature specs: (name, display window, lo, hi).
     rain_specs = [(f"rain_{L}d", f"1-{L}d" if L > 1 else "1d", 1, L) for L in range(1, MAX_LOOKBACK + 1)]
     rain_specs += [("rain_same_day", "same-day", 0, 0), ("rain_lag_2_4d", "2-4d lag", 2, 4)]
-    corr_rows = []
+    corr_rows, columns = [], []
     for prefix, source in sources:
         for name, window, lo, hi in rain_specs:
-            xs = [math.log1p(rain_offset_sum(source, d, lo, hi)) for d in dates]
-            corr_rows.append({"window": window, "feature": prefix + name, "spec": (lo, hi), "r": pearson(xs, y)})
+            xs = [math.log1p(v) for v in rain_offset_sum(source, dates, lo, hi)]
+            columns.append(xs)
+            corr_rows.append({"window": window, "feature": prefix + name, "spec": (lo, hi)})
     for lookback in range(1, MAX_LOOKBACK + 1):  # temperature (local only)
-        xs = [weather_features(daily, d, lookback)["temp_mean"] for d in dates]
-        corr_rows.append({"window": f"1-{lookback}d" if lookback > 1 else "1d", "feature": "temp_mean", "spec": None, "r": pearson(xs, y)})
+        columns.append(temp_mean(daily, dates, lookback))
+        corr_rows.append({"window": f"1-{lookback}d" if lookback > 1 else "1d", "feature": "temp_mean", "spec": None})
+    corr = correlate(columns, y)
+    p_values = permutation_pvalues(columns, y, args.permutations)
+    rho_p_values = permutation_pvalues(columns, y, args.permutations, rank=True)
+    for row, r, p_value, q_value, rho, rho_p in zip(corr_rows, corr["pearson_r"], p_values, bh_qvalues(p_values),
+                                                  corr["spearman_rho"], rho_p_values):
+        row["r"], row["p"], row["q"], row["rho"], row["rho_p"] = r, p_value, q_value, rho, rho_p
     corr_rows.sort(key=lambda r: -(abs(r["r"]) if not math.isnan(r["r"]) else -1))
 
     def best_of(feature_names):
         cands = [r for r in corr_rows if r["feature"] in feature_names]
         return max(cands, key=lambda r: abs(r["r"]) if not math.isnan(r["r"]) else -1)
 
-    def rain_value(d, prefix, spec):
+    def rain_values(prefix, spec):
         src = upstream if prefix == "up_" else daily
-        return math.log1p(rain_offset_sum(src, d, spec[0], spec[1]))
+        return dict(zip(dates, (math.log1p(v) for v in rain_offset_sum(src, dates, spec[0], spec[1]))))
 
     # 2. Build the per-date feature table. For each timing concept pick whichever
     #    of local/upstream correlates better.
@@ -326,13 +331,17 @@ def run_analyze(args) -> int:
     def prefix_of(feature_name):
         return "up_" if feature_name.startswith("up_") else ""
 
+    rain_window = rain_values(prefix_of(window_best["feature"]), window_best["spec"])
+    rain_sd = rain_values(prefix_of(sd_best["feature"]), sd_best["spec"])
+    rain_lag = rain_values(prefix_of(lag_best["feature"]), lag_best["spec"])
+    temp = dict(zip(dates, temp_mean(daily, dates, 2)))
     feats = {}
     for d in dates:
         feats[d] = {
-            "rain_window": rain_value(d, prefix_of(window_best["feature"]), window_best["spec"]),
-            "rain_sd": rain_value(d, prefix_of(sd_best["feature"]), sd_best["spec"]),
-            "rain_lag": rain_value(d, prefix_of(lag_best["feature"]), lag_best["spec"]),
-            "temp_mean": weather_features(daily, d, 2)["temp_mean"],
+            "rain_window": rain_window[d],
+            "rain_sd": rain_sd[d],
+            "rain_lag": rain_lag[d],
+            "temp_mean": temp[d],
             "cso": math.log1p(cso.get(d, 0.0)),
         }
 
@@ -355,18 +364,30 @@ def run_analyze(args) -> int:
     for name, names in models.items():
         mae, preds = loocv(dates, ecoli, feats, names, args.ridge)
         model_results[name] = (mae, names, preds)
+    # Rolling origin on the same models: (LOOCV MAE_log on the forecast dates, rolling MAE_log, forecasts).
+    rolling_results = {}
+    if 0 < args.rolling_min_train < len(dates):
+        for name, names in models.items():
+            mae, preds = rolling(dates, ecoli, feats, names, args.ridge, args.rolling_min_train)
+            loo = model_results[name][2]
+            loo_mae = sum(abs(loo[d] - math.log10(ecoli[d])) for d in preds) / len(preds)
+            rolling_results[name] = (loo_mae, mae, preds)
 
     # Per-day output uses the best CSO-containing combined model. The mm columns
     # break rainfall down by timing (same-day vs 2-4 day lag), at Conham and Bath.
     cso_models = [(mae, name) for name, (mae, _, _) in model_results.items() if name.startswith("CSO +")]
     featured_name = min(cso_models)[1] if cso_models else next(n for n in model_results if n.startswith("CSO only"))
     _, _, best_preds = model_results[featured_name]
+    featured_rolling = rolling_results[featured_name][2] if rolling_results else {}
 
-    def rain_mm(d, prefix, lo, hi):
+    def rain_mm(prefix, lo, hi):
         src = upstream if prefix == "up_" else daily
         if prefix == "up_" and upstream is None:
-            return ""
-        return round(rain_offset_sum(src, d, lo, hi), 1)
+            return dict.fromkeys(dates, "")
+        return dict(zip(dates, (round(v, 1) for v in rain_offset_sum(src, dates, lo, hi))))
+
+    sameday_c, sameday_b = rain_mm("", 0, 0), rain_mm("up_", 0, 0)
+    lag_c, lag_b = rain_mm("", 2, 4), rain_mm("up_", 2, 4)
 
     predictions, apes = [], []
     for d in dates:
@@ -377,13 +398,14 @@ def run_analyze(args) -> int:
         predictions.append({
             "sample_date": d,
             "actual_cfu_per_100ml": round(actual, 1),
-            "sameday_rain_conham_mm": rain_mm(d, "", 0, 0),
-            "sameday_rain_bath_mm": rain_mm(d, "up_", 0, 0),
-            "lag2to4_rain_conham_mm": rain_mm(d, "", 2, 4),
-            "lag2to4_rain_bath_mm": rain_mm(d, "up_", 2, 4),
+            "sameday_rain_conham_mm": sameday_c[d],
+            "sameday_rain_bath_mm": sameday_b[d],
+            "lag2to4_rain_conham_mm": lag_c[d],
+            "lag2to4_rain_bath_mm": lag_b[d],
             "loocv_predicted_cfu_per_100ml": round(pred, 1),
             "loocv_signed_pct_error": round((pred - actual) / actual * 100.0, 1),
             "loocv_abs_pct_error": round(ape, 1),
+            "rolling_predicted_cfu_per_100ml": round(10 ** featured_rolling[d], 1) if d in featured_rolling else "",
         })
     median_ape = sorted(apes)[len(apes) // 2]
 
@@ -394,19 +416,70 @@ def run_analyze(args) -> int:
         writer.writeheader()
         writer.writerows(predictions)
 
+    # Featured model refitted on every date: coefficients, bootstrap intervals
+    # and the artifact for nowcast.py.
+    def rain_feature(best):
+        site = "bath" if best["feature"].startswith("up_") else "conham"
+        lo, hi = best["spec"]
+        return f"rain_mm_{site}@{lo}-{hi}d", {"kind": "rain", "site": site, "offsets": [lo, hi]}, "log1p"
+
+    artifact_specs = {
+        "rain_window": rain_feature(window_best),
+        "rain_sd": rain_feature(sd_best),
+        "rain_lag": rain_feature(lag_best),
+        "temp_mean": ("temp_mean_c@2d", {"kind": "temp_mean", "site": "conham", "lookback_days": 2}, None),
+    }
+    featured_mae, featured_names, _ = model_results[featured_name]
+    matrix = [[feats[d][n] for n in featured_names] for d in dates]
+    stats = standardise_fit(matrix)
+    standardised = standardise_apply(matrix, stats)
+    beta = solve_ridge(standardised, y, args.ridge)
+    boot = None
+    if args.bootstrap > 0:
+        boot = bootstrap_intervals(matrix, y, args.ridge, None, args.bootstrap, seed=args.bootstrap_seed,
+                                   workers=args.workers)
+        boot["fitted"] = [predict_log(beta, row) for row in standardised]
+    features = []
+    for n, stat, coef in zip(featured_names, stats, beta[1:]):
+        if n == "cso":
+            features.append(band_feature((BEST_CSO_LOOKBACK, BEST_CSO_COLUMN, "log1p"), stat, coef))
+        else:
+            features.append(feature_entry(*artifact_specs[n], stat, coef))
     write_report(Path(args.report), dates, ecoli, daily, upstream, corr_rows,
-                 window_best, sd_best, lag_best, model_results, featured_name, predictions, median_ape)
+                 window_best, sd_best, lag_best, model_results, featured_name, predictions, median_ape,
+                 [f["name"] for f in features], beta, boot, rolling_results, args.rolling_min_train)
+
+    inputs = [Path(args.samples), weather_path, upstream_path, Path(args.cso)]
+    write_artifact(
+        Path(args.artifact),
+        name="conham_weather",
+        script="scripts/weather_conham_ecoli.py",
+        description=featured_name,
+        beta=beta,
+        features=features,
+        ridge=args.ridge,
+        weight_exponent=0.0,
+        training_files=[p for p in inputs if p.exists()],
+        dates=dates,
+        loocv={"mae_log": featured_mae, "median_ape": median_ape},
+    )
     print(f"Wrote {out_csv}")
     print(f"Wrote {args.report}")
+    print(f"Wrote {args.artifact}")
     print(f"Upstream rainfall: {'included' if upstream is not None else 'NOT FOUND (' + str(upstream_path) + ')'}")
     print("LOOCV MAE_log by model:")
     for name, (mae, _, _) in model_results.items():
         print(f"  {mae:.3f}  {name}")
+    if rolling_results:
+        print(f"Rolling MAE_log by model ({len(featured_rolling)} forecasts after {args.rolling_min_train} training dates):")
+        for name, (_, mae, _) in rolling_results.items():
+            print(f"  {mae:.3f}  {name}")
     return 0
 
 
 def write_report(path, dates, ecoli, daily, upstream, corr_rows,
-                 window_best, sd_best, lag_best, model_results, featured_name, predictions, median_ape) -> None:
+                 window_best, sd_best, lag_best, model_results, featured_name, predictions, median_ape,
+                 terms, beta, boot=None, rolling_results=None, rolling_min_train=ROLLING_MIN_TRAIN) -> None:
     has_upstream = upstream is not None
     lines = [
         "# Conham E. coli vs weather",
@@ -426,14 +499,21 @@ def write_report(path, dates, ecoli, daily, upstream, corr_rows,
         "## Which weather features track E. coli?",
         "",
         "Univariate correlation with log10(E. coli). Rainfall is log1p-transformed.",
-        "`up_` features are upstream (Bath) rainfall; the rest are at Conham.",
+        "`up_` features are upstream (Bath) rainfall; the rest are at Conham. `p` is a",
+        "two-sided permutation p-value (E. coli shuffled across sample dates) and `q` its",
+        f"Benjamini-Hochberg FDR-adjusted value across all {len(corr_rows)} features tested.",
+        "Spearman `rho` and its `p` are the same test on ranks.",
         "",
-        "| Rank | Window | Feature | Pearson r |",
-        "|---:|---:|---|---:|",
+        "| Rank | Window | Feature | Pearson r | p | q | Spearman rho | rho p |",
+        "|---:|---:|---|---:|---:|---:|---:|---:|",
     ]
     for i, r in enumerate(corr_rows[:16], 1):
         rv = "n/a" if math.isnan(r["r"]) else f"{r['r']:+.3f}"
-        lines.append(f"| {i} | {r['window']} | {r['feature']} | {rv} |")
+        pv = "n/a" if math.isnan(r["p"]) else f"{r['p']:.4f}"
+        qv = "n/a" if math.isnan(r["q"]) else f"{r['q']:.4f}"
+        rho = "n/a" if math.isnan(r["rho"]) else f"{r['rho']:+.3f}"
+        rho_p = "n/a" if math.isnan(r["rho_p"]) else f"{r['rho_p']:.4f}"
+        lines.append(f"| {i} | {r['window']} | {r['feature']} | {rv} | {pv} | {qv} | {rho} | {rho_p} |")
     lines.extend(
         [
             "",
@@ -470,16 +550,17 @@ def write_report(path, dates, ecoli, daily, upstream, corr_rows,
             "|---|---:|---:|---:|",
         ]
     )
-    for d in dates:
-        if ecoli[d] >= 450:
-            sd_c = rain_offset_sum(daily, d, 0, 0)
-            lag_c = rain_offset_sum(daily, d, 2, 4)
-            if has_upstream:
-                sd_b = rain_offset_sum(upstream, d, 0, 0)
-                lag_b = rain_offset_sum(upstream, d, 2, 4)
-                lines.append(f"| {d} | {ecoli[d]:.0f} | {sd_c:.1f} / {sd_b:.1f} | {lag_c:.1f} / {lag_b:.1f} |")
-            else:
-                lines.append(f"| {d} | {ecoli[d]:.0f} | {sd_c:.1f} / - | {lag_c:.1f} / - |")
+    high = [d for d in dates if ecoli[d] >= 450]
+    high_sd_c, high_lag_c = rain_offset_sum(daily, high, 0, 0), rain_offset_sum(daily, high, 2, 4)
+    if has_upstream:
+        high_sd_b, high_lag_b = rain_offset_sum(upstream, high, 0, 0), rain_offset_sum(upstream, high, 2, 4)
+    for i, d in enumerate(high):
+        sd_c, lag_c = high_sd_c[i], high_lag_c[i]
+        if has_upstream:
+            sd_b, lag_b = high_sd_b[i], high_lag_b[i]
+            lines.append(f"| {d} | {ecoli[d]:.0f} | {sd_c:.1f} / {sd_b:.1f} | {lag_c:.1f} / {lag_b:.1f} |")
+        else:
+            lines.append(f"| {d} | {ecoli[d]:.0f} | {sd_c:.1f} / - | {lag_c:.1f} / - |")
     lines.extend(
         [
             "",
@@ -502,6 +583,69 @@ def write_report(path, dates, ecoli, daily, upstream, corr_rows,
             f"{cell(p['lag2to4_rain_conham_mm'], p['lag2to4_rain_bath_mm'])} | "
             f"{p['loocv_predicted_cfu_per_100ml']:.0f} | {p['loocv_signed_pct_error']:+.1f}% | {p['loocv_abs_pct_error']:.1f}% |"
         )
+    if rolling_results:
+        lines.extend(
+            [
+                "",
+                f"## Rolling-origin evaluation (expanding window, first {rolling_min_train} dates train only)",
+                "",
+                "Each later date is forecast by the model fitted on the dates before it only; LOOCV",
+                "on the same dates may train on later ones. The weather windows were still chosen",
+                "using every date, so this is not what a live nowcast would have said and the rolling",
+                "MAE is still optimistic.",
+                "",
+                "| Model | LOOCV MAE_log | Rolling MAE_log |",
+                "|---|---:|---:|",
+            ]
+        )
+        for name, (loo_mae, mae, _) in rolling_results.items():
+            lines.append(f"| {name} | {loo_mae:.3f} | {mae:.3f} |")
+        lines.extend(
+            [
+                "",
+                f"Per-day forecasts for {featured_name}:",
+                "",
+                "| Sample date | Actual | LOOCV predicted | Rolling predicted |",
+                "|---|---:|---:|---:|",
+            ]
+        )
+        for p in predictions:
+            if p["rolling_predicted_cfu_per_100ml"] != "":
+                lines.append(
+                    f"| {p['sample_date']} | {p['actual_cfu_per_100ml']:.0f} | "
+                    f"{p['loocv_predicted_cfu_per_100ml']:.0f} | {p['rolling_predicted_cfu_per_100ml']:.0f} |"
+                )
+    lines.extend(
+        [
+            "",
+            f"## {featured_name}: full-data fit",
+            "",
+            "Coefficients are on standardised features (log10 target).",
+            "",
+        ]
+    )
+    if boot is None:
+        lines.extend(["| Term | Coefficient |", "|---|---:|"])
+        lines.extend(f"| {term} | {coef:+.4f} |" for term, coef in zip(["intercept"] + terms, beta))
+    else:
+        lines.extend([f"| Term | Coefficient | {BOOTSTRAP_LEVEL:.0%} bootstrap interval |", "|---|---:|---:|"])
+        lines.extend(f"| {term} | {coef:+.4f} | {lo:+.4f} to {hi:+.4f} |"
+                     for term, coef, (lo, hi) in zip(["intercept"] + terms, beta, boot["coef"]))
+        lines.extend(
+            [
+                "",
+                "Each bootstrap resample redraws the sample days with replacement and refits;",
+                "the interval is the spread of each day's in-sample estimate (CFU/100ml).",
+                "",
+                "| Sample date | Actual | Fitted | Interval |",
+                "|---|---:|---:|---:|",
+            ]
+        )
+        for p, fitted, (lo, hi) in zip(predictions, boot["fitted"], boot["log_pred"]):
+            lines.append(
+                f"| {p['sample_date']} | {p['actual_cfu_per_100ml']:.0f} | {10 ** fitted:.0f} | "
+                f"{10 ** lo:.0f} to {10 ** hi:.0f} |"
+            )
     lines.extend(
         [
             "",
@@ -533,6 +677,9 @@ def build_parser() -> argparse.ArgumentParser:
     f.add_argument("--samples", default=SAMPLES_CSV)
     f.add_argument("--weather", default=WEATHER_CSV)
     f.add_argument("--upstream-weather", default=UPSTREAM_WEATHER_CSV)
+    f.add_argument("--store", action="store_true",
+                   help="Sync the local hourly store (only missing/provisional days) and build the daily CSVs from it")
+    f.add_argument("--store-dir", default=".cache/weather_store")
     f.set_defaults(func=run_fetch)
 
     a = sub.add_parser("analyze", help="Correlate weather with E. coli and fit combined model (offline)")
@@ -542,7 +689,16 @@ def build_parser() -> argparse.ArgumentParser:
     a.add_argument("--cso", default=CSO_FEATURES_CSV)
     a.add_argument("--predictions", default=PREDICTIONS_CSV)
     a.add_argument("--report", default=REPORT_MD)
+    a.add_argument("--artifact", default=ARTIFACT_JSON, help="Fitted-model JSON for nowcast.py")
     a.add_argument("--ridge", type=float, default=DEFAULT_RIDGE)
+    a.add_argument("--bootstrap", type=int, default=BOOTSTRAP_DRAWS,
+                   help="Bootstrap resamples for the report's intervals (0 = skip)")
+    a.add_argument("--bootstrap-seed", type=int, default=0)
+    a.add_argument("--workers", type=int, default=1, help="Processes for the bootstrap (1 = in-process)")
+    a.add_argument("--rolling-min-train", type=int, default=ROLLING_MIN_TRAIN,
+                   help="Dates trained on before the first rolling-origin forecast (0 = skip)")
+    a.add_argument("--permutations", type=int, default=PERMUTATIONS,
+                   help="Shuffles for the correlation table's permutation p-values (0 = skip)")
     a.set_defaults(func=run_analyze)
 
     return parser
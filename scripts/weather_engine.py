@@ -0,0 +1,338 @@
+"""Array-backed weather engine shared by the rainfall and weather scripts.
+
+``rainfall_intensity.daily_intensity`` used to group hourly tuples into per-day
+Python lists and run ``max()`` with lambdas; ``run_fetch`` found the
+catchment-wide maxima with nested loops over days x sites; and
+``weather_conham_ecoli`` rebuilt date strings and dict lookups for every
+sample x lookback. Both now hold their data as arrays and reduce them in bulk:
+
+- ``HourlyMatrix`` -- a (site x hour) float matrix per variable
+  (precipitation, CAPE, lightning potential). ``daily()`` folds the hours into a
+  (site x day x slot) block and returns daily totals, peak hours, the hour
+  each peak fell in, CAPE at that hour and the day maxima as (site x day)
+  lists; ``DailyIntensity.catchment_max`` gives the worst site per day.
+- ``DailySeries`` -- one site's daily record on a dense day index, with
+  windowed sums / maxima / means for many sample dates at once.
+
+Window sums are accumulated offset by offset in the same order the old
+per-date loops used, so results are bit-identical to them; resolution is
+whatever the hour labels are (15-minute data works the same way, with more
+slots per day). Results come back as plain lists. Standard library plus NumPy
+when available; without it the same reductions run as Python loops (same
+results).
+"""
+from __future__ import annotations
+
+import math
+from datetime import date
+
+try:
+    import numpy as np
+except ImportError:  # pure-Python fallback throughout
+    np = None
+
+# The per-site per-day tuple rainfall_intensity writes:
+# (total_mm, peak_mm_per_h, peak_hour, cape_max, cape_at_peak_hour, lightning_max).
+DayStats = tuple[float, float, int, float, float, float]
+
+_SPLIT = 134217729.0  # 2**27 + 1, Veltkamp splitting constant
+
+
+def _exact_product(a, b):
+    """(hi, lo) with hi + lo == a * b exactly (Dekker's two-product, element-wise)."""
+    hi = a * b
+    t = _SPLIT * a
+    a_hi = t - (t - a)
+    a_lo = a - a_hi
+    t = _SPLIT * b
+    b_hi = t - (t - b)
+    b_lo = b - b_hi
+    lo = ((a_hi * b_hi - hi) + a_hi * b_lo + a_lo * b_hi) + a_lo * b_lo
+    return hi, lo
+
+
+def round_like_python(values, ndigits: int) -> list:
+    """``round(v, ndigits)`` for every element of a (nested) list or array, as nested lists.
+
+    ``np.round`` scales by 10**ndigits first and can land on the other side of
+    a half for a few values, which would change written CSVs. Python rounds the
+    exact binary value half-to-even; this does the same in bulk: the scaled
+    value is formed exactly as ``hi + lo``, the nearest integer ``k`` is
+    corrected by the sign of the exact distance to the half-way point, and
+    ``k / 10**ndigits`` is the double nearest the decimal result, as
+    ``round()`` returns. ``ndigits`` must be 0..22 (10**ndigits exact).
+    """
+    if np is None:
+        if isinstance(values, (list, tuple)):
+            return [round_like_python(v, ndigits) for v in values]
+        return round(float(values), ndigits)
+    x = np.asarray(values, dtype=float)
+    scale = 10.0 ** ndigits
+    finite = np.isfinite(x)
+    safe = np.where(finite, x, 0.0)
+    hi, lo = _exact_product(safe, scale)
+    k = np.rint(hi)
+    d = hi - k  # exact: |d| <= 0.5 and k is the integer nearest hi
+    above = ((d - 0.5) + lo) > 0  # exact value past k + 0.5 (the float sum keeps the exact sum's sign)
+    below = ((d + 0.5) + lo) < 0  # ... or before k - 0.5
+    tie_up = (((d - 0.5) + lo) == 0) & (np.fmod(k, 2.0) != 0)
+    tie_down = (((d + 0.5) + lo) == 0) & (np.fmod(k, 2.0) != 0)
+    k = k + above + tie_up - below - tie_down
+    out = np.where(finite, k / scale, x)
+    out = np.where(finite & (out == 0.0), np.copysign(0.0, x), out)  # round() keeps the sign of zero
+    big = finite & (np.abs(hi) >= 2.0 ** 52)  # k no longer exact: leave these few to round() itself
+    if big.any():
+        out[big] = [round(v, ndigits) for v in x[big].tolist()]
+    return out.tolist()
+
+
+# --------------------------------------------------------------------------- #
+# Hourly (site x hour) matrix
+# --------------------------------------------------------------------------- #
+class DailyIntensity:
+    """Per-site per-day intensity stats as (site x day) nested lists."""
+
+    def __init__(self, sites: list[str], days: list[str], present: list[list[bool]], total: list[list[float]],
+                 peak: list[list[float]], peak_hour: list[list[int]], cape_max: list[list[float]],
+                 cape_at_peak: list[list[float]], light_max: list[list[float]]):
+        self.sites, self.days, self.present = sites, days, present
+        self.total, self.peak, self.peak_hour = total, peak, peak_hour
+        self.cape_max, self.cape_at_peak, self.light_max = cape_max, cape_at_peak, light_max
+
+    def site_stats(self, s: int) -> dict[str, DayStats]:
+        """{day: DayStats} for site index ``s``, rounded as the CSVs store them."""
+        return {
+            day: (round(self.total[s][d], 2), round(self.peak[s][d], 2), int(self.peak_hour[s][d]),
+                  round(self.cape_max[s][d], 1), round(self.cape_at_peak[s][d], 1),
+                  round(self.light_max[s][d], 2))
+            for d, day in enumerate(self.days) if self.present[s][d]
+        }
+
+    def catchment_max(self, values: list[list[float]], ndigits: int) -> tuple[list[float], list[str]]:
+        """Per day, the max over sites of ``values`` (site x day) and the site it occurred at.
+
+        Values are compared after rounding to ``ndigits`` (what the per-site
+        CSV holds); ties go to the first site, as the old ``>`` loop did; days
+        with no site present give NaN and "".
+        """
+        rounded = round_like_python(values, ndigits)
+        if np is None:
+            peaks, names = [], []
+            for d in range(len(self.days)):
+                best, name = -math.inf, ""
+                for s, site in enumerate(self.sites):
+                    if self.present[s][d] and rounded[s][d] > best:
+                        best, name = rounded[s][d], site
+                peaks.append(best if name else math.nan)
+                names.append(name)
+            return peaks, names
+        present = np.asarray(self.present, dtype=bool).reshape(len(self.sites), len(self.days))
+        masked = np.where(present, np.asarray(rounded, dtype=float).reshape(present.shape), -np.inf)
+        best = masked.argmax(axis=0)
+        peak = masked[best, np.arange(len(self.days))]
+        any_present = present.any(axis=0)
+        return (np.where(any_present, peak, np.nan).tolist(),
+                [self.sites[b] if ok else "" for b, ok in zip(best.tolist(), any_present.tolist())])
+
+
+class HourlyMatrix:
+    """Hourly precipitation / CAPE / lightning for many sites as (site x hour) arrays.
+
+    Without NumPy the three matrices are nested lists, NaN for a missing hour.
+    """
+
+    def __init__(self, sites: list[str], times: list[str], precip, cape, light):
+        self.sites, self.times = sites, times
+        self.precip, self.cape, self.light = precip, cape, light
+
+    @classmethod
+    def from_rows(cls, per_site: dict[str, list[tuple[str, float, float, float]]]) -> "HourlyMatrix":
+        """Build from ``{site: [(iso_hour, mm, cape, lightning), ...]}`` (``fetch_hourly`` rows).
+
+        Sites normally share one time axis (they come from the same request)
+        and it is used as-is, repeated DST hours included. Otherwise the axis
+        is the sorted union of labels and a site's missing hours are NaN.
+        """
+        sites = list(per_site)
+        axes = [tuple(t for t, *_ in rows) for rows in per_site.values()]
+        shared = all(axis == axes[0] for axis in axes) if axes else True
+        times = list(axes[0]) if shared and axes else sorted({t for axis in axes for t in axis})
+        column = {t: i for i, t in enumerate(times)}
+        if np is None:
+            arrays = [[[math.nan] * len(times) for _ in sites] for _ in range(3)]
+            for s, rows in enumerate(per_site.values()):
+                for i, (t, *values) in enumerate(rows):
+                    col = i if shared else column[t]
+                    for v, value in enumerate(values):
+                        arrays[v][s][col] = float(value)
+            return cls(sites, times, arrays[0], arrays[1], arrays[2])
+        arrays = np.full((3, len(sites), len(times)), np.nan)
+        for s, rows in enumerate(per_site.values()):
+            if not rows:
+                continue
+            cols = np.arange(len(rows)) if shared else np.array([column[t] for t, *_ in rows])
+            arrays[:, s, cols] = np.array([r[1:] for r in rows], dtype=float).T
+        return cls(sites, times, arrays[0], arrays[1], arrays[2])
+
+    def daily(self) -> DailyIntensity:
+        """Collapse hours to per-site per-day intensity stats in one pass."""
+        day_labels = [t.partition("T")[0] for t in self.times]
+        days = sorted(set(day_labels))
+        day_index = {d: i for i, d in enumerate(days)}
+        hour_labels = [int(t.partition("T")[2][:2] or 0) for t in self.times]
+        if np is None:
+            return self._daily_python(days, [day_index[d] for d in day_labels], hour_labels)
+        day_of = np.array([day_index[d] for d in day_labels], dtype=np.int64)
+        # Slot = position of the hour within its day, in time order: rank within
+        # each day's run of a stable sort by day.
+        order = np.argsort(day_of, kind="stable")
+        counts = np.bincount(day_of, minlength=len(days))
+        first = np.concatenate(([0], np.cumsum(counts)[:-1])) if len(days) else counts
+        slot = np.empty(len(self.times), dtype=np.int64)
+        slot[order] = np.arange(len(self.times)) - np.repeat(first, counts)
+        n_slots = int(counts.max()) if len(days) else 0
+        hour_of = np.array(hour_labels, dtype=np.int64)
+
+        shape = (len(self.sites), len(days), n_slots)
+        present_hour = ~np.isnan(self.precip)
+
+        def block(values: np.ndarray, fill: float) -> np.ndarray:
+            out = np.full(shape, fill)
+            out[:, day_of, slot] = np.where(present_hour, values, fill)
+            return out
+
+        precip = block(self.precip, -np.inf)
+        hours = np.full(shape[1:], -1, dtype=np.int64)
+        hours[day_of, slot] = hour_of
+        peak_slot = precip.argmax(axis=2)
+        peak = np.take_along_axis(precip, peak_slot[..., None], axis=2)[..., 0]
+        cape = block(self.cape, -np.inf)
+        held = np.zeros(shape, dtype=bool)
+        held[:, day_of, slot] = present_hour
+        present = held.any(axis=2)
+
+        total = block(self.precip, 0.0)
+        total_sum = np.zeros(shape[:2])
+        for k in range(n_slots):  # hour-by-hour, the same order sum() used
+            total_sum = total_sum + total[:, :, k]
+
+        return DailyIntensity(
+            sites=self.sites,
+            days=days,
+            present=present.tolist(),
+            total=total_sum.tolist(),
+            peak=np.where(present, peak, 0.0).tolist(),
+            peak_hour=np.where(present, hours[np.arange(len(days))[None, :], peak_slot], 0).tolist(),
+            cape_max=np.where(present, cape.max(axis=2), 0.0).tolist(),
+            cape_at_peak=np.where(present, np.take_along_axis(cape, peak_slot[..., None], axis=2)[..., 0], 0.0).tolist(),
+            light_max=np.where(present, block(self.light, -np.inf).max(axis=2), 0.0).tolist(),
+        )
+
+    def _daily_python(self, days: list[str], day_of: list[int], hour_of: list[int]) -> DailyIntensity:
+        """``daily`` without NumPy: the same per-day reductions as loops over each site's hours."""
+        n_days = len(days)
+        fields = ("present", "total", "peak", "peak_hour", "cape_max", "cape_at_peak", "light_max")
+        out = {name: [] for name in fields}
+        for s in range(len(self.sites)):
+            present, total = [False] * n_days, [0.0] * n_days
+            peak, peak_hour = [-math.inf] * n_days, [0] * n_days
+            cape_max, cape_at_peak, light_max = [-math.inf] * n_days, [0.0] * n_days, [-math.inf] * n_days
+            for i, mm in enumerate(self.precip[s]):
+                if math.isnan(mm):
+                    continue
+                d = day_of[i]
+                present[d] = True
+                total[d] = total[d] + mm
+                cape = self.cape[s][i]
+                if mm > peak[d]:  # first heaviest hour, as argmax picks
+                    peak[d], peak_hour[d], cape_at_peak[d] = mm, hour_of[i], cape
+                cape_max[d] = max(cape_max[d], cape)
+                light_max[d] = max(light_max[d], self.light[s][i])
+            for d in range(n_days):
+                if not present[d]:
+                    peak[d] = cape_max[d] = light_max[d] = 0.0
+            for name, values in zip(fields, (present, total, peak, peak_hour, cape_max, cape_at_peak, light_max)):
+                out[name].append(values)
+        return DailyIntensity(self.sites, days, **out)
+
+
+# --------------------------------------------------------------------------- #
+# Daily series on a dense day index
+# --------------------------------------------------------------------------- #
+class DailySeries:
+    """One site's daily record, with windowed reductions for many dates at once.
+
+    Days absent from the source are "missing" and skipped by every reduction,
+    exactly as the old ``if d in daily`` lookups skipped them.
+    """
+
+    def __init__(self, daily: dict[str, dict[str, float]]):
+        days = sorted(daily)
+        self.start = date.fromisoformat(days[0]).toordinal() if days else 0
+        n = date.fromisoformat(days[-1]).toordinal() - self.start + 1 if days else 0
+        present = [False] * n
+        columns = sorted({k for row in daily.values() for k in row})
+        values = {c: [0.0] * n for c in columns}
+        for day, row in daily.items():
+            i = date.fromisoformat(day).toordinal() - self.start
+            present[i] = True
+            for c, v in row.items():
+                values[c][i] = v
+        if np is None:
+            self.present, self.values = present, values
+        else:
+            self.present = np.array(present, dtype=bool)
+            self.values = {c: np.array(v, dtype=float) for c, v in values.items()}
+
+    def _index(self, sample_dates: list[str]):
+        index = [date.fromisoformat(d).toordinal() - self.start for d in sample_dates]
+        return index if np is None else np.array(index, dtype=np.int64)
+
+    def _at(self, column: str, idx):
+        """(values, present) at day indices, out-of-range counting as missing."""
+        if np is None:
+            n = len(self.present)
+            present = [0 <= i < n and self.present[i] for i in idx]
+            return [self.values[column][i] if ok else 0.0 for i, ok in zip(idx, present)], present
+        inside = (idx >= 0) & (idx < len(self.present))
+        safe = np.where(inside, idx, 0)
+        present = inside & self.present[safe]
+        return np.where(present, self.values[column][safe], 0.0), present
+
+    def offset_sum(self, column: str, sample_dates: list[str], lo: int, hi: int) -> list[float]:
+        """Sum over days at offsets [lo, hi] before each sample (offset 0 = sample day)."""
+        base = self._index(sample_dates)
+        if np is None:
+            total = [0.0] * len(base)
+            for k in range(lo, hi + 1):
+                values, _ = self._at(column, [b - k for b in base])
+                total = [t + v for t, v in zip(total, values)]
+            return total
+        total = np.zeros(len(base))
+        for k in range(lo, hi + 1):
+            values, _ = self._at(column, base - k)
+            total = total + values
+        return total.tolist()
+
+    def window(self, sample_dates: list[str], lookback: int, column: str) -> tuple[list[float], list[float], list[int]]:
+        """(sum, max, count) of ``column`` over days 1..lookback before each sample."""
+        base = self._index(sample_dates)
+        if np is None:
+            total, peak, count = [0.0] * len(base), [-math.inf] * len(base), [0] * len(base)
+            for k in range(1, lookback + 1):
+                values, present = self._at(column, [b - k for b in base])
+                for i, (v, ok) in enumerate(zip(values, present)):
+                    total[i] = total[i] + v
+                    if ok:
+                        peak[i] = max(peak[i], v)
+                        count[i] += 1
+            return total, [p if c > 0 else 0.0 for p, c in zip(peak, count)], count
+        total = np.zeros(len(base))
+        peak = np.full(len(base), -np.inf)
+        count = np.zeros(len(base), dtype=np.int64)
+        for k in range(1, lookback + 1):
+            values, present = self._at(column, base - k)
+            total = total + values
+            peak = np.where(present, np.maximum(peak, values), peak)
+            count += present
+        return total.tolist(), np.where(count > 0, peak, 0.0).tolist(), count.tolist()
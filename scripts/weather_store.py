@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""Incremental per-site hourly weather archive with gap detection.
+
+``rainfall_intensity.py`` and ``weather_conham_ecoli.py`` used to refetch their
+whole date range on every run, although ERA5 history never changes: extending
+the window by a week refetched the season. This module keeps a local store of
+hourly weather per site and only asks Open-Meteo for what is missing.
+
+Layout (under ``.cache/weather_store/``, not committed):
+
+- ``<site-slug>.csv`` -- one row per UTC hour: ``time, precipitation_mm,
+  rain_mm, temperature_c, windspeed_kmh, cape_j_per_kg, lightning_potential``.
+  The first four come from the ERA5 archive, the last two from the Historical
+  Forecast API (the archive has no convective fields; see
+  ``rainfall_intensity.py``). Blank = the API served no value.
+- ``coverage.json`` -- per site, its coordinates and the runs of days it holds,
+  each tagged with the date it was fetched.
+
+Gap detection: a requested ``[start, end]`` is compared with the days the site
+already holds. Days never fetched are gaps; so are days fetched within
+``PROVISIONAL_DAYS`` of their own date, because recent ERA5 is provisional and
+gets revised -- those trailing days are refreshed on the next sync until they
+age out. Gaps are fetched with the multi-coordinate requests from
+``rainfall_intensity.py``: sites with identical gaps share one archive call and
+one forecast call.
+
+Derived tables are rebuilt from the store rather than from API responses:
+``daily`` gives the rows ``weather_conham_ecoli.py`` writes (UTC days), and
+``hourly_local`` the ``(local hour, precip, CAPE, LPI)`` tuples
+``rainfall_intensity.daily_intensity`` collapses (Europe/London days).
+
+    python scripts/weather_store.py sync --start 2025-05-01 --end 2025-12-31   # all catchment sites
+    python scripts/weather_store.py status                                      # what each site holds
+
+The two analysis scripts use it via ``fetch --store``. Standard library only.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import re
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+from rainfall_intensity import (
+    ARCHIVE_URL,
+    FORECAST_URL,
+    SITES,
+    _optional_hourly_maps_multi,
+    _request_hourly_multi,
+)
+
+STORE_DIR = ".cache/weather_store"
+# ERA5 lags real time by ~5 days and early values are provisional; anything
+# fetched within this many days of its own date is refreshed on the next sync.
+PROVISIONAL_DAYS = 7
+# Open-Meteo variable -> store column.
+ARCHIVE_VARS = {
+    "precipitation": "precipitation_mm",
+    "rain": "rain_mm",
+    "temperature_2m": "temperature_c",
+    "windspeed_10m": "windspeed_kmh",
+}
+FORECAST_VARS = {"cape": "cape_j_per_kg", "lightning_potential": "lightning_potential"}
+FIELDS = ["time"] + list(ARCHIVE_VARS.values()) + list(FORECAST_VARS.values())
+
+Site = tuple[str, float, float]
+
+
+def slug(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+def _day_runs(days: dict[date, str]) -> list[list[str]]:
+    """{day: fetched_on} -> [[first, last, fetched_on], ...] runs of consecutive days."""
+    runs: list[list[str]] = []
+    for day in sorted(days):
+        if runs and date.fromisoformat(runs[-1][1]) + timedelta(days=1) == day and runs[-1][2] == days[day]:
+            runs[-1][1] = day.isoformat()
+        else:
+            runs.append([day.isoformat(), day.isoformat(), days[day]])
+    return runs
+
+
+def _ranges(days: list[date]) -> list[tuple[date, date]]:
+    """Sorted days -> inclusive (first, last) runs of consecutive days."""
+    out: list[tuple[date, date]] = []
+    for day in days:
+        if out and out[-1][1] + timedelta(days=1) == day:
+            out[-1] = (out[-1][0], day)
+        else:
+            out.append((day, day))
+    return out
+
+
+def _num(value: str) -> float | None:
+    return float(value) if value not in ("", None) else None
+
+
+class WeatherStore:
+    """Hourly per-site weather on disk plus the record of which days are held."""
+
+    def __init__(self, root: Path | str = STORE_DIR):
+        self.root = Path(root)
+        path = self.root / "coverage.json"
+        self.coverage: dict[str, dict] = json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+
+    # -- coverage ----------------------------------------------------------- #
+    def held_days(self, name: str) -> dict[date, date]:
+        """{day: date it was fetched} for every day the site holds."""
+        held: dict[date, date] = {}
+        for first, last, fetched_on in self.coverage.get(slug(name), {}).get("runs", []):
+            day, stop = date.fromisoformat(first), date.fromisoformat(last)
+            while day <= stop:
+                held[day] = date.fromisoformat(fetched_on)
+                day += timedelta(days=1)
+        return held
+
+    def gaps(self, name: str, start: date, end: date, today: date | None = None) -> list[tuple[date, date]]:
+        """Day ranges in [start, end] that are missing or still provisional."""
+        today = today or date.today()
+        end = min(end, today)
+        held = self.held_days(name)
+        missing = []
+        day = start
+        while day <= end:
+            fetched_on = held.get(day)
+            if fetched_on is None or (fetched_on - day).days <= PROVISIONAL_DAYS:
+                missing.append(day)
+            day += timedelta(days=1)
+        return _ranges(missing)
+
+    def _mark(self, site: Site, first: date, last: date, today: date) -> None:
+        name, lat, lon = site
+        held = {d: f.isoformat() for d, f in self.held_days(name).items()}
+        day = first
+        while day <= last:
+            held[day] = today.isoformat()
+            day += timedelta(days=1)
+        self.coverage[slug(name)] = {"name": name, "lat": lat, "lon": lon, "runs": _day_runs(held)}
+
+    def _save_coverage(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        (self.root / "coverage.json").write_text(json.dumps(self.coverage, indent=2), encoding="utf-8")
+
+    # -- rows --------------------------------------------------------------- #
+    def _path(self, name: str) -> Path:
+        return self.root / f"{slug(name)}.csv"
+
+    def rows(self, name: str) -> dict[str, dict[str, str]]:
+        """{UTC iso hour: raw CSV row} for a site (empty if nothing stored)."""
+        path = self._path(name)
+        if not path.exists():
+            return {}
+        with path.open(newline="", encoding="utf-8") as handle:
+            return {row["time"]: row for row in csv.DictReader(handle)}
+
+    def _upsert(self, name: str, new_rows: dict[str, dict[str, object]]) -> None:
+        rows: dict[str, dict[str, object]] = dict(self.rows(name))
+        for t, row in new_rows.items():
+            rows[t] = {**rows.get(t, {}), **row}
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._path(name).open("w", newline="", encoding="utf-8") as handle:
+            writer = csv.DictWriter(handle, fieldnames=FIELDS)
+            writer.writeheader()
+            for t in sorted(rows):
+                writer.writerow({field: rows[t].get(field, "") for field in FIELDS})
+
+    # -- fetching ----------------------------------------------------------- #
+    def sync(self, sites: list[Site], start: date, end: date, batch_size: int = 0, today: date | None = None) -> dict[str, int]:
+        """Fetch only each site's gaps in [start, end]; returns {site: days fetched}.
+
+        Sites whose gaps are identical share multi-coordinate requests (up to
+        ``batch_size`` sites per call; 0 = no limit).
+        """
+        today = today or date.today()
+        by_gaps: dict[tuple, list[Site]] = {}
+        for site in sites:
+            gaps = tuple(self.gaps(site[0], start, end, today))
+            if gaps:
+                by_gaps.setdefault(gaps, []).append(site)
+        fetched = {site[0]: 0 for site in sites}
+        for gaps, group in by_gaps.items():
+            size = batch_size or len(group)
+            for i in range(0, len(group), size):
+                batch = group[i:i + size]
+                for first, last in gaps:
+                    self._fetch_range(batch, first, last, today)
+                    for name, _, _ in batch:
+                        fetched[name] += (last - first).days + 1
+        self._save_coverage()
+        return fetched
+
+    def _fetch_range(self, batch: list[Site], first: date, last: date, today: date) -> None:
+        base = {
+            "latitude": ",".join(f"{lat}" for _, lat, _ in batch),
+            "longitude": ",".join(f"{lon}" for _, _, lon in batch),
+            "start_date": first.isoformat(),
+            "end_date": last.isoformat(),
+            "timezone": "GMT",
+        }
+        archive = _request_hourly_multi(ARCHIVE_URL, {**base, "hourly": ",".join(ARCHIVE_VARS)}, len(batch))
+        convective = _optional_hourly_maps_multi(FORECAST_URL, base, list(FORECAST_VARS), len(batch))
+        for site, block, maps in zip(batch, archive, convective):
+            times = block.get("time", [])
+            new_rows: dict[str, dict[str, object]] = {}
+            for i, t in enumerate(times):
+                row: dict[str, object] = {"time": t}
+                for var, column in ARCHIVE_VARS.items():
+                    value = block.get(var, [None] * len(times))[i]
+                    row[column] = "" if value is None else value
+                for var, column in FORECAST_VARS.items():
+                    row[column] = maps[var].get(t, "")
+                new_rows[t] = row
+            self._upsert(site[0], new_rows)
+            self._mark(site, first, last, today)
+
+    # -- derived tables ----------------------------------------------------- #
+    def daily(self, name: str, start: date, end: date) -> list[dict]:
+        """UTC-day rows in ``weather_conham_ecoli``'s daily CSV schema."""
+        by_day: dict[str, list[dict[str, str]]] = {}
+        for t, row in sorted(self.rows(name).items()):
+            day = t[:10]
+            if start.isoformat() <= day <= end.isoformat():
+                by_day.setdefault(day, []).append(row)
+        out = []
+        for day, hours in by_day.items():
+            def values(column):
+                return [v for v in (_num(h[column]) for h in hours) if v is not None]
+
+            precip, rain = values("precipitation_mm"), values("rain_mm")
+            temp, wind = values("temperature_c"), values("windspeed_kmh")
+            out.append({
+                "date": day,
+                "precipitation_mm": round(sum(precip), 1) if precip else "",
+                "rain_mm": round(sum(rain), 1) if rain else "",
+                "temp_mean_c": round(sum(temp) / len(temp), 1) if temp else "",
+                "temp_max_c": max(temp) if temp else "",
+                "temp_min_c": min(temp) if temp else "",
+                "windspeed_10m_max_kmh": max(wind) if wind else "",
+            })
+        return out
+
+    def hourly_local(self, name: str, start: date, end: date, tz: str = "Europe/London"):
+        """(rows, n_cape_present, n_lightning_present) in ``rainfall_intensity.fetch_hourly`` form.
+
+        Hours are converted from UTC to ``tz`` and kept if their local date lies
+        in [start, end], so days are local calendar days as the API's
+        ``timezone=Europe/London`` requests produced.
+        """
+        zone = ZoneInfo(tz)
+        rows = []
+        n_cape = n_light = 0
+        for t, row in sorted(self.rows(name).items()):
+            local = datetime.fromisoformat(t).replace(tzinfo=timezone.utc).astimezone(zone)
+            if not start <= local.date() <= end:
+                continue
+            precip, cape, light = _num(row["precipitation_mm"]), _num(row["cape_j_per_kg"]), _num(row["lightning_potential"])
+            n_cape += cape is not None
+            n_light += light is not None
+            rows.append((local.strftime("%Y-%m-%dT%H:%M"), precip or 0.0, cape or 0.0, light or 0.0))
+        return rows, n_cape, n_light
+
+
+# --------------------------------------------------------------------------- #
+# CLI
+# --------------------------------------------------------------------------- #
+def run_sync(args) -> int:
+    store = WeatherStore(args.store)
+    start, end = date.fromisoformat(args.start), date.fromisoformat(args.end)
+    fetched = store.sync(SITES, start, end, args.batch_size)
+    for name, days in fetched.items():
+        print(f"  {name:<28} {'up to date' if days == 0 else f'fetched {days} days'}")
+    print(f"Synced {len(SITES)} sites into {args.store} ({sum(1 for d in fetched.values() if d)} needed fetching)")
+    return 0
+
+
+def run_status(args) -> int:
+    store = WeatherStore(args.store)
+    if not store.coverage:
+        print(f"{args.store} is empty. Run `sync` first.")
+        return 0
+    today = date.today()
+    for entry in store.coverage.values():
+        held = store.held_days(entry["name"])
+        provisional = sum(1 for d, f in held.items() if (f - d).days <= PROVISIONAL_DAYS and d <= today)
+        spans = ", ".join(f"{a}..{b}" for a, b in _ranges(sorted(held)))
+        print(f"  {entry['name']:<28} {len(held):>4} days ({provisional} provisional): {spans}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command")
+
+    s = sub.add_parser("sync", help="Fetch only the missing/provisional days for every catchment site (needs network)")
+    s.add_argument("--store", default=STORE_DIR)
+    s.add_argument("--start", required=True, help="ISO date")
+    s.add_argument("--end", required=True, help="ISO date (capped at today)")
+    s.add_argument("--batch-size", type=int, default=0, help="Sites per multi-coordinate request (default: no limit)")
+    s.set_defaults(func=run_sync)
+
+    t = sub.add_parser("status", help="Show which days each site holds (no network)")
+    t.add_argument("--store", default=STORE_DIR)
+    t.set_defaults(func=run_status)
+
+    return parser
+
+
+def main() -> int:
+    parser = build_parser()
+    args = parser.parse_args()
+    if not getattr(args, "command", None):
+        parser.print_help()
+        return 1
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,126 @@
+"""Write the docs/ site the way a static host wants it: fingerprinted, pre-compressed, only when changed.
+
+``poo.py`` used to rewrite every page and ``index.js`` on every run, and the
+pages pulled ``styles.css`` / ``index.js`` by fixed names, so the host could not
+cache them for long. ``StaticSite`` sits between the render step and the disk:
+
+- ``asset(name, content)`` writes a sub-resource (script, stylesheet) under
+  ``docs/assets/`` with the first ``HASH_LENGTH`` hex digits of its SHA-256 in
+  the file name (``index.js`` -> ``assets/index.1a2b3c4d5e.js``) and returns
+  that URL for the page to reference. A changed file gets a new name, so
+  assets can be served with far-future cache headers.
+- ``page(name, content)`` writes an entry page (``index.html``,
+  ``conham.html``, ...) under its own name, because it is what visitors and
+  links point at.
+- Both skip the write when the file on disk already has that content, and
+  write ``.gz`` (and, when the ``brotli`` package is installed, ``.br``)
+  variants next to it. The variants are byte-stable (no gzip timestamp), so an
+  unchanged file leaves nothing for git to commit.
+- ``finish()`` writes ``asset-manifest.json`` (logical name -> file, hash,
+  sizes, variants) and removes fingerprinted assets that neither this run
+  nor the previous one references. A page cached from the last deploy
+  therefore still finds its assets.
+
+Pure Python (``brotli`` optional), like ``nowcast.py``: ``poo.py`` runs in the
+workflow with only ``requests``.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:  # .br variants are skipped
+    brotli = None
+
+ASSETS_DIR = "assets"
+MANIFEST = "asset-manifest.json"
+HASH_LENGTH = 10
+# Below this a compressed variant saves less than the extra request header costs.
+MIN_COMPRESS_BYTES = 256
+
+
+def _encode(content: str | bytes) -> bytes:
+    return content.encode("utf-8") if isinstance(content, str) else content
+
+
+def _write_if_changed(path: Path, data: bytes) -> bool:
+    """Write ``data`` unless ``path`` already holds exactly it; True if written."""
+    if path.exists() and path.stat().st_size == len(data) and path.read_bytes() == data:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+    return True
+
+
+class StaticSite:
+    """Fingerprinted, pre-compressed output under ``root`` (see the module docstring)."""
+
+    def __init__(self, root: str | Path = "docs"):
+        self.root = Path(root)
+        self.entries: dict[str, dict] = {}
+        self.written: list[str] = []
+        self.skipped: list[str] = []
+        try:
+            self.previous = json.loads((self.root / MANIFEST).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.previous = {}
+
+    def _store(self, name: str, relative: str, data: bytes, digest: str) -> None:
+        path = self.root / relative
+        changed = _write_if_changed(path, data)
+        variants = []
+        if len(data) >= MIN_COMPRESS_BYTES:
+            compressed = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                compressed[".br"] = brotli.compress(data, quality=11)
+            for suffix, blob in compressed.items():
+                changed |= _write_if_changed(path.with_name(path.name + suffix), blob)
+                variants.append(suffix.lstrip("."))
+        (self.written if changed else self.skipped).append(relative)
+        self.entries[name] = {
+            "file": relative,
+            "sha256": digest,
+            "bytes": len(data),
+            "encodings": variants,
+        }
+
+    def asset(self, name: str, content: str | bytes) -> str:
+        """Store a sub-resource under a content-hashed name; returns its URL relative to ``root``."""
+        data = _encode(content)
+        digest = hashlib.sha256(data).hexdigest()
+        stem, dot, ext = Path(name).name.rpartition(".")
+        if not dot:
+            stem, ext = ext, ""
+        relative = f"{ASSETS_DIR}/{stem}.{digest[:HASH_LENGTH]}{dot}{ext}"
+        self._store(name, relative, data, digest)
+        return relative
+
+    def page(self, name: str, content: str | bytes) -> str:
+        """Store an entry page under its own name; returns that name."""
+        data = _encode(content)
+        self._store(name, name, data, hashlib.sha256(data).hexdigest())
+        return name
+
+    def finish(self) -> Path:
+        """Write the manifest and prune assets no longer referenced by it or the previous one."""
+        keep = {entry["file"] for entry in self.entries.values()}
+        keep |= {entry.get("file") for entry in self.previous.get("files", {}).values()}
+        assets = self.root / ASSETS_DIR
+        if assets.is_dir():
+            for path in assets.iterdir():
+                base = path.name
+                for suffix in (".gz", ".br"):
+                    base = base.removesuffix(suffix)
+                if f"{ASSETS_DIR}/{base}" not in keep:
+                    path.unlink()
+        manifest = {"files": {name: self.entries[name] for name in sorted(self.entries)}}
+        path = self.root / MANIFEST
+        _write_if_changed(path, (json.dumps(manifest, indent=2) + "\n").encode("utf-8"))
+        return path